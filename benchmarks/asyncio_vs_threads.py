@@ -0,0 +1,153 @@
+"""
+asyncio philosophers (one event loop) vs DiningPhilosophersDemo (one thread each).
+
+For every N, strategy and engine a fresh interpreter runs the philosophers for
+--duration model seconds (sleeps shrunk by --scale) and reports meals per wall second
+and peak RSS growth per philosopher, so thread stacks count as well as Python objects.
+Thread runs above --max-threads are skipped instead of taking the machine down.
+
+The default scale grows with N (see auto_scale): if one loop pass over all philosophers
+takes longer than a think time, everyone turns hungry at once and the randomized
+strategy deadlocks like version 1, which measures the overload rather than the engine.
+
+    python benchmarks/asyncio_vs_threads.py --n 10 1000 100000 --versions 2 3
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "philosphers"))
+sys.path.insert(0, ROOT)
+from philosopher_bench import Recorder, summarize
+
+ENGINES = ("asyncio", "threads")
+
+
+def peak_rss():
+    # ru_maxrss is in KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def auto_scale(n):
+    """
+    Wall seconds per model second that keeps N philosophers below one core's worth of
+    work (about 1e-5 s of wall time per philosopher per model second).
+    """
+    return max(0.01, n * 1e-5)
+
+
+def run_asyncio(version, n, duration, scale):
+    import asyncio
+    from philosophers_asyncio import AsyncDiningPhilosophers
+    recorder = Recorder(n, length=duration)
+    demo = AsyncDiningPhilosophers(version, n, scale=scale, on_state=recorder.on_state)
+    end = asyncio.run(demo.run(until=duration))
+    return recorder, (duration if demo.deadlocked else min(duration, end)), demo.deadlocked
+
+
+def run_threads(version, n, duration, scale):
+    from deadlock_tools.virtual_clock import WallClock
+    from philosophers_all_versions import DiningPhilosophersDemo
+    # Nothing is recorded until every thread has been started (N threads take a while),
+    # and meals after the window, while stop() winds down, are dropped: the same
+    # `duration` model seconds of work as the asyncio run
+    recorder = Recorder(n, start=float("inf"), length=duration)
+    clock = WallClock(scale)
+    demo = DiningPhilosophersDemo(version, headless=True, clock=clock, num_philosophers=n,
+                                  on_state=recorder.on_state)
+    recorder.start = clock.now()
+    while clock.now() < recorder.start + duration and not demo.wait_graph.deadlocks:
+        time.sleep(0.01)
+    demo.stop()
+    deadlocked = bool(demo.wait_graph.deadlocks)
+    return recorder, (duration if deadlocked else min(duration, clock.now() - recorder.start)), deadlocked
+
+
+def child(engine, version, n, duration, scale):
+    """
+    One measurement, run in a fresh interpreter; prints a JSON line.
+    """
+    # Imports first, so the baseline only leaves the philosophers themselves
+    if engine == "asyncio":
+        import philosophers_asyncio
+    else:
+        import philosophers_all_versions
+    base = peak_rss()
+    start = time.perf_counter()
+    runner = run_asyncio if engine == "asyncio" else run_threads
+    recorder, model_duration, deadlocked = runner(version, n, duration, scale)
+    wall = time.perf_counter() - start
+    result = summarize(recorder, model_duration, wall)
+    result["deadlocked"] = deadlocked
+    result["rss_per_philosopher_kb"] = (peak_rss() - base) / n / 1024
+    print(json.dumps(result))
+    sys.stdout.flush()
+    # Threads may still be blocked on forks; don't wait for them
+    os._exit(0)
+
+
+def measure(engine, version, n, duration, scale, timeout):
+    cmd = [sys.executable, os.path.abspath(__file__), "--child", engine, str(version), str(n),
+           "--duration", str(duration), "--scale", str(scale)]
+    try:
+        out = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout} s"}
+    if out.returncode != 0 or not out.stdout.strip():
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "failed"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="asyncio vs threaded philosophers: memory and meals/s")
+    parser.add_argument("--n", nargs="+", type=int, default=[10, 1000, 100000])
+    parser.add_argument("--versions", nargs="+", type=int, default=[1, 2, 3], choices=[1, 2, 3])
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=ENGINES)
+    parser.add_argument("--duration", type=float, default=10.0, help="model seconds per run")
+    parser.add_argument("--scale", type=float, default=None,
+                        help="wall seconds per model second (default: grows with N)")
+    parser.add_argument("--max-threads", type=int, default=20000,
+                        help="skip thread runs with more philosophers than this")
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds per run")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    parser.add_argument("--child", nargs=3, default=None, metavar=("ENGINE", "VERSION", "N"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        engine, version, n = args.child
+        child(engine, int(version), int(n), args.duration, args.scale or auto_scale(int(n)))
+
+    runs = []
+    for n in args.n:
+        scale = args.scale if args.scale is not None else auto_scale(n)
+        for version in args.versions:
+            for engine in args.engines:
+                if engine == "threads" and n > args.max_threads:
+                    r = {"error": f"skipped (more than --max-threads {args.max_threads})"}
+                else:
+                    r = measure(engine, version, n, args.duration, scale, args.timeout)
+                r.update({"engine": engine, "version": version, "n": n, "scale": scale})
+                runs.append(r)
+                if "error" in r:
+                    print(f"v{version} {engine:<8} n={n:<7} {r['error']}")
+                else:
+                    print(f"v{version} {engine:<8} n={n:<7} meals={r['meals']:<8} "
+                          f"meals/s={r['meals_per_wall_second']:10.0f}  "
+                          f"rss/philosopher={r['rss_per_philosopher_kb']:7.2f} KiB  "
+                          f"wall={r['wall_seconds']:.2f} s" + (" DEADLOCK" if r["deadlocked"] else ""))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "asyncio_vs_threads", "config": vars(args), "runs": runs}, f, indent=2)
+    return runs
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Banker's algorithm (avoidance) against a static lock order (prevention).
+
+  philosophers  v7_bankers vs v3_prevention in philosophers_all_versions.py, threads on
+                a scaled WallClock: meals per model second and latency
+  two-lock      the car scenario in a loop: T threads, half taking lock1 then lock2 and
+                half the other way round. "ordering" sorts every pair to lock1 first,
+                "bankers" keeps each thread's own order and asks a BankersAllocator.
+                Reported: rounds per wall second
+  safety        cost of one vectorized safety check (no early exit) for C clients and
+                R resources, against the same reduction written as Python loops
+
+    python benchmarks/bankers_bench.py --n 5 50 --duration 200 --scale 0.01
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.bankers import BankersAllocator
+from philosopher_bench import run_threads
+
+
+###############################################################################
+# 1. Two-lock car scenario
+###############################################################################
+def two_lock_rounds(mode, threads, rounds, hold):
+    locks = {"lock1": threading.Lock(), "lock2": threading.Lock()}
+    banker = BankersAllocator([1, 1], names=["lock1", "lock2"], capacity=threads)
+    start_line = threading.Barrier(threads + 1)
+
+    def worker(order):
+        if mode == "ordering":
+            order = sorted(order)
+        client = banker.register({"lock1": 1, "lock2": 1}) if mode == "bankers" else None
+        start_line.wait()
+        for _ in range(rounds):
+            for name in order:
+                if client is not None:
+                    banker.request(client, name)
+                locks[name].acquire()
+            if hold:
+                time.sleep(hold)
+            for name in reversed(order):
+                locks[name].release()
+                if client is not None:
+                    banker.release(client, name)
+
+    workers = [threading.Thread(target=worker, args=(("lock1", "lock2") if i % 2 else ("lock2", "lock1"),))
+               for i in range(threads)]
+    for w in workers:
+        w.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    wall = time.perf_counter() - start
+    return {"mode": mode, "threads": threads, "rounds_per_s": threads * rounds / wall,
+            "deferred": banker.deferred, "unsafe": banker.refused}
+
+
+###############################################################################
+# 2. Safety check
+###############################################################################
+def random_state(clients, resources, rng):
+    """
+    A random safe state: random allocations and remaining needs, and just enough free
+    units that the clients can finish in one random order.
+    """
+    allocation = rng.integers(0, 3, size=(clients, resources))
+    need = rng.integers(0, 3, size=(clients, resources))
+    order = rng.permutation(clients)
+    released_before = np.cumsum(allocation[order], axis=0) - allocation[order]
+    available = np.maximum(need[order] - released_before, 0).max(axis=0)
+    banker = BankersAllocator(available + allocation.sum(axis=0), capacity=clients)
+    for client in range(clients):
+        banker.register(dict(enumerate((allocation[client] + need[client]).tolist())))
+    banker.allocation[:clients] = allocation
+    banker.need[:clients] = need
+    banker.available = available.astype(np.int64)
+    return banker
+
+
+def python_safe(available, need, allocation):
+    work = list(available)
+    finished = [False] * len(need)
+    progress = True
+    while progress:
+        progress = False
+        for i, row in enumerate(need):
+            if not finished[i] and all(n <= w for n, w in zip(row, work)):
+                work = [w + a for w, a in zip(work, allocation[i])]
+                finished[i] = True
+                progress = True
+    return all(finished)
+
+
+def time_safety(clients, resources, repeat, seed):
+    rng = np.random.default_rng(seed)
+    banker = random_state(clients, resources, rng)
+    start = time.perf_counter_ns()
+    for _ in range(repeat):
+        safe = banker._reduce(banker.available.copy())
+    vectorized = (time.perf_counter_ns() - start) / repeat
+    available, need, allocation = banker.available.tolist(), banker.need.tolist(), banker.allocation.tolist()
+    loops = max(1, repeat // 10)
+    start = time.perf_counter_ns()
+    for _ in range(loops):
+        python_safe(available, need, allocation)
+    looped = (time.perf_counter_ns() - start) / loops
+    return {"clients": clients, "resources": resources, "safe": safe,
+            "numpy_us": vectorized / 1e3, "python_us": looped / 1e3}
+
+
+###############################################################################
+# 3. Main
+###############################################################################
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Banker's algorithm vs lock ordering")
+    parser.add_argument("--n", type=int, nargs="+", default=[5, 50], help="philosophers")
+    parser.add_argument("--duration", type=float, default=200.0, help="model seconds per philosopher run")
+    parser.add_argument("--scale", type=float, default=0.01, help="wall seconds per model second")
+    parser.add_argument("--threads", type=int, nargs="+", default=[2, 8], help="two-lock scenario")
+    parser.add_argument("--rounds", type=int, default=2000, help="two-lock rounds per thread")
+    parser.add_argument("--hold", type=float, default=0.0, help="seconds both locks are held")
+    parser.add_argument("--clients", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--resources", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--repeat", type=int, default=200, help="safety checks timed per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+    random.seed(args.seed)
+
+    philosophers = []
+    for n in args.n:
+        for name in ("v3_prevention", "v7_bankers"):
+            r = run_threads(name, n, args.duration, None, args.scale, None, None)
+            r.update({"strategy": name, "n": n})
+            philosophers.append(r)
+            print(f"philosophers {name:<14} n={n:<4} meals/model s {r['meals_per_model_second']:8.2f}  "
+                  f"p99 latency {r['latency_p99']:7.3f}")
+
+    two_lock = []
+    for threads in args.threads:
+        for mode in ("ordering", "bankers"):
+            r = two_lock_rounds(mode, threads, args.rounds, args.hold)
+            two_lock.append(r)
+            print(f"two-lock     {mode:<14} T={threads:<4} rounds/s {r['rounds_per_s']:10.0f}  "
+                  f"deferred {r['deferred']}  unsafe {r['unsafe']}")
+
+    safety = []
+    for clients in args.clients:
+        for resources in args.resources:
+            r = time_safety(clients, resources, args.repeat, args.seed)
+            safety.append(r)
+            print(f"safety check C={clients:<5} R={resources:<4} numpy {r['numpy_us']:9.1f} us  "
+                  f"python loops {r['python_us']:10.1f} us  (safe={r['safe']})")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "bankers", "config": vars(args), "philosophers": philosophers,
+                       "two_lock": two_lock, "safety": safety}, f, indent=2)
+    return philosophers, two_lock, safety
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""
+Summary statistics shared by the benchmarks (kept apart from philosopher_bench so
+importing them does not load every philosopher module).
+"""
+import math
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    # Nearest-rank percentile
+    index = max(0, math.ceil(q / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+def jain_index(values):
+    total = sum(values)
+    squares = sum(v * v for v in values)
+    if squares == 0:
+        return 0.0
+    return total * total / (len(values) * squares)
@@ -0,0 +1,82 @@
+"""
+Collision check cost per tick: the old pairwise boxes_collide loop vs the vectorized
+sweep-and-prune in circular_wait_cars/collision.py, for growing numbers of cars.
+
+    python benchmarks/collision_bench.py --cars 4 100 1000 10000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "circular_wait_cars"))
+from collision import colliding_pairs
+
+
+def boxes_collide(box1, box2):
+    """The per-pair test the car scripts used before (x1, y1, x2, y2 boxes)."""
+    return not (box1[2] < box2[0] or box1[0] > box2[2] or box1[3] < box2[1] or box1[1] > box2[3])
+
+
+def pairwise(boxes):
+    hits = []
+    for i in range(len(boxes)):
+        for j in range(i + 1, len(boxes)):
+            if boxes_collide(boxes[i], boxes[j]):
+                hits.append((i, j))
+    return hits
+
+
+def random_cars(n, rng):
+    # Keep density constant (about one car per 100x100 px) so the hit count grows with n
+    side = 100 * np.sqrt(n)
+    xs = rng.uniform(0, side, n)
+    ys = rng.uniform(0, side, n)
+    vertical = rng.random(n) < 0.5
+    half_w = np.where(vertical, 15.0, 25.0)
+    half_h = np.where(vertical, 25.0, 15.0)
+    return xs, ys, half_w, half_h
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collision broadphase benchmark")
+    parser.add_argument("--cars", nargs="+", type=int, default=[4, 100, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--max-pairwise", type=int, default=2000,
+                        help="skip the O(n^2) loop above this many cars")
+    parser.add_argument("--output", default=None)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    results = []
+    for n in args.cars:
+        xs, ys, half_w, half_h = random_cars(n, rng)
+
+        start = time.perf_counter()
+        for _ in range(args.ticks):
+            pairs = colliding_pairs(xs, ys, half_w, half_h)
+        vectorized = (time.perf_counter() - start) / args.ticks
+
+        naive = None
+        if n <= args.max_pairwise:
+            boxes = list(zip(xs - half_w, ys - half_h, xs + half_w, ys + half_h))
+            start = time.perf_counter()
+            expected = pairwise(boxes)
+            naive = time.perf_counter() - start
+            assert sorted(map(tuple, pairs.tolist())) == expected, "broadphase missed or invented a pair"
+
+        results.append({"cars": n, "pairs": len(pairs), "vectorized_s": vectorized, "pairwise_s": naive})
+        print(f"{n:>7} cars  {len(pairs):>7} overlaps  strip grid+SAP {vectorized * 1e3:8.3f} ms/tick"
+              + (f"  pairwise {naive * 1e3:9.3f} ms/tick" if naive is not None else ""))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "collision", "runs": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
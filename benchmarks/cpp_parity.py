@@ -0,0 +1,201 @@
+"""
+Python vs C++ on the same scenarios, built and run on Linux.
+
+Compiles every cpp_implemts/*.cpp with g++ (-O2 -pthread) into cpp_implemts/build/
+(rebuilt only when the source is newer) instead of the Windows-only .vscode task, then
+runs cpp_implemts/parity_bench.cpp next to the Python code with identical parameters:
+
+  lock        uncontended acquire + release: threading.Lock vs std::mutex, and
+              TrackedLock vs the same wait-for-graph bookkeeping in C++
+  philo vN    philosophers_all_versions.py versions 1-3 (threads on a WallClock) vs
+              C++ threads, same N, model duration and scale: meals per wall second
+  detect      two threads invert lock1/lock2; time from the acquire that closes the
+              cycle to the wait-for graph reporting it
+
+--run-demos also runs the original demo binaries for a few seconds each (most of them
+loop forever or deadlock on purpose), to check they still build and start on Linux.
+
+    python benchmarks/cpp_parity.py --n 5 --duration 200 --scale 0.001
+"""
+import argparse
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CPP_DIR = os.path.join(ROOT, "cpp_implemts")
+sys.path.insert(0, ROOT)
+from deadlock_tools.wait_for_graph import WaitForGraph, TrackedLock
+from lock_overhead import time_pairs
+from bench_stats import percentile
+from philosopher_bench import run_threads
+
+PHILO_STRATEGIES = {1: "v1_deadlock", 2: "v2_randomized", 3: "v3_prevention"}
+
+
+###############################################################################
+# 1. Build
+###############################################################################
+def build(build_dir, compiler="g++"):
+    """
+    Compiles every .cpp in cpp_implemts. Returns {name: path or None if it failed}.
+    """
+    if shutil.which(compiler) is None:
+        raise SystemExit(f"{compiler} not found")
+    os.makedirs(build_dir, exist_ok=True)
+    binaries = {}
+    # Every demo includes event_log.hpp, so a header change rebuilds them all
+    headers = max((os.path.getmtime(h) for h in glob.glob(os.path.join(CPP_DIR, "*.hpp"))), default=0)
+    for source in sorted(glob.glob(os.path.join(CPP_DIR, "*.cpp"))):
+        name = os.path.splitext(os.path.basename(source))[0]
+        binary = os.path.join(build_dir, name)
+        if not os.path.exists(binary) or os.path.getmtime(binary) < max(os.path.getmtime(source), headers):
+            out = subprocess.run([compiler, "-O2", "-std=c++17", "-pthread", source, "-o", binary],
+                                 capture_output=True, text=True)
+            if out.returncode != 0:
+                print(f"build {name}: FAILED\n{out.stderr.strip()}")
+                binaries[name] = None
+                continue
+        binaries[name] = binary
+    return binaries
+
+
+def run_cpp(binary, *args, timeout=600):
+    out = subprocess.run([binary] + [str(a) for a in args], capture_output=True, text=True, timeout=timeout)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+###############################################################################
+# 2. Python side of each scenario
+###############################################################################
+def python_lock(iterations):
+    graph = WaitForGraph()
+    return {
+        "mutex_ns": min(time_pairs(threading.Lock(), iterations) for _ in range(3)),
+        "tracked_ns": min(time_pairs(TrackedLock(graph, "bench"), iterations) for _ in range(3)),
+    }
+
+
+def python_detect(rounds):
+    latencies = []
+    for _ in range(rounds):
+        detected = []
+        graph = WaitForGraph(on_deadlock=lambda cycle: detected.append(time.perf_counter()))
+        lock1 = TrackedLock(graph, "lock1")
+        lock2 = TrackedLock(graph, "lock2")
+        both = threading.Barrier(2)
+        closing = []
+
+        def a():
+            lock1.acquire()
+            both.wait()
+            lock2.acquire()
+            lock2.release()
+            lock1.release()
+
+        def b():
+            lock2.acquire()
+            both.wait()
+            # Give A time to block on lock2 first, so B's acquire closes the cycle
+            time.sleep(0.005)
+            closing.append(time.perf_counter())
+            if lock1.acquire(timeout=0.05):   # back off after the timeout
+                lock1.release()
+            lock2.release()
+
+        threads = [threading.Thread(target=a), threading.Thread(target=b)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        if detected:
+            latencies.append((detected[0] - closing[0]) * 1e6)
+    latencies.sort()
+    return {
+        "detected": len(latencies),
+        "rounds": rounds,
+        "latency_p50_us": percentile(latencies, 50) if latencies else -1,
+        "latency_max_us": latencies[-1] if latencies else -1,
+    }
+
+
+def run_demos(binaries, seconds):
+    for name, binary in binaries.items():
+        if binary is None or name == "parity_bench":
+            continue
+        try:
+            out = subprocess.run([binary], capture_output=True, text=True, timeout=seconds)
+            outcome = f"exited with {out.returncode}"
+            lines = out.stdout.count("\n")
+        except subprocess.TimeoutExpired as e:
+            outcome = f"still running after {seconds:g} s"
+            lines = (e.stdout or b"").count(b"\n")
+        print(f"demo {name:<28} {outcome}, {lines} lines of output")
+
+
+###############################################################################
+# 3. Main
+###############################################################################
+def row(scenario, metric, python, cpp):
+    ratio = python / cpp if cpp else None
+    print(f"{scenario:<10} {metric:<22} python {python:14.3f}  c++ {cpp:14.3f}"
+          + (f"  python/c++ x{ratio:.1f}" if ratio is not None else ""))
+    return {"scenario": scenario, "metric": metric, "python": python, "cpp": cpp, "python_over_cpp": ratio}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Python vs C++ parity benchmark")
+    parser.add_argument("--build-dir", default=os.path.join(CPP_DIR, "build"))
+    parser.add_argument("--compiler", default="g++")
+    parser.add_argument("--iterations", type=int, default=1_000_000, help="lock scenario")
+    parser.add_argument("--n", type=int, default=5, help="philosophers")
+    parser.add_argument("--duration", type=float, default=200.0, help="model seconds per philosopher run")
+    parser.add_argument("--scale", type=float, default=0.001, help="wall seconds per model second")
+    parser.add_argument("--versions", nargs="+", type=int, default=[1, 2, 3], choices=[1, 2, 3])
+    parser.add_argument("--rounds", type=int, default=50, help="detection scenario")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--run-demos", type=float, default=None, metavar="SECONDS",
+                        help="also run each original demo binary for this long")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    binaries = build(args.build_dir, args.compiler)
+    print(f"built {sum(b is not None for b in binaries.values())}/{len(binaries)} programs into {args.build_dir}")
+    bench = binaries.get("parity_bench")
+    if bench is None:
+        raise SystemExit("parity_bench did not build")
+    if args.run_demos:
+        run_demos(binaries, args.run_demos)
+
+    rows = []
+    py, cpp = python_lock(args.iterations), run_cpp(bench, "lock", args.iterations)
+    rows.append(row("lock", "plain ns/pair", py["mutex_ns"], cpp["mutex_ns"]))
+    rows.append(row("lock", "tracked ns/pair", py["tracked_ns"], cpp["tracked_ns"]))
+
+    for version in args.versions:
+        py = run_threads(PHILO_STRATEGIES[version], args.n, args.duration, None, args.scale, None, None)
+        cpp = run_cpp(bench, "philo", version, args.n, args.duration, args.scale, args.seed)
+        r = row(f"philo v{version}", "meals/wall s", py["meals_per_wall_second"], cpp["meals_per_wall_second"])
+        r.update({"python_deadlocked": py["deadlocked"], "cpp_deadlocked": cpp["deadlocked"]})
+        if py["deadlocked"] or cpp["deadlocked"]:
+            print(f"{'':<10} deadlocked: python {py['deadlocked']}, c++ {cpp['deadlocked']}")
+        rows.append(r)
+
+    py, cpp = python_detect(args.rounds), run_cpp(bench, "detect", args.rounds)
+    rows.append(row("detect", "latency p50 us", py["latency_p50_us"], cpp["latency_p50_us"]))
+    rows.append(row("detect", "latency max us", py["latency_max_us"], cpp["latency_max_us"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "cpp_parity", "config": vars(args), "builds": sorted(binaries),
+                       "rows": rows}, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+FairLock vs threading.Lock under contention.
+
+T threads loop for --duration seconds: acquire, spin --hold iterations inside the lock,
+release, spin --work iterations outside. Per lock type it reports throughput
+(acquisitions/s), wait latency p50/p99/max, Jain fairness over per-thread counts and
+the least served thread's share.
+
+Each lock type runs --repeat times, alternating with the other so both see the same
+machine load, and the run with the median throughput is reported. The loss is taken per
+round (each FairLock run against the threading.Lock run just before it) and the median
+round decides: exits with status 1 if FairLock is more than --max-loss percent slower,
+so the price of bounded waits stays visible.
+
+    python benchmarks/fair_lock_bench.py --threads 8 --duration 1 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.fair_lock import FairLock
+from bench_stats import percentile, jain_index
+
+LOCKS = {
+    "threading.Lock": threading.Lock,
+    "FairLock": FairLock,
+}
+
+
+def spin(iterations):
+    x = 0
+    for i in range(iterations):
+        x += i
+    return x
+
+
+def run(factory, threads, duration, hold, work):
+    lock = factory()
+    stop = threading.Event()
+    start_line = threading.Barrier(threads + 1)
+    waits = [[] for _ in range(threads)]
+    now_ns = time.perf_counter_ns
+
+    def worker(index):
+        my_waits = waits[index]
+        start_line.wait()
+        while not stop.is_set():
+            t0 = now_ns()
+            lock.acquire()
+            my_waits.append(now_ns() - t0)
+            spin(hold)
+            lock.release()
+            spin(work)
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    start_line.wait()
+    started = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - started
+
+    counts = [len(w) for w in waits]
+    all_waits = sorted(x for w in waits for x in w)
+    total = sum(counts)
+    return {
+        "acquisitions": total,
+        "throughput_per_s": total / elapsed,
+        "wait_p50_us": percentile(all_waits, 50) / 1e3,
+        "wait_p99_us": percentile(all_waits, 99) / 1e3,
+        "wait_max_us": all_waits[-1] / 1e3,
+        "jain_fairness": jain_index(counts),
+        "min_share": min(counts) * threads / total if total else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fair (FIFO) lock vs threading.Lock")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=1.0, help="seconds per run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per lock type (median reported)")
+    parser.add_argument("--hold", type=int, default=50, help="spin iterations inside the lock")
+    parser.add_argument("--work", type=int, default=500, help="spin iterations outside the lock")
+    parser.add_argument("--max-loss", type=float, default=25.0,
+                        help="allowed FairLock throughput loss vs threading.Lock, percent")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    rounds = {name: [] for name in LOCKS}
+    for _ in range(args.repeat):
+        for name, factory in LOCKS.items():
+            rounds[name].append(run(factory, args.threads, args.duration, args.hold, args.work))
+
+    results = {}
+    for name, rs in rounds.items():
+        rs = sorted(rs, key=lambda r: r["throughput_per_s"])
+        r = results[name] = dict(rs[len(rs) // 2], throughput_runs=[x["throughput_per_s"] for x in rs])
+        print(f"{name:<16} {r['throughput_per_s']:>10.0f} acq/s  wait p50 {r['wait_p50_us']:8.1f} us"
+              f"  p99 {r['wait_p99_us']:9.1f} us  max {r['wait_max_us']:10.1f} us"
+              f"  jain {r['jain_fairness']:.3f}  min share {r['min_share']:.2f}"
+              f"  (runs {rs[0]['throughput_per_s']:.0f}-{rs[-1]['throughput_per_s']:.0f})")
+
+    losses = sorted(100.0 * (1 - fair["throughput_per_s"] / plain["throughput_per_s"])
+                    for plain, fair in zip(rounds["threading.Lock"], rounds["FairLock"])
+                    if plain["throughput_per_s"])
+    loss = losses[len(losses) // 2] if losses else 0.0
+    ok = loss <= args.max_loss
+    print(f"FairLock throughput loss: {loss:.1f}% median of {len(losses)} rounds "
+          f"({losses[0]:.1f}-{losses[-1]:.1f}%, limit {args.max_loss:.0f}%) -> {'ok' if ok else 'TOO SLOW'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "fair_lock", "threads": args.threads, "repeat": args.repeat, "hold": args.hold,
+                       "work": args.work, "throughput_loss_pct": loss, "round_losses_pct": losses, "max_loss_pct": args.max_loss,
+                       "locks": results}, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
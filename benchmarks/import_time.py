@@ -0,0 +1,90 @@
+"""
+Startup cost of the scripts' modules, each imported in a fresh interpreter.
+
+Headless modules must not pull in tkinter, PIL or NumPy; the GUI entries are there
+for comparison. Exits with status 1 if a headless module loads a GUI library or
+takes longer than --budget-ms to import.
+
+    python benchmarks/import_time.py --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+CARS = os.path.join(ROOT, "circular_wait_cars")
+PHILOSOPHERS = os.path.join(ROOT, "philosphers")
+
+# (module, directory it is imported from, headless?)
+MODULES = [
+    ("deadlock_tools.wait_for_graph", ROOT, True),
+    ("deadlock_tools.lock_profiler", ROOT, True),
+    ("deadlock_tools.virtual_clock", ROOT, True),
+    ("circular_wait_picture", CARS, True),
+    ("circular_wait_with_rollback", CARS, True),
+    ("traffic_grid", CARS, True),
+    ("philosopher_sim", PHILOSOPHERS, True),
+    ("philosophers_all_versions", PHILOSOPHERS, True),
+    ("philosopher_deadlock", PHILOSOPHERS, True),
+    ("philosopher_random", PHILOSOPHERS, True),
+    # What a rendering run pays on top
+    ("tkinter", ROOT, False),
+    ("draw_intersection", CARS, False),
+]
+GUI_MODULES = ("tkinter", "PIL", "numpy")
+
+_PROBE = """
+import sys, time, json
+sys.path[:0] = [{path!r}, {root!r}]
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "gui": [m for m in {gui!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module, path):
+    code = _PROBE.format(path=os.path.abspath(path), root=os.path.abspath(ROOT), module=module, gui=GUI_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, cwd=path)
+    if out.returncode != 0:
+        return {"error": out.stderr.strip().splitlines()[-1] if out.stderr else "failed"}
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time per module, fresh interpreter each run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=50.0,
+                        help="maximum import time for headless modules")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    results = []
+    failed = False
+    for module, path, headless in MODULES:
+        runs = [probe(module, path) for _ in range(args.repeat)]
+        errors = [r["error"] for r in runs if "error" in r]
+        if errors:
+            print(f"{module:<32} import failed: {errors[0]}")
+            results.append({"module": module, "headless": headless, "error": errors[0]})
+            failed = failed or headless
+            continue
+        # Best of N: the first run also pays for cold .pyc and disk caches
+        ms = min(r["seconds"] for r in runs) * 1e3
+        gui = runs[0]["gui"]
+        ok = not headless or (not gui and ms <= args.budget_ms)
+        failed = failed or not ok
+        results.append({"module": module, "headless": headless, "import_ms": ms, "gui_loaded": gui})
+        print(f"{module:<32} {ms:8.2f} ms  {'headless' if headless else 'gui     '}"
+              f"  {'loads ' + ', '.join(gui) if gui else ''}{'' if ok else '  OVER BUDGET'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "import_time", "budget_ms": args.budget_ms, "runs": results}, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Cost of one uncontended acquire + release for each lock wrapper in deadlock_tools,
+compared with a plain threading.Lock.
+
+    python benchmarks/lock_overhead.py --iterations 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.lock_profiler import ProfiledLock
+from deadlock_tools.fair_lock import FairLock
+from deadlock_tools.trace_recorder import TraceRecorder, RecordedLock
+from deadlock_tools.checked_lock import CheckedLock
+
+# name -> function returning a fresh lock
+LOCKS = {
+    "threading.Lock": threading.Lock,
+    "ProfiledLock": lambda: ProfiledLock("bench"),
+    "FairLock": FairLock,
+    "RecordedLock": lambda: RecordedLock(TraceRecorder(), "bench"),
+    "CheckedLock": lambda: CheckedLock("bench"),
+}
+
+
+def time_pairs(lock, iterations):
+    acquire = lock.acquire
+    release = lock.release
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        acquire()
+        release()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Uncontended lock overhead")
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, factory in LOCKS.items():
+        # Best of N: we want the cost of the code, not of the noisiest run
+        results[name] = min(time_pairs(factory(), args.iterations) for _ in range(args.repeat))
+
+    base = results["threading.Lock"]
+    for name, ns in results.items():
+        print(f"{name:<20} {ns:8.1f} ns per acquire+release  (+{ns - base:.1f} ns)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "lock_overhead", "ns_per_pair": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Cost of one log line on the calling thread: print() vs EventLog (on and off).
+
+T threads each write --lines lines; reported is wall time per line as seen by the
+logging threads, i.e. what a lock demo's hot path pays. print() goes to a line
+buffered file, which flushes like a terminal does; EventLog writes to the same kind
+of file from its background thread.
+
+    python benchmarks/log_overhead.py --threads 4 --lines 20000
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.event_log import EventLog, INFO, OFF
+
+
+def timed(threads, lines, emit):
+    start_line = threading.Barrier(threads + 1)
+
+    def worker():
+        start_line.wait()
+        for i in range(lines):
+            emit(i)
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    start_line.wait()
+    start = time.perf_counter_ns()
+    for w in workers:
+        w.join()
+    return (time.perf_counter_ns() - start) / (threads * lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="print() vs EventLog per-line cost")
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--lines", type=int, default=20000, help="lines per thread")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with open(os.devnull, "w", buffering=1) as sink:
+        results["print"] = timed(args.threads, args.lines,
+                                 lambda i: print("[Thread] Acquired lock1", i, file=sink, flush=True))
+        log = EventLog(stream=sink, level=INFO)
+        results["EventLog"] = timed(args.threads, args.lines, lambda i: log.info("Acquired", lock="lock1", i=i))
+        log.close()
+        off = EventLog(stream=sink, level=OFF)
+        results["EventLog off"] = timed(args.threads, args.lines, lambda i: off.info("Acquired", lock="lock1", i=i))
+
+    for name, ns in results.items():
+        print(f"{name:<14} {ns:8.1f} ns per line")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "log_overhead", "threads": args.threads, "ns_per_line": results}, f, indent=2)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+CPU-bound eating: philosopher processes vs philosopher threads.
+
+Version 3 (prevention) with no thinking and --eat-work spin iterations per meal, so
+at most N // 2 philosophers eat at once and all of their time is Python bytecode.
+Threads take turns on the GIL whatever N is; processes should scale with N // 2 up to
+the number of cores. Reported per N: meals/s for both engines, the process speedup
+over threads and the process throughput relative to N=2 (one eater).
+
+    python benchmarks/multiprocess_scaling.py --n 2 4 8 16 --duration 5
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "philosphers"))
+from philosophers_multiprocess import MultiprocessPhilosophers
+
+
+def main(argv=None):
+    cores = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Multiprocess vs threaded philosophers, CPU-bound eating")
+    parser.add_argument("--n", nargs="+", type=int, default=sorted({2, 4, 2 * cores, 4 * cores}))
+    parser.add_argument("--duration", type=float, default=5.0, help="wall seconds per run")
+    parser.add_argument("--eat-work", type=int, default=200_000, help="spin iterations per meal")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    print(f"{cores} cores")
+    runs = []
+    base = None
+    for n in args.n:
+        row = {"n": n, "eaters": n // 2}
+        for engine in ("threads", "processes"):
+            demo = MultiprocessPhilosophers(3, n, engine, scale=0.0, eat_work=args.eat_work, seed=n)
+            row[engine] = demo.run(args.duration)["meals_per_wall_second"]
+        if base is None:
+            base = row["processes"]
+        row["speedup_vs_threads"] = row["processes"] / row["threads"] if row["threads"] else None
+        row["scaling_vs_first"] = row["processes"] / base if base else None
+        runs.append(row)
+        print(f"n={n:<4} eaters={n // 2:<3} threads {row['threads']:9.1f} meals/s  "
+              f"processes {row['processes']:9.1f} meals/s  x{row['speedup_vs_threads'] or 0:.2f} vs threads  "
+              f"x{row['scaling_vs_first'] or 0:.2f} vs n={args.n[0]}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "multiprocess_scaling", "cores": cores, "eat_work": args.eat_work,
+                       "runs": runs}, f, indent=2)
+    return runs
+
+
+if __name__ == "__main__":
+    main()
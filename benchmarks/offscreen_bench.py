@@ -0,0 +1,100 @@
+"""
+What recording costs the simulation: OffscreenRenderer.submit() on the calling thread
+against drawing and encoding the same frame inline, for the table and intersection
+scenes and both outputs (GIF, PNG frames).
+
+    python benchmarks/offscreen_bench.py --frames 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "circular_wait_cars"))
+from PIL import Image, ImageDraw
+from deadlock_tools.offscreen import OffscreenRenderer, TableScene, IntersectionScene, GifWriter, PngSequenceWriter
+import sprite_cache
+
+STATES = ("THINKING", "HUNGRY", "EATING")
+HEADINGS = ("south", "north", "east", "west")
+
+
+def table_frames(n, frames, rng):
+    return [(tuple(rng.choice(STATES) for _ in range(n)), tuple(rng.random() < 0.5 for _ in range(n)))
+            for _ in range(frames)]
+
+
+def intersection_frames(frames, rng):
+    return [tuple((rng.randrange(500), rng.randrange(500), h) for h in HEADINGS) for _ in range(frames)]
+
+
+def inline(scene, states, path):
+    """
+    Draw + encode on the calling thread, per frame.
+    """
+    background = Image.new("RGB", scene.size, "white")
+    scene.background(background, ImageDraw.Draw(background))
+    buffer = background.copy()
+    draw = ImageDraw.Draw(buffer)
+    writer = GifWriter(path, 10) if path.endswith(".gif") else PngSequenceWriter(path)
+    start = time.perf_counter_ns()
+    for state in states:
+        buffer.paste(background)
+        scene.draw(buffer, draw, state)
+        writer.write(buffer)
+    per_frame = (time.perf_counter_ns() - start) / len(states)
+    writer.close()
+    return per_frame
+
+
+def offloaded(scene, states, path):
+    """
+    submit() only, as the simulation sees it; then the time to drain.
+    """
+    renderer = OffscreenRenderer(scene, path, max_pending=len(states) + 1)
+    start = time.perf_counter_ns()
+    for state in states:
+        renderer.submit(state)
+    per_submit = (time.perf_counter_ns() - start) / len(states)
+    renderer.close()
+    return per_submit, renderer.dropped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offscreen renderer cost on the simulation thread")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--n", type=int, default=5, help="philosophers")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    scenes = {
+        "table": (TableScene(args.n), table_frames(args.n, args.frames, rng)),
+        "intersection": (IntersectionScene(sprite_cache.car_sprites()), intersection_frames(args.frames, rng)),
+    }
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (scene, states) in scenes.items():
+            for kind in ("gif", "png"):
+                target = os.path.join(tmp, f"{name}_{kind}")
+                inline_ns = inline(scene, states, target + "_inline" + (".gif" if kind == "gif" else ""))
+                submit_ns, dropped = offloaded(scene, states, target + (".gif" if kind == "gif" else ""))
+                rows.append({"scene": name, "output": kind, "inline_us_per_frame": inline_ns / 1e3,
+                             "submit_us_per_frame": submit_ns / 1e3, "dropped": dropped})
+                print(f"{name:<13} {kind}  inline {inline_ns / 1e3:9.1f} us/frame   "
+                      f"submit {submit_ns / 1e3:7.1f} us/frame   dropped {dropped}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "offscreen", "config": vars(args), "rows": rows}, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
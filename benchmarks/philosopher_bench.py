@@ -0,0 +1,260 @@
+"""
+Benchmark for the dining philosopher strategies.
+
+Drives every strategy headless for a fixed (model) duration or meal count and reports:
+  - throughput (meals per model second and per wall-clock second)
+  - p50/p95/p99 hungry -> eating latency
+  - max starvation time (longest hungry stretch, including philosophers still waiting)
+  - Jain fairness index over meals per philosopher
+
+Two engines:
+  threads  real philosopher threads on a scaled WallClock (default: 1 model second = 1 ms)
+  sim      the discrete-event engine from philosopher_sim.py (deterministic per seed)
+
+Results are written as JSON (with the git commit) so runs can be diffed between commits:
+    python benchmarks/philosopher_bench.py --n 5 50 --duration 200 --output results.json
+"""
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "philosphers"))
+
+from deadlock_tools.virtual_clock import VirtualClock, WallClock
+from bench_stats import percentile, jain_index
+import philosophers_all_versions
+import philosopher_deadlock
+import philosopher_random
+
+STATE_HUNGRY = "HUNGRY"
+STATE_EATING = "EATING"
+
+# name -> function(**options) that builds a DiningPhilosophersDemo
+# (versions 4-7 only exist as threads, the sim engine covers the others)
+STRATEGIES = {
+    "v1_deadlock": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(1, **kw),
+    "v2_randomized": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(2, **kw),
+    "v3_prevention": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(3, **kw),
+    "v4_waiter": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(4, **kw),
+    "v5_chandy_misra": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(5, **kw),
+    "v6_tanenbaum": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(6, **kw),
+    "v7_bankers": lambda **kw: philosophers_all_versions.DiningPhilosophersDemo(7, **kw),
+    "philosopher_deadlock.py": lambda **kw: philosopher_deadlock.DiningPhilosophersDemo(**kw),
+    "philosopher_random.py": lambda **kw: philosopher_random.DiningPhilosophersDemo(**kw),
+}
+
+# Modules a strategy imports lazily, loaded before its clock starts: NumPy alone takes
+# ~100 ms, which would otherwise come out of the measured window
+PRELOAD = {"v7_bankers": "deadlock_tools.bankers"}
+
+SIM_STRATEGIES = ("v1_deadlock", "v2_randomized", "v3_prevention",
+                  "philosopher_deadlock.py", "philosopher_random.py")
+
+
+###############################################################################
+# 1. Distributions ("default", "fixed:2", "uniform:1:3", "exp:2")
+###############################################################################
+def parse_distribution(spec, rng):
+    """
+    Returns a think_time/eat_time function, or None to keep the strategy's own durations.
+    """
+    kind, *params = spec.split(":")
+    params = [float(p) for p in params]
+    if kind == "default":
+        return None
+    if kind == "fixed":
+        return lambda _duration: params[0]
+    if kind == "uniform":
+        return lambda _duration: rng.uniform(params[0], params[1])
+    if kind == "exp":
+        return lambda _duration: rng.expovariate(1.0 / params[0])
+    raise ValueError(f"Unknown distribution {spec!r}")
+
+
+###############################################################################
+# 2. Recording
+###############################################################################
+class Recorder:
+    """
+    on_state callback. Each philosopher only touches its own slots (list.append is
+    atomic), so the threaded engine needs no extra locking here.
+
+    Only events in the window [start, start + length] (model seconds) are kept, with
+    times relative to start; threaded runs set start once the demo is built, so thread
+    start-up and stop() do not count as run time.
+    """
+
+    def __init__(self, n, start=0.0, length=None):
+        self.meals = [0] * n
+        self.hungry_since = [None] * n
+        self.latencies = []
+        self.start = start
+        self.length = length
+
+    @property
+    def total_meals(self):
+        return sum(self.meals)
+
+    def on_state(self, phil_id, state, now):
+        now -= self.start
+        if now < 0 or (self.length is not None and now > self.length):
+            return
+        if state == STATE_HUNGRY:
+            self.hungry_since[phil_id] = now
+        elif state == STATE_EATING:
+            start = self.hungry_since[phil_id]
+            if start is not None:
+                self.latencies.append(now - start)
+                self.hungry_since[phil_id] = None
+            self.meals[phil_id] += 1
+
+
+def summarize(recorder, model_duration, wall_seconds):
+    latencies = sorted(recorder.latencies)
+    still_hungry = [model_duration - t for t in recorder.hungry_since if t is not None]
+    longest = max(latencies + still_hungry, default=0.0)
+    return {
+        "meals": recorder.total_meals,
+        "model_seconds": model_duration,
+        "wall_seconds": wall_seconds,
+        "meals_per_model_second": recorder.total_meals / model_duration if model_duration else 0.0,
+        "meals_per_wall_second": recorder.total_meals / wall_seconds if wall_seconds else 0.0,
+        "latency_p50": percentile(latencies, 50),
+        "latency_p95": percentile(latencies, 95),
+        "latency_p99": percentile(latencies, 99),
+        "max_starvation": longest,
+        "jain_fairness": jain_index(recorder.meals),
+    }
+
+
+###############################################################################
+# 3. Engines
+###############################################################################
+def run_threads(name, n, duration, meals, scale, think_time, eat_time):
+    if name in PRELOAD:
+        importlib.import_module(PRELOAD[name])
+    recorder = Recorder(n)
+    clock = WallClock(scale)
+    start = time.perf_counter()
+    demo = STRATEGIES[name](headless=True, clock=clock, num_philosophers=n,
+                            think_time=think_time, eat_time=eat_time,
+                            on_state=recorder.on_state)
+
+    poll = min(0.01, max(scale, 0.001))
+    while clock.now() < duration and (meals is None or recorder.total_meals < meals):
+        if demo.wait_graph.deadlocks:
+            break  # nobody in the cycle will ever eat again
+        time.sleep(poll)
+    demo.stop()
+
+    model_duration = clock.now()
+    if demo.wait_graph.deadlocks and meals is None:
+        # A deadlocked run is stuck for the rest of the window
+        model_duration = duration
+    result = summarize(recorder, model_duration, time.perf_counter() - start)
+    result["deadlocked"] = bool(demo.wait_graph.deadlocks)
+    return result
+
+
+def run_sim(name, n, duration, meals, seed, think_time, eat_time):
+    if name not in SIM_STRATEGIES:
+        raise SystemExit(f"{name} has no discrete-event version, use --engine threads")
+    recorder = Recorder(n)
+    clock = VirtualClock()
+    start = time.perf_counter()
+    demo = STRATEGIES[name](headless=True, clock=clock, num_philosophers=n, seed=seed,
+                            max_meals=meals, until=duration, think_time=think_time,
+                            eat_time=eat_time, on_state=recorder.on_state)
+    sim_result = demo.result
+    # A deadlocked run is stuck for the rest of the window
+    model_duration = duration if sim_result.deadlocked else sim_result.end_time
+    result = summarize(recorder, model_duration, time.perf_counter() - start)
+    result["deadlocked"] = sim_result.deadlocked
+    result["deadlock_time"] = sim_result.deadlock_time
+    return result
+
+
+###############################################################################
+# 4. Main
+###############################################################################
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--strategies", nargs="+", default=None, choices=list(STRATEGIES),
+                        help="default: every strategy the engine has")
+    parser.add_argument("--engine", choices=("threads", "sim"), default="threads")
+    parser.add_argument("--n", nargs="+", type=int, default=[5])
+    parser.add_argument("--duration", type=float, default=200.0, help="model seconds per run")
+    parser.add_argument("--meals", type=int, default=None, help="stop a run after this many meals")
+    parser.add_argument("--scale", type=float, default=0.001,
+                        help="wall seconds per model second (threads engine)")
+    parser.add_argument("--think", default="default", help="default | fixed:S | uniform:A:B | exp:MEAN")
+    parser.add_argument("--eat", default="default", help="default | fixed:S | uniform:A:B | exp:MEAN")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+    if args.strategies is None:
+        args.strategies = list(SIM_STRATEGIES if args.engine == "sim" else STRATEGIES)
+    if args.engine == "sim":
+        skipped = [name for name in args.strategies if name not in SIM_STRATEGIES]
+        if skipped:
+            print(f"Skipping {', '.join(skipped)}: no discrete-event version, use --engine threads")
+        args.strategies = [name for name in args.strategies if name in SIM_STRATEGIES]
+
+    runs = []
+    for n in args.n:
+        for name in args.strategies:
+            rng = random.Random(args.seed)
+            random.seed(args.seed)
+            think_time = parse_distribution(args.think, rng)
+            eat_time = parse_distribution(args.eat, rng)
+            if args.engine == "threads":
+                result = run_threads(name, n, args.duration, args.meals, args.scale, think_time, eat_time)
+            else:
+                result = run_sim(name, n, args.duration, args.meals, args.seed, think_time, eat_time)
+            result.update({"strategy": name, "engine": args.engine, "n": n})
+            runs.append(result)
+            print(format_row(result))
+
+    report = {
+        "benchmark": "philosophers",
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": vars(args),
+        "runs": runs,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+    return report
+
+
+def format_row(r):
+    def fmt(v):
+        return "-" if v is None else f"{v:.3f}"
+    return (f"{r['strategy']:<24} n={r['n']:<5} meals={r['meals']:<7} "
+            f"meals/s={r['meals_per_model_second']:.2f} (wall {r['meals_per_wall_second']:.0f}) "
+            f"p50={fmt(r['latency_p50'])} p95={fmt(r['latency_p95'])} p99={fmt(r['latency_p99'])} "
+            f"starve={r['max_starvation']:.3f} jain={r['jain_fairness']:.3f}"
+            + (" DEADLOCK" if r["deadlocked"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Cost of a ResourceGraph deadlock check with many threads and resources.
+
+Builds the graph state directly (no real threads): T threads, R semaphore pools of
+--units units each, every unit handed out at random, then every thread but --running
+of them waiting for one unit of a random pool. Each timed check is the one a new
+waiter triggers; --running 0 makes it a real deadlock, so the reduction has to visit
+every thread instead of stopping early. Also times an uncontended TrackedSemaphore
+acquire + release against a plain threading.Semaphore.
+
+    python benchmarks/resource_graph_bench.py --threads 500 --resources 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.resource_graph import ResourceGraph, TrackedSemaphore
+from lock_overhead import time_pairs
+from bench_stats import percentile
+
+
+def build(threads, resources, units, running, rng):
+    graph = ResourceGraph()
+    pools = [graph.resource(f"pool{i}", units) for i in range(resources)]
+    idents = list(range(1, threads + 1))
+    for pool in pools:
+        for _ in range(units):
+            graph._acquired(rng.choice(idents), pool)
+    for ident in idents[running:]:
+        graph.waiting_on[ident] = (rng.choice(pools), 1)
+    return graph, pools, idents
+
+
+def time_checks(graph, pools, idents, checks, rng):
+    """
+    Re-issues a random waiter's request `checks` times. Returns (ns per check, deadlocks).
+    """
+    waiters = list(graph.waiting_on)
+    timings = []
+    found = 0
+    for _ in range(checks):
+        ident = rng.choice(waiters) if waiters else rng.choice(idents)
+        previous = graph.waiting_on.pop(ident, None)
+        start = time.perf_counter_ns()
+        deadlock = graph._wait(ident, previous[0] if previous else rng.choice(pools))
+        timings.append(time.perf_counter_ns() - start)
+        found += deadlock is not None
+        if previous is None:
+            graph._stop_waiting(ident)
+        else:
+            graph.waiting_on[ident] = previous
+    timings.sort()
+    return timings, found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ResourceGraph detection cost")
+    parser.add_argument("--threads", type=int, default=500)
+    parser.add_argument("--resources", type=int, default=200)
+    parser.add_argument("--units", type=int, default=3, help="units per pool")
+    parser.add_argument("--running", type=int, nargs="+", default=[0, 5, 50],
+                        help="threads that are not waiting (0: everybody is deadlocked)")
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=200000, help="uncontended acquire + release")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for running in args.running:
+        rng = random.Random(args.seed)
+        graph, pools, idents = build(args.threads, args.resources, args.units, running, rng)
+        timings, found = time_checks(graph, pools, idents, args.checks, rng)
+        row = {
+            "threads": args.threads,
+            "resources": args.resources,
+            "running": running,
+            "deadlocked_checks": found,
+            "p50_us": percentile(timings, 50) / 1e3,
+            "p99_us": percentile(timings, 99) / 1e3,
+            "max_us": timings[-1] / 1e3,
+        }
+        rows.append(row)
+        print(f"{args.threads} threads, {args.resources} pools, {running:>3} running: "
+              f"check p50 {row['p50_us']:8.1f} us  p99 {row['p99_us']:8.1f} us  max {row['max_us']:8.1f} us"
+              f"  ({found}/{args.checks} found a deadlock)")
+
+    plain = min(time_pairs(threading.Semaphore(1), args.iterations) for _ in range(3))
+    tracked = min(time_pairs(TrackedSemaphore(ResourceGraph(), 1), args.iterations) for _ in range(3))
+    print(f"threading.Semaphore    {plain:8.1f} ns per acquire+release")
+    print(f"TrackedSemaphore       {tracked:8.1f} ns per acquire+release  (+{tracked - plain:.1f} ns)")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "resource_graph", "config": vars(args), "checks": rows,
+                       "semaphore_ns": plain, "tracked_semaphore_ns": tracked}, f, indent=2)
+    return rows
+
+
+if __name__ == "__main__":
+    main()
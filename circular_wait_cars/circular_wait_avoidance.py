@@ -0,0 +1,58 @@
+import threading
+import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.wait_for_graph import WaitForGraph, TrackedLock
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.bankers import BankersAllocator
+from deadlock_tools.event_log import event_log
+from deadlock_tools.metrics import exported, wait_graph_metrics, bankers_metrics
+
+# Same two cars as circular_wait_picture.py, each taking its lock and then the other
+# one. Here both declare up front that they need lock1 and lock2, and the banker only
+# hands out a lock if both cars can still get through afterwards: once car 1 holds
+# lock1, car 2's request for lock2 waits instead of closing the cycle. The locks are
+# still tracked, so a deadlock would be reported (it never is).
+wait_graph = WaitForGraph()
+lock1 = TrackedLock(wait_graph, "lock1", inner=recorded("lock1", inner=profiled("lock1")))
+lock2 = TrackedLock(wait_graph, "lock2", inner=recorded("lock2", inner=profiled("lock2")))
+banker = BankersAllocator([1, 1], names=["lock1", "lock2"])
+# Buffered, written by a background thread (DEADLOCK_LOG=off silences it)
+log = event_log()
+
+ROUNDS = 3
+
+def car(first, second, rounds):
+    client = banker.register({"lock1": 1, "lock2": 1})
+    for _ in range(rounds):
+        for lock in (first, second):
+            log.info("Waiting", lock=lock.name)
+            banker.request(client, lock.name)
+            # Granted: the lock is free, this acquire never blocks
+            lock.acquire()
+            log.info("Acquired", lock=lock.name)
+            time.sleep(1)
+        second.release()
+        banker.release(client, second.name)
+        first.release()
+        banker.release(client, first.name)
+        log.info("Released locks")
+    banker.unregister(client)
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[sys.argv.index("--rounds") + 1]) if "--rounds" in sys.argv else ROUNDS
+    # Lock and banker counters over HTTP when DEADLOCK_METRICS is set
+    exported(wait_graph_metrics(wait_graph), bankers_metrics(banker))
+
+    t1 = threading.Thread(target=car, args=(lock1, lock2, rounds), name="Car 1")
+    t2 = threading.Thread(target=car, args=(lock2, lock1, rounds), name="Car 2")
+    t1.start()
+    t2.start()
+    t1.join()
+    t2.join()
+    log.info("[Main] Done.", deadlocks=len(wait_graph.deadlocks),
+             deferred=banker.deferred, unsafe=banker.refused)
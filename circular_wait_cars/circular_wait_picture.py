@@ -1,64 +1,78 @@
 import threading
 import time
-import tkinter as tk
-import intersection2
-
-# Create locks
-lock1 = threading.Lock()
-lock2 = threading.Lock()
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.wait_for_graph import WaitForGraph, TrackedLock, describe_cycle
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.event_log import event_log
+
+# Create locks (tracked, so the deadlock is reported as soon as the cycle forms)
+wait_graph = WaitForGraph()
+lock1 = TrackedLock(wait_graph, "lock1", inner=recorded("lock1", inner=profiled("lock1")))
+lock2 = TrackedLock(wait_graph, "lock2", inner=recorded("lock2", inner=profiled("lock2")))
+# Buffered, written by a background thread (DEADLOCK_LOG=off silences it)
+log = event_log()
 
 def thread_1():
     lock1.acquire()
-    print("Thread 1 acquired lock1")
+    log.info("Acquired", lock="lock1")
 
     time.sleep(1)
 
-    print("Thread 1 waiting for lock2")
+    log.info("Waiting", lock="lock2")
     lock2.acquire()
-    print("Thread 1 acquired lock2")
+    log.info("Acquired", lock="lock2")
 
     lock1.release()
     lock2.release()
 
 def thread_2():
     lock2.acquire()
-    print("Thread 2 acquired lock2")
+    log.info("Acquired", lock="lock2")
 
     time.sleep(1)
 
-    print("Thread 2 waiting for lock1")
+    log.info("Waiting", lock="lock1")
     lock1.acquire()
-    print("Thread 2 acquired lock1")
+    log.info("Acquired", lock="lock1")
 
     lock1.release()
     lock2.release()
 
-def detect_deadlock():
-    # time.sleep(3)  # Allow threads to potentially deadlock
-    running = True
-    while running:
-        if lock1.locked() and lock2.locked():
-            time.sleep(2)
-            print("Deadlock detected! Visualizing...")
-            intersection2.draw_intersection_with_moving_cars()
-            running = False
-
-
-# Create and start threads
-t1 = threading.Thread(target=thread_1)
-t2 = threading.Thread(target=thread_2)
-
-t1.start()
-t2.start()
-
-# Start a thread to detect deadlock
-deadlock_detector = threading.Thread(target=detect_deadlock)
-deadlock_detector.start()
-
-# Wait for the threads to finish
-t1.join()
-t2.join()
-
-deadlock_detector.join()
-
-print("Main thread finished")
+def detect_deadlock(headless=False, record=None):
+    # Blocks until one of the threads closes a cycle in the wait-for graph
+    wait_graph.deadlock_event.wait()
+    log.warning("Deadlock detected!", cycle=describe_cycle(wait_graph.deadlocks[-1]))
+    if record:
+        # Drawn offscreen with Pillow, works without a display
+        import record_intersection
+        renderer = record_intersection.record(record)
+        log.info("Recorded", frames=renderer.frames, path=record)
+    if headless:
+        return
+    log.info("Visualizing...")
+    # Imported here: tkinter/PIL/NumPy are only needed once there is something to draw
+    import draw_intersection
+    draw_intersection.draw_intersection_with_moving_cars()
+
+
+if __name__ == "__main__":
+    # Create and start threads (daemons: nothing releases the locks, so with
+    # --headless the program ends once the deadlock has been reported)
+    t1 = threading.Thread(target=thread_1, name="Thread 1", daemon=True)
+    t2 = threading.Thread(target=thread_2, name="Thread 2", daemon=True)
+
+    t1.start()
+    t2.start()
+
+    # Start a thread to detect deadlock
+    record = sys.argv[sys.argv.index("--record") + 1] if "--record" in sys.argv else None
+    deadlock_detector = threading.Thread(target=detect_deadlock, args=("--headless" in sys.argv, record))
+    deadlock_detector.start()
+
+    deadlock_detector.join()
+
+    log.info("Main thread finished")
@@ -1,39 +1,72 @@
-import tkinter as tk
 import threading
 import time
-import ctypes
-import kill_threads
-from PIL import Image, ImageTk, ImageOps
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.wait_for_graph import WaitForGraph, TrackedLock, describe_cycle
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.cancellation import RecoveryManager, CancelledError, report_progress
+from deadlock_tools.event_log import event_log
+from deadlock_tools.metrics import exported, wait_graph_metrics, recovery_metrics
 
 
 ###############################################################################
 # 1. Optional Concurrency Threads (Do Not Affect Rollback)
 ###############################################################################
-lock1 = threading.Lock()
-lock2 = threading.Lock()
+# The wait-for graph is updated on every acquire/release, so the cycle is reported
+# by the thread that closes it instead of by a polling loop. The recovery manager
+# then cancels the thread with the least work to lose: its blocked acquire raises
+# CancelledError, it releases what it holds and tries again.
+wait_graph = WaitForGraph()
+recovery = RecoveryManager(wait_graph)
+# The trace recorder (DEADLOCK_TRACE) sits outside the TrackedLock here, so it sees one
+# wait per acquire rather than every cancellation slice
+lock1 = recorded("lock1", inner=TrackedLock(wait_graph, "lock1", inner=profiled("lock1")))
+lock2 = recorded("lock2", inner=TrackedLock(wait_graph, "lock2", inner=profiled("lock2")))
+# Buffered, written by a background thread (DEADLOCK_LOG=off silences it)
+log = event_log()
 
 def thread_1():
-    lock1.acquire()
-    print("[Thread 1] Acquired lock1")
-    time.sleep(1)
-    print("[Thread 1] Waiting for lock2")
-    lock2.acquire()
-    print("[Thread 1] Acquired lock2")
-    time.sleep(2)
-    lock2.release()
-    print("[Thread 1] Released locks")
+    while True:
+        lock1.acquire()
+        try:
+            log.info("Acquired", lock="lock1")
+            time.sleep(1)
+            log.info("Waiting", lock="lock2")
+            lock2.acquire()
+            log.info("Acquired", lock="lock2")
+            report_progress()
+            time.sleep(2)
+            lock2.release()
+            break
+        except CancelledError as e:
+            log.warning("Cancelled, rolling back", reason=e)
+        finally:
+            lock1.release()
+        time.sleep(0.5)  # back off before retrying
+    log.info("Released locks")
 
 def thread_2():
-    lock2.acquire()
-    print("[Thread 2] Acquired lock2")
-    time.sleep(1)
-    print("[Thread 2] Waiting for lock1")
-    lock1.acquire()
-    print("[Thread 2] Acquired lock1")
-    time.sleep(2)
-    lock1.release()
-    lock2.release()
-    print("[Thread 2] Released locks")
+    while True:
+        lock2.acquire()
+        try:
+            log.info("Acquired", lock="lock2")
+            time.sleep(1)
+            log.info("Waiting", lock="lock1")
+            lock1.acquire()
+            log.info("Acquired", lock="lock1")
+            report_progress()
+            time.sleep(2)
+            lock1.release()
+            break
+        except CancelledError as e:
+            log.warning("Cancelled, rolling back", reason=e)
+        finally:
+            lock2.release()
+        time.sleep(0.5)  # back off before retrying
+    log.info("Released locks")
 
 
 ###############################################################################
@@ -45,7 +78,13 @@ def draw_intersection_with_moving_cars():
     2) If they collide, reset them to their initial starting positions.
     3) After resetting, each car moves at a distinct speed so they won't collide again.
     4) They then pass fully through the intersection and off the canvas.
+    5) Once they are clear, the next round starts from 1), up to ROUNDS rounds, so every
+       collision takes the same rollback path.
     """
+    # GUI-only imports live here so headless runs never load tkinter, PIL or NumPy
+    import tkinter as tk
+    import sprite_cache
+    from collision import CarBoxes
 
     #####################
     # 2.1 Collision Test
@@ -54,36 +93,13 @@ def draw_intersection_with_moving_cars():
     CLOSE_WINDOW_WHEN_DONE = True #useful variable to close the window when the cars are done moving
 
 
-    def boxes_collide(box1, box2):
-        """Check if two bounding boxes overlap."""
-        if not box1 or not box2:
-            return False
-        return not (
-            box1[2] < box2[0] or  # box1's right < box2's left
-            box1[0] > box2[2] or  # box1's left  > box2's right
-            box1[3] < box2[1] or  # box1's bottom < box2's top
-            box1[1] > box2[3]     # box1's top > box2's bottom
-        )
-
     def any_collision():
-        """Check collisions among all four cars (pairwise)."""
-        bbox_top    = canvas.bbox(car_top)
-        bbox_bottom = canvas.bbox(car_bottom)
-        bbox_left   = canvas.bbox(car_left)
-        bbox_right  = canvas.bbox(car_right)
-
-        pairs = [
-            (bbox_top,    bbox_bottom),
-            (bbox_top,    bbox_left),
-            (bbox_top,    bbox_right),
-            (bbox_bottom, bbox_left),
-            (bbox_bottom, bbox_right),
-            (bbox_left,   bbox_right),
-        ]
-        for (b1, b2) in pairs:
-            if boxes_collide(b1, b2):
-                return True
-        return False
+        """Check collisions among all cars (vectorized, from our own positions, no canvas.bbox)."""
+        car_boxes.move_to(TOP,    car_top_x,    car_top_y)
+        car_boxes.move_to(BOTTOM, car_bottom_x, car_bottom_y)
+        car_boxes.move_to(LEFT,   car_left_x,   car_left_y)
+        car_boxes.move_to(RIGHT,  car_right_x,  car_right_y)
+        return car_boxes.any_collision()
 
     ##################################
     # 2.2 Movement & "Rollback" Logic
@@ -100,8 +116,17 @@ def draw_intersection_with_moving_cars():
     }
     DELAY = 200  # ms delay between moves
 
-    # This flag tracks whether we've already rolled back once
+    # Rollback pauses, scheduled with window.after so the GUI keeps repainting meanwhile
+    DEADLOCK_PAUSE = 3000  # ms showing the stuck cars before the reset message
+    RESET_PAUSE = 2000     # ms between the reset message and the cars jumping back
+
+    ROUNDS = 3  # collide, roll back and drive through this many times
+
+    # True from a rollback until the cars have cleared the crossing
     after_reset = False
+    rounds_left = ROUNDS
+    # True between a collision and the restore: cars are stuck, ticks keep running
+    rolling_back = False
 
     # -----------------------
     # 2.2.1: Initial Positions
@@ -118,35 +143,68 @@ def draw_intersection_with_moving_cars():
     car_left_x,   car_left_y   = init_left_x,   init_left_y
     car_right_x,  car_right_y  = init_right_x,  init_right_y
 
-    def reset_to_start():
-        """Move all cars back to their initial starting positions."""
-        print("[NOTE] Deadlock scenario: all car threads are waiting for each other, they cannot leave the intersection.")
-        time.sleep(3)  # pause for effect
-        print("[GUI] Collision! Resetting cars back to the beginning, then they'll move at different speeds...")
-        time.sleep(2)  # pause for effect
+    def checkpoint():
+        """Snapshot of every car's position, to roll back to later."""
+        return {
+            "car_top":    (car_top_x,    car_top_y),
+            "car_bottom": (car_bottom_x, car_bottom_y),
+            "car_left":   (car_left_x,   car_left_y),
+            "car_right":  (car_right_x,  car_right_y),
+        }
+
+    def restore(saved):
+        """Put every car back where the checkpoint says (positions and canvas)."""
         nonlocal car_top_x, car_top_y
         nonlocal car_bottom_x, car_bottom_y
         nonlocal car_left_x, car_left_y
         nonlocal car_right_x, car_right_y
 
-        # Set the current positions to the initial ones
-        car_top_x,    car_top_y    = init_top_x,    init_top_y
-        car_bottom_x, car_bottom_y = init_bottom_x, init_bottom_y
-        car_left_x,   car_left_y   = init_left_x,   init_left_y
-        car_right_x,  car_right_y  = init_right_x,  init_right_y
+        car_top_x,    car_top_y    = saved["car_top"]
+        car_bottom_x, car_bottom_y = saved["car_bottom"]
+        car_left_x,   car_left_y   = saved["car_left"]
+        car_right_x,  car_right_y  = saved["car_right"]
 
-        # Update the canvas with these positions
         canvas.coords(car_top,    car_top_x,    car_top_y)
         canvas.coords(car_bottom, car_bottom_x, car_bottom_y)
         canvas.coords(car_left,   car_left_x,   car_left_y)
         canvas.coords(car_right,  car_right_x,  car_right_y)
 
+    start_checkpoint = checkpoint()
+
+    def reset_to_start():
+        """
+        Starts a rollback to the start checkpoint. Nothing blocks here: the pauses are
+        timed events, move_cars keeps ticking (cars stay put while rolling_back is set)
+        and the restore happens in finish_rollback.
+        """
+        nonlocal rolling_back
+        if rolling_back:
+            return  # already scheduled
+        rolling_back = True
+        log.info("[NOTE] Deadlock scenario: all car threads are waiting for each other, they cannot leave the intersection.")
+        window.after(DEADLOCK_PAUSE, announce_reset)
+
+    def announce_reset():
+        log.info("[GUI] Collision! Resetting cars back to the beginning, then they'll move at different speeds...")
+        window.after(RESET_PAUSE, finish_rollback)
+
+    def finish_rollback():
+        nonlocal rolling_back, after_reset
+        restore(start_checkpoint)
+        after_reset = True  # cars now have different speeds
+        rolling_back = False
+
     def move_cars():
         nonlocal car_top_x, car_top_y
         nonlocal car_bottom_x, car_bottom_y
         nonlocal car_left_x, car_left_y
         nonlocal car_right_x, car_right_y
-        nonlocal after_reset
+        nonlocal after_reset, rounds_left
+
+        # Mid-rollback the cars are stuck in the deadlock: keep the loop (and the GUI) alive
+        if rolling_back:
+            window.after(DELAY, move_cars)
+            return
 
         # 1) Determine the correct speeds based on whether we have reset yet
         if not after_reset:
@@ -202,7 +260,6 @@ def draw_intersection_with_moving_cars():
             # If we haven't already reset, do it now
             if not after_reset:
                 reset_to_start()
-                after_reset = True  # cars now have different speeds
             else:
                 pass
             # Schedule next move anyway (so they keep going)
@@ -218,7 +275,7 @@ def draw_intersection_with_moving_cars():
                 car_right_x > 250):
                 window.after(DELAY, move_cars)
             else:
-                print("[GUI] All cars reached the center without colliding!")
+                log.info("[GUI] All cars reached the center without colliding!")
         else:
             # Once reset, keep moving until they exit
             all_offscreen = (
@@ -230,9 +287,15 @@ def draw_intersection_with_moving_cars():
             if not all_offscreen:
                 window.after(DELAY, move_cars)
             else:
-                print("[GUI] All cars have exited the intersection after reset.")
-                if CLOSE_WINDOW_WHEN_DONE:
-                    print("[GUI] Closing the window now.")
+                log.info("[GUI] All cars have exited the intersection after reset.")
+                rounds_left -= 1
+                if rounds_left > 0:
+                    # Crossing is clear: next round, whose collision rolls back the same way
+                    restore(start_checkpoint)
+                    after_reset = False
+                    window.after(DELAY, move_cars)
+                elif CLOSE_WINDOW_WHEN_DONE:
+                    log.info("[GUI] Closing the window now.")
                     window.destroy()  # closes the Tk window
 
 
@@ -262,12 +325,13 @@ def draw_intersection_with_moving_cars():
     ##################################
     # 2.4 Load Car Images
     ##################################
-    base_car_image = Image.open("car.png").resize((30, 50))  # assume faces right
+    # Built once per size (and cached on disk), see sprite_cache.py
+    sprites = sprite_cache.photo_images(window)
 
-    car_right_image = ImageTk.PhotoImage(base_car_image)  # faces right
-    car_left_image  = ImageTk.PhotoImage(ImageOps.mirror(base_car_image))
-    car_down_image  = ImageTk.PhotoImage(base_car_image.rotate(90, expand=True))
-    car_up_image    = ImageTk.PhotoImage(base_car_image.rotate(-90, expand=True))
+    car_right_image = sprites["west"]
+    car_left_image  = sprites["east"]
+    car_down_image  = sprites["south"]
+    car_up_image    = sprites["north"]
 
     ##################################
     # 2.5 Create Car Sprites on Canvas
@@ -277,6 +341,13 @@ def draw_intersection_with_moving_cars():
     car_left   = canvas.create_image(init_left_x,   init_left_y,   image=car_left_image)
     car_right  = canvas.create_image(init_right_x,  init_right_y,  image=car_right_image)
 
+    # Same cars as NumPy boxes (extents = sprite size) for collision checks
+    car_boxes = CarBoxes()
+    TOP    = car_boxes.add(init_top_x,    init_top_y,    car_down_image.width(),  car_down_image.height())
+    BOTTOM = car_boxes.add(init_bottom_x, init_bottom_y, car_up_image.width(),    car_up_image.height())
+    LEFT   = car_boxes.add(init_left_x,   init_left_y,   car_left_image.width(),  car_left_image.height())
+    RIGHT  = car_boxes.add(init_right_x,  init_right_y,  car_right_image.width(), car_right_image.height())
+
     # Keep references to avoid garbage-collection
     canvas.car_down_image  = car_down_image
     canvas.car_up_image    = car_up_image
@@ -290,39 +361,38 @@ def draw_intersection_with_moving_cars():
     window.mainloop()
 
 
-def detect_deadlock(t1, t2):
-    time.sleep(2)  # Allow threads to potentially deadlock
-    running = True
-    while running:
-        if lock1.locked() and lock2.locked():
-            time.sleep(2)
-            print("Deadlock detected! Visualizing...")
-            draw_intersection_with_moving_cars()
-            running = False
-            print("Killing threads...\n(In this case it consists of raising an exception as there is no explicit way in python to kill a thread)")
-            print("This is a workaround to kill the threads, as they are still stuck in the deadlock, will only stop after the exception is raised and the deadlock is resolved")
-            print("uncomment the kill_thread function to see it functioning, the threads should not do anything even after the deadlock is resolved")
-            # kill_threads.kill_thread(t2)
-            # kill_threads.kill_thread(t1)
-            print("'Threads killed'\nReleasing one of the locks to stop the deadlock...")
-            lock1.release()
-    
+def detect_deadlock(headless=False):
+    # Sleeps until a thread closes a cycle in the wait-for graph (no busy polling)
+    wait_graph.deadlock_event.wait()
+    log.warning("Deadlock detected!", cycle=describe_cycle(wait_graph.deadlocks[-1]))
+    # No thread killing needed: the victim's acquire raised CancelledError and it rolled back
+    recovery.resolved_event.wait()
+    record = recovery.recoveries[-1]
+    log.info(f"Deadlock resolved: victim released {record['lock']} "
+             f"{record['resolution_s'] * 1e3:.1f} ms after detection")
+    if not headless:
+        log.info("Visualizing...")
+        draw_intersection_with_moving_cars()
+
 ###############################################################################
 # 3. Main: Start Threads, GUI, and Deadlock Detection
 ###############################################################################
 if __name__ == "__main__":
+    # Lock, deadlock and rollback counters over HTTP when DEADLOCK_METRICS is set
+    exported(wait_graph_metrics(wait_graph), recovery_metrics(recovery))
+
     # Optional concurrency threads:
-    t1 = threading.Thread(target=thread_1)
-    t2 = threading.Thread(target=thread_2)
+    t1 = threading.Thread(target=thread_1, name="Thread 1")
+    t2 = threading.Thread(target=thread_2, name="Thread 2")
     t1.start()
     t2.start()
 
     # Run the Tkinter GUI
    # draw_intersection_with_moving_cars()
-    deadlock_detector = threading.Thread(target=detect_deadlock(t1, t2))
+    deadlock_detector = threading.Thread(target=detect_deadlock(headless="--headless" in sys.argv))
     deadlock_detector.start()
 
     # Wait for threads
     t1.join()
     t2.join()
-    print("[Main] Done.")
+    log.info("[Main] Done.")
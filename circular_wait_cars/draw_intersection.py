@@ -1,48 +1,22 @@
 import tkinter as tk
-from PIL import Image, ImageTk, ImageOps
+import sprite_cache
+from collision import CarBoxes
 
 def draw_intersection_with_moving_cars():
     ############################################################
     # 1. Helper Functions
     ############################################################
-    def boxes_collide(box1, box2):
-        """
-        Check if two bounding boxes overlap.
-        Each box is a tuple of (x1, y1, x2, y2).
-        """
-        if not box1 or not box2:
-            return False
-        return not (
-            box1[2] < box2[0] or  # box1's right < box2's left
-            box1[0] > box2[2] or  # box1's left  > box2's right
-            box1[3] < box2[1] or  # box1's bottom < box2's top
-            box1[1] > box2[3]     # box1's top > box2's bottom
-        )
-
     def any_collision():
         """
-        Check collisions among all four cars (pairwise).
-        Returns True if any two bounding boxes overlap.
+        Check collisions among all cars.
+        Positions come from our own state (no canvas.bbox round-trips) and the
+        overlap test is vectorized in collision.CarBoxes.
         """
-        bbox_top    = canvas.bbox(car_top)
-        bbox_bottom = canvas.bbox(car_bottom)
-        bbox_left   = canvas.bbox(car_left)
-        bbox_right  = canvas.bbox(car_right)
-
-        # Pairs of bounding boxes to test
-        pairs = [
-            (bbox_top,    bbox_bottom),
-            (bbox_top,    bbox_left),
-            (bbox_top,    bbox_right),
-            (bbox_bottom, bbox_left),
-            (bbox_bottom, bbox_right),
-            (bbox_left,   bbox_right),
-        ]
-
-        for (b1, b2) in pairs:
-            if boxes_collide(b1, b2):
-                return True
-        return False
+        car_boxes.move_to(TOP,    car_top_x,    car_top_y)
+        car_boxes.move_to(BOTTOM, car_bottom_x, car_bottom_y)
+        car_boxes.move_to(LEFT,   car_left_x,   car_left_y)
+        car_boxes.move_to(RIGHT,  car_right_x,  car_right_y)
+        return car_boxes.any_collision()
 
     ############################################################
     # 2. Movement Function
@@ -113,16 +87,13 @@ def draw_intersection_with_moving_cars():
     ############################################################
     # 4. Load/Rotate Car Images
     ############################################################
-    # Base car image is assumed to face RIGHT
-    car_image = Image.open("car.png").resize((30, 50))
+    # Built once per size (and cached on disk), see sprite_cache.py
+    sprites = sprite_cache.photo_images(window)
 
-    car_left_image = ImageTk.PhotoImage(car_image)  # faces right
-    # Mirror (left)
-    car_right_image  = ImageTk.PhotoImage(ImageOps.mirror(car_image))
-    # Rotate 90 deg from "right" => faces UP
-    car_down_image    = ImageTk.PhotoImage(car_image.rotate(90, expand=True))
-    # Rotate -90 deg from "right" => faces DOWN
-    car_up_image  = ImageTk.PhotoImage(car_image.rotate(-90, expand=True))
+    car_left_image  = sprites["west"]
+    car_right_image = sprites["east"]
+    car_down_image  = sprites["south"]
+    car_up_image    = sprites["north"]
 
     ############################################################
     # 5. Position Each Car in Its Lane
@@ -153,6 +124,13 @@ def draw_intersection_with_moving_cars():
     # Right car (facing left)
     car_right  = canvas.create_image(car_right_x, car_right_y, image=car_left_image)
 
+    # Same cars as NumPy boxes (extents = sprite size) for collision checks
+    car_boxes = CarBoxes()
+    TOP    = car_boxes.add(car_top_x,    car_top_y,    car_down_image.width(),  car_down_image.height())
+    BOTTOM = car_boxes.add(car_bottom_x, car_bottom_y, car_up_image.width(),    car_up_image.height())
+    LEFT   = car_boxes.add(car_left_x,   car_left_y,   car_right_image.width(), car_right_image.height())
+    RIGHT  = car_boxes.add(car_right_x,  car_right_y,  car_left_image.width(),  car_left_image.height())
+
     # Keep references so they aren't garbage-collected
     canvas.car_up_image    = car_up_image
     canvas.car_down_image  = car_down_image
@@ -1,3 +1,10 @@
+"""
+Raises SystemExit in another thread through PyThreadState_SetAsyncExc.
+
+The exception only fires when the target runs Python code again, so a thread blocked
+in lock.acquire() (the deadlocked case) is never interrupted. For deadlock recovery
+use deadlock_tools.cancellation (CancellationToken / RecoveryManager) instead.
+"""
 import threading
 import ctypes
 import time
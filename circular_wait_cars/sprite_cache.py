@@ -0,0 +1,152 @@
+"""
+Car sprites, built once.
+
+car.png is a 1200x675 photo; every window used to decode it, resize it and redo the
+mirror/rotations. Here each (size, heading) sprite is made once per process and also
+saved as a small PNG under
+    ~/.cache/deadlocks/sprites/<sha256 of car.png>/<w>x<h>_<heading>.png
+so later launches skip the big decode as well. Editing car.png changes the hash, so
+stale sprites are never used. DEADLOCK_SPRITE_CACHE overrides the cache directory.
+
+Headings are the direction the car drives on screen (same sprites as before):
+    east  = mirrored image      west  = image as is
+    south = rotated 90 degrees  north = rotated -90 degrees
+
+    python sprite_cache.py --sizes 30x50 60x100    # warm the cache
+"""
+import argparse
+import hashlib
+import os
+
+from PIL import Image, ImageOps
+
+CAR_PNG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "car.png")
+DEFAULT_SIZE = (30, 50)
+HEADINGS = ("east", "west", "south", "north")
+ENV_VAR = "DEADLOCK_SPRITE_CACHE"
+
+# (path, mtime, size) -> {heading: PIL image}
+_sprites = {}
+# (path, mtime) -> sha256 hex digest
+_hashes = {}
+
+
+def cache_dir():
+    if os.environ.get(ENV_VAR):
+        return os.environ[ENV_VAR]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "deadlocks", "sprites")
+
+
+def file_hash(path):
+    mtime = os.stat(path).st_mtime_ns
+    digest = _hashes.get((path, mtime))
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+        digest = _hashes[(path, mtime)] = h.hexdigest()
+    return digest
+
+
+def _transform(image, heading):
+    if heading == "east":
+        return ImageOps.mirror(image)
+    if heading == "south":
+        return image.rotate(90, expand=True)
+    if heading == "north":
+        return image.rotate(-90, expand=True)
+    return image
+
+
+def _build(path, size):
+    base = Image.open(path).resize(size)
+    return {heading: _transform(base, heading) for heading in HEADINGS}
+
+
+def _disk_paths(path, size):
+    folder = os.path.join(cache_dir(), file_hash(path))
+    w, h = size
+    return folder, {heading: os.path.join(folder, f"{w}x{h}_{heading}.png") for heading in HEADINGS}
+
+
+def _load_from_disk(files):
+    sprites = {}
+    for heading, file in files.items():
+        try:
+            with Image.open(file) as im:
+                im.load()
+                sprites[heading] = im.copy()
+        except (OSError, ValueError):
+            return None
+    return sprites
+
+
+def _save_to_disk(folder, files, sprites):
+    # Best effort: a read-only home only costs us the rebuild next time
+    try:
+        os.makedirs(folder, exist_ok=True)
+        for heading, file in files.items():
+            tmp = f"{file}.{os.getpid()}.tmp"
+            sprites[heading].save(tmp, format="PNG")
+            os.replace(tmp, file)
+    except OSError:
+        pass
+
+
+def car_sprites(size=DEFAULT_SIZE, path=CAR_PNG, use_disk=True):
+    """
+    {heading: PIL.Image} for the car at `size` (width, height of the west-facing image).
+    """
+    size = tuple(size)
+    key = (path, os.stat(path).st_mtime_ns, size)
+    sprites = _sprites.get(key)
+    if sprites is not None:
+        return sprites
+
+    if use_disk:
+        folder, files = _disk_paths(path, size)
+        sprites = _load_from_disk(files)
+        if sprites is None:
+            sprites = _build(path, size)
+            _save_to_disk(folder, files, sprites)
+    else:
+        sprites = _build(path, size)
+    _sprites[key] = sprites
+    return sprites
+
+
+def preload(sizes, path=CAR_PNG):
+    for size in sizes:
+        car_sprites(size, path)
+
+
+def photo_images(master, size=DEFAULT_SIZE, path=CAR_PNG):
+    """
+    {heading: ImageTk.PhotoImage} for a Tk window. PhotoImages belong to one Tk
+    interpreter, so they are cached on the window itself (which also keeps them alive).
+    """
+    from PIL import ImageTk
+
+    cache = getattr(master, "_car_photos", None)
+    if cache is None:
+        cache = master._car_photos = {}
+    key = (path, tuple(size))
+    if key not in cache:
+        cache[key] = {heading: ImageTk.PhotoImage(image, master=master)
+                      for heading, image in car_sprites(size, path).items()}
+    return cache[key]
+
+
+def parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the car sprite cache")
+    parser.add_argument("--sizes", nargs="+", type=parse_size, default=[DEFAULT_SIZE])
+    args = parser.parse_args()
+    preload(args.sizes)
+    print("Sprites cached in", os.path.join(cache_dir(), file_hash(CAR_PNG)))
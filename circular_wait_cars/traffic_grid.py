@@ -0,0 +1,376 @@
+"""
+Headless traffic engine: an R x C grid of the 4-way intersection from the circular wait demo.
+
+Geometry is the demo's: blocks are 500 px apart, roads are 100 px wide with one lane per
+direction, cars are 50 px long and move at 50 px/s (10 px every 200 ms). So a road segment
+between two intersections holds SEGMENT_CAPACITY cars and crossing a box takes CROSS_TIME.
+
+Resources:
+  - every intersection box is a lock with one owner and a FIFO queue of cars waiting for it
+  - every lane segment has a fixed number of car slots
+
+A car at the stop line takes the box, leaves its segment, then needs a slot on the next
+segment before it can drive out of the box. While it waits it keeps the box ("blocking the
+box"), which is how real gridlock forms around a block: four boxes, each held by a car
+waiting for a full segment whose head car waits for the next box.
+
+Each car waits on at most one thing, so gridlock is found the same way WaitForGraph does it:
+follow car -> resource -> car that must move first, in O(cycle length) per blocking request.
+A detected gridlock is resolved after TOW_DELAY by towing one car out of a box.
+Cars go straight or turn left/right (turn_prob) at every intersection, which is what
+makes inner boxes busier than the boundary ones and lets full segments back up.
+
+    python traffic_grid.py --rows 4 --cols 4 --rate 0.2 --turn-prob 0.3 --duration 3600
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.virtual_clock import VirtualClock
+from deadlock_tools.metrics import exported, traffic_metrics
+
+# Road geometry (same numbers as the Tk demo)
+BLOCK_SIZE = 500                 # px between intersection centres
+ROAD_WIDTH = 100                 # px, one intersection box is ROAD_WIDTH x ROAD_WIDTH
+CAR_LENGTH = 50                  # px
+CAR_GAP = 10                     # px kept to the car in front when queued
+SPEED = 10 / 0.2                 # px per second (SPEED_BEFORE every DELAY ms)
+
+SEGMENT_LENGTH = BLOCK_SIZE - ROAD_WIDTH
+SEGMENT_CAPACITY = SEGMENT_LENGTH // (CAR_LENGTH + CAR_GAP)
+TRAVEL_TIME = SEGMENT_LENGTH / SPEED
+CROSS_TIME = ROAD_WIDTH / SPEED
+TOW_DELAY = 5.0                  # seconds until a gridlocked box is cleared
+
+EAST, WEST, SOUTH, NORTH = range(4)
+DIRECTION_NAMES = ("east", "west", "south", "north")
+DELTA = ((0, 1), (0, -1), (1, 0), (-1, 0))      # (row, column) step per direction
+LEFT_OF = (NORTH, SOUTH, EAST, WEST)
+RIGHT_OF = (SOUTH, NORTH, WEST, EAST)
+
+
+class Car:
+    __slots__ = ("id", "direction", "row", "col", "spawned", "ready",
+                 "waiting_for", "box", "segment")
+
+    def __init__(self, car_id, direction, row, col, now):
+        self.id = car_id
+        self.direction = direction
+        self.row = row            # next intersection on the car's way
+        self.col = col
+        self.spawned = now
+        self.ready = False        # reached the stop line of its segment
+        self.waiting_for = None   # Box or Segment the car is blocked on
+        self.box = None           # Box currently held
+        self.segment = None       # Segment the car occupies
+
+
+class Box:
+    """
+    Intersection box: one car at a time.
+    """
+
+    __slots__ = ("name", "owner", "waiters")
+
+    def __init__(self, name):
+        self.name = name
+        self.owner = None
+        self.waiters = deque()
+
+    def next_to_move(self):
+        return self.owner
+
+
+class Segment:
+    """
+    Lane segment leading into a box (or out of the grid when exit is True, in which
+    case cars are not queued on it).
+    Cars leave in FIFO order, so a slot only frees up when the head car moves.
+    """
+
+    __slots__ = ("name", "capacity", "cars", "waiters", "exit")
+
+    def __init__(self, name, capacity, is_exit=False):
+        self.name = name
+        self.capacity = capacity
+        self.cars = deque()
+        self.waiters = deque()
+        self.exit = is_exit
+
+    def next_to_move(self):
+        return self.cars[0] if self.cars else None
+
+
+class TrafficGrid:
+    def __init__(self, rows, cols, rate=0.2, duration=3600.0, seed=None, clock=None,
+                 turn_prob=0.3, segment_capacity=SEGMENT_CAPACITY, travel_time=TRAVEL_TIME,
+                 cross_time=CROSS_TIME, tow_delay=TOW_DELAY):
+        """
+        rate: car arrivals per second on every incoming boundary lane (Poisson streams).
+        turn_prob: chance to turn (left or right, half each) at every intersection.
+        duration: arrivals stop after this many virtual seconds; run() then lets the grid drain.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.rate = rate
+        self.turn_prob = turn_prob
+        self.duration = duration
+        self.rng = random.Random(seed)
+        self.clock = clock if clock is not None else VirtualClock()
+        self.travel_time = travel_time
+        self.cross_time = cross_time
+        self.tow_delay = tow_delay
+
+        self.boxes = [[Box(f"box({r},{c})") for c in range(cols)] for r in range(rows)]
+
+        # into[direction][r][c]: lane leading into box (r, c) for cars moving in `direction`.
+        # On the boundary these are the entry lanes, fed by the arrival streams.
+        self.into = [[[Segment(f"{DIRECTION_NAMES[d]}->({r},{c})", segment_capacity)
+                       for c in range(cols)] for r in range(rows)] for d in range(4)]
+        # Leaving the grid never blocks: one shared exit lane
+        self.exit = Segment("exit", float("inf"), is_exit=True)
+
+        self.next_car_id = 0
+        self.cars_spawned = 0
+        self.cars_exited = 0
+        self.cars_towed = 0
+        self.trip_time_total = 0.0
+        self.in_grid = 0
+        self.gridlocks = []         # dicts: time, cycle length, cleared_at
+        self._open_gridlocks = {}   # car id -> open gridlock records it is part of
+
+    ###########################################################################
+    # Geometry helpers
+    ###########################################################################
+    def entry_lanes(self):
+        """
+        (direction, row, col) of every lane coming in from outside the grid.
+        """
+        lanes = []
+        for r in range(self.rows):
+            lanes.append((EAST, r, 0))
+            lanes.append((WEST, r, self.cols - 1))
+        for c in range(self.cols):
+            lanes.append((SOUTH, 0, c))
+            lanes.append((NORTH, self.rows - 1, c))
+        return lanes
+
+    def _pick_direction(self, direction):
+        if self.turn_prob and self.rng.random() < self.turn_prob:
+            return LEFT_OF[direction] if self.rng.random() < 0.5 else RIGHT_OF[direction]
+        return direction
+
+    ###########################################################################
+    # Arrivals
+    ###########################################################################
+    def _schedule_arrival(self, direction, row, col):
+        delay = self.rng.expovariate(self.rate)
+        if self.clock.now() + delay <= self.duration:
+            self.clock.call_later(delay, self._spawn, direction, row, col)
+
+    def _spawn(self, direction, row, col):
+        car = Car(self.next_car_id, direction, row, col, self.clock.now())
+        self.next_car_id += 1
+        self.cars_spawned += 1
+        self.in_grid += 1
+        self._request_slot(car, self.into[direction][row][col])
+        self._schedule_arrival(direction, row, col)
+
+    ###########################################################################
+    # Car movement
+    ###########################################################################
+    def _request_slot(self, car, segment):
+        if len(segment.cars) < segment.capacity and not segment.waiters:
+            self._got_slot(car, segment)
+        else:
+            segment.waiters.append(car)
+            self._block(car, segment)
+
+    def _got_slot(self, car, segment):
+        """
+        The slot is reserved: enter the segment (crossing the box first if holding one).
+        """
+        self._progress(car)
+        car.waiting_for = None
+        if not segment.exit:
+            segment.cars.append(car)
+        car.segment = segment
+        car.ready = False
+        if car.box is not None:
+            self.clock.call_later(self.cross_time, self._leave_box, car)
+        else:
+            self.clock.call_later(self.travel_time, self._reach_stop_line, car)
+
+    def _leave_box(self, car):
+        box = car.box
+        car.box = None
+        self._release_box(box)
+        self.clock.call_later(self.travel_time, self._reach_stop_line, car)
+
+    def _reach_stop_line(self, car):
+        if car.segment.exit:
+            self.cars_exited += 1
+            self.in_grid -= 1
+            self.trip_time_total += self.clock.now() - car.spawned
+            return
+        car.ready = True
+        if car.segment.cars[0] is car:
+            self._at_head(car)
+
+    def _at_head(self, car):
+        box = self.boxes[car.row][car.col]
+        if box.owner is None and not box.waiters:
+            self._got_box(car, box)
+        else:
+            box.waiters.append(car)
+            self._block(car, box)
+
+    def _got_box(self, car, box):
+        self._progress(car)
+        car.waiting_for = None
+        box.owner = car
+        car.box = box
+        # The car is now inside the box: its old segment slot frees up
+        self._leave_segment(car.segment)
+        direction = car.direction = self._pick_direction(car.direction)
+        dr, dc = DELTA[direction]
+        row = car.row = car.row + dr
+        col = car.col = car.col + dc
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            self._request_slot(car, self.into[direction][row][col])
+        else:
+            self._request_slot(car, self.exit)
+
+    def _leave_segment(self, segment):
+        segment.cars.popleft()
+        if segment.waiters and len(segment.cars) < segment.capacity:
+            self._got_slot(segment.waiters.popleft(), segment)
+        if segment.cars:
+            head = segment.cars[0]
+            if head.ready and head.waiting_for is None:
+                self._at_head(head)
+
+    def _release_box(self, box):
+        box.owner = None
+        if box.waiters:
+            self._got_box(box.waiters.popleft(), box)
+
+    ###########################################################################
+    # Gridlock detection and towing
+    ###########################################################################
+    def _block(self, car, resource):
+        car.waiting_for = resource
+        cycle = [car]
+        other = resource.next_to_move()
+        while other is not None and other is not car:
+            if other.waiting_for is None or other in cycle:
+                return
+            cycle.append(other)
+            other = other.waiting_for.next_to_move()
+        if other is car:
+            self._gridlock(cycle)
+
+    def _gridlock(self, cycle):
+        record = {"time": self.clock.now(), "cars": len(cycle), "cleared_at": None,
+                  "_remaining": {c.id for c in cycle}}
+        self.gridlocks.append(record)
+        for c in cycle:
+            self._open_gridlocks.setdefault(c.id, []).append(record)
+        # Tow the first car that blocks a box while waiting for a slot
+        victim = next((c for c in cycle if c.box is not None), cycle[0])
+        self.clock.call_later(self.tow_delay, self._tow, victim)
+
+    def _tow(self, car):
+        if car.waiting_for is None:
+            return  # the jam resolved itself
+        resource = car.waiting_for
+        resource.waiters.remove(car)
+        car.waiting_for = None
+        self._progress(car)
+        self.cars_towed += 1
+        self.in_grid -= 1
+        if car.box is not None:
+            box = car.box
+            car.box = None
+            self._release_box(box)
+        elif car.segment is not None and car.segment.cars and car.segment.cars[0] is car:
+            self._leave_segment(car.segment)
+
+    def _progress(self, car):
+        """
+        The car got what it waited for; a gridlock is cleared once all its cars have moved.
+        """
+        records = self._open_gridlocks.pop(car.id, None)
+        if records is None:
+            return
+        for record in records:
+            record["_remaining"].discard(car.id)
+            if not record["_remaining"]:
+                record["cleared_at"] = self.clock.now()
+
+    ###########################################################################
+    # Running and reporting
+    ###########################################################################
+    def run(self, until=None):
+        for direction, row, col in self.entry_lanes():
+            self._schedule_arrival(direction, row, col)
+        self.clock.run(until)
+        return self.report()
+
+    def report(self):
+        end = self.clock.now()
+        clear_times = [g["cleared_at"] - g["time"] for g in self.gridlocks if g["cleared_at"] is not None]
+        return {
+            "rows": self.rows,
+            "cols": self.cols,
+            "rate_per_lane": self.rate,
+            "turn_prob": self.turn_prob,
+            "virtual_seconds": end,
+            "cars_spawned": self.cars_spawned,
+            "cars_exited": self.cars_exited,
+            "cars_towed": self.cars_towed,
+            "cars_in_grid": self.in_grid,
+            "throughput_per_s": self.cars_exited / end if end else 0.0,
+            "mean_trip_time": self.trip_time_total / self.cars_exited if self.cars_exited else None,
+            "gridlock_events": len(self.gridlocks),
+            "gridlocks_uncleared": len(self.gridlocks) - len(clear_times),
+            "mean_time_to_clear": sum(clear_times) / len(clear_times) if clear_times else None,
+            "max_time_to_clear": max(clear_times) if clear_times else None,
+            "drain_time": end - self.duration if self.in_grid == 0 else None,
+            "events": self.clock.events_processed,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless multi-intersection traffic grid")
+    parser.add_argument("--rows", type=int, default=4)
+    parser.add_argument("--cols", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=0.2, help="arrivals per second per lane")
+    parser.add_argument("--turn-prob", type=float, default=0.3)
+    parser.add_argument("--duration", type=float, default=3600.0, help="virtual seconds of arrivals")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="JSON file for the report")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    grid = TrafficGrid(args.rows, args.cols, rate=args.rate, duration=args.duration,
+                       seed=args.seed, turn_prob=args.turn_prob)
+    # Progress over HTTP during long runs, when DEADLOCK_METRICS is set
+    exported(traffic_metrics(grid))
+    report = grid.run()
+    report["wall_seconds"] = time.perf_counter() - start
+    for key, value in report.items():
+        print(f"{key:>20}: {value}")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
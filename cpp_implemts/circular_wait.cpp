@@ -1,5 +1,5 @@
 // C++ equivalent of circular_wait_picture.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 #include <chrono>
@@ -10,13 +10,13 @@ std::mutex lock2;
 
 void thread1() {
     lock1.lock();
-    std::cout << "[Thread 1] Acquired lock1" << std::endl;
+    LOG_INFO("[Thread 1] Acquired lock1");
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
 
-    std::cout << "[Thread 1] Waiting for lock2" << std::endl;
+    LOG_INFO("[Thread 1] Waiting for lock2");
     lock2.lock();
-    std::cout << "[Thread 1] Acquired lock2" << std::endl;
+    LOG_INFO("[Thread 1] Acquired lock2");
 
     lock2.unlock();
     lock1.unlock();
@@ -24,13 +24,13 @@ void thread1() {
 
 void thread2() {
     lock2.lock();
-    std::cout << "[Thread 2] Acquired lock2" << std::endl;
+    LOG_INFO("[Thread 2] Acquired lock2");
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
 
-    std::cout << "[Thread 2] Waiting for lock1" << std::endl;
+    LOG_INFO("[Thread 2] Waiting for lock1");
     lock1.lock();
-    std::cout << "[Thread 2] Acquired lock1" << std::endl;
+    LOG_INFO("[Thread 2] Acquired lock1");
 
     lock1.unlock();
     lock2.unlock();
@@ -40,7 +40,7 @@ void detect_deadlock() {
     while (true) {
         std::this_thread::sleep_for(std::chrono::seconds(2));
         // Simulated deadlock detection (not directly implementable without external libraries)
-        std::cout << "[Detector] Monitoring for potential deadlock (placeholder logic)" << std::endl;
+        LOG_INFO("[Detector] Monitoring for potential deadlock (placeholder logic)");
     }
 }
 
@@ -53,6 +53,6 @@ int main() {
     t2.join();
     deadlock_detector.detach();  // Let the detector run independently
 
-    std::cout << "[Main] Program finished" << std::endl;
+    LOG_INFO("[Main] Program finished");
     return 0;
 }
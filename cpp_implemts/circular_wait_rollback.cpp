@@ -1,5 +1,5 @@
 // C++ equivalent of circular_wait_with_rollback.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 #include <chrono>
@@ -10,34 +10,34 @@ std::mutex lock2;
 
 void thread1() {
     lock1.lock();
-    std::cout << "[Thread 1] Acquired lock1" << std::endl;
+    LOG_INFO("[Thread 1] Acquired lock1");
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
 
-    std::cout << "[Thread 1] Waiting for lock2" << std::endl;
+    LOG_INFO("[Thread 1] Waiting for lock2");
     lock2.lock();
-    std::cout << "[Thread 1] Acquired lock2" << std::endl;
+    LOG_INFO("[Thread 1] Acquired lock2");
 
     std::this_thread::sleep_for(std::chrono::seconds(2));
     lock2.unlock();
     lock1.unlock();
-    std::cout << "[Thread 1] Released locks" << std::endl;
+    LOG_INFO("[Thread 1] Released locks");
 }
 
 void thread2() {
     lock2.lock();
-    std::cout << "[Thread 2] Acquired lock2" << std::endl;
+    LOG_INFO("[Thread 2] Acquired lock2");
 
     std::this_thread::sleep_for(std::chrono::seconds(1));
 
-    std::cout << "[Thread 2] Waiting for lock1" << std::endl;
+    LOG_INFO("[Thread 2] Waiting for lock1");
     lock1.lock();
-    std::cout << "[Thread 2] Acquired lock1" << std::endl;
+    LOG_INFO("[Thread 2] Acquired lock1");
 
     std::this_thread::sleep_for(std::chrono::seconds(2));
     lock1.unlock();
     lock2.unlock();
-    std::cout << "[Thread 2] Released locks" << std::endl;
+    LOG_INFO("[Thread 2] Released locks");
 }
 
 void detect_deadlock(std::thread& t1, std::thread& t2) {
@@ -45,9 +45,9 @@ void detect_deadlock(std::thread& t1, std::thread& t2) {
     while (true) {
         std::this_thread::sleep_for(std::chrono::seconds(2));
         if (lock1.try_lock() == false && lock2.try_lock() == false) {
-            std::cout << "[Detector] Deadlock detected! Rolling back..." << std::endl;
+            LOG_WARNING("[Detector] Deadlock detected! Rolling back...");
             lock1.unlock();
-            std::cout << "[Detector] Released lock1 to resolve deadlock" << std::endl;
+            LOG_INFO("[Detector] Released lock1 to resolve deadlock");
             break;
         }
     }
@@ -62,6 +62,6 @@ int main() {
     t2.join();
     deadlock_detector.join();
 
-    std::cout << "[Main] Program finished" << std::endl;
+    LOG_INFO("[Main] Program finished");
     return 0;
 }
@@ -0,0 +1,123 @@
+// Buffered, levelled logging for the C++ ports (same idea as deadlock_tools/event_log.py).
+//
+// std::cout << ... << std::endl flushes on every line and every thread shares cout's
+// lock, so a log line in a demo's hot path is an extra serialization point between the
+// threads being demonstrated. Here a LOG_* call formats into its own string and appends
+// it to one buffer under a short mutex; a writer thread writes the buffer with a single
+// fwrite() and fflush() every 50 ms, and once more at exit.
+//
+// The level comes from DEADLOCK_LOG (debug, info, warning, error or off, default info).
+// Calls below the level do not even format their message:
+//     DEADLOCK_LOG=off ./build/philo_versions
+#pragma once
+
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <mutex>
+#include <sstream>
+#include <string>
+#include <thread>
+
+namespace event_log {
+
+enum Level { DEBUG = 10, INFO = 20, WARNING = 30, ERROR = 40, OFF = 100 };
+
+class EventLog {
+public:
+    explicit EventLog(Level level, std::chrono::milliseconds interval = std::chrono::milliseconds(50))
+        : level_(level), interval_(interval), started_(std::chrono::steady_clock::now()) {
+        if (level_ < OFF) {
+            // Detached: demos that deadlock never return from main, and detached
+            // threads may still log while the process exits
+            std::thread(&EventLog::run, this).detach();
+        }
+    }
+
+    bool enabled(Level level) const { return level >= level_; }
+
+    void write(Level level, const std::string& message) {
+        double t = std::chrono::duration<double>(std::chrono::steady_clock::now() - started_).count();
+        char prefix[32];
+        std::snprintf(prefix, sizeof prefix, "%8.3f %-5s ", t, name(level));
+        std::lock_guard<std::mutex> guard(pending_mutex_);
+        pending_ += prefix;
+        pending_ += message;
+        pending_ += '\n';
+    }
+
+    // Writes everything logged so far
+    void flush() {
+        std::lock_guard<std::mutex> writing(flush_mutex_);
+        std::string batch;
+        {
+            std::lock_guard<std::mutex> guard(pending_mutex_);
+            batch.swap(pending_);
+        }
+        if (!batch.empty()) {
+            std::fwrite(batch.data(), 1, batch.size(), stdout);
+            std::fflush(stdout);
+        }
+    }
+
+private:
+    static const char* name(Level level) {
+        switch (level) {
+            case DEBUG: return "DEBUG";
+            case INFO: return "INFO";
+            case WARNING: return "WARN";
+            default: return "ERROR";
+        }
+    }
+
+    void run() {
+        while (true) {
+            std::this_thread::sleep_for(interval_);
+            flush();
+        }
+    }
+
+    const Level level_;
+    const std::chrono::milliseconds interval_;
+    const std::chrono::steady_clock::time_point started_;
+    std::mutex pending_mutex_;   // held only to append or swap
+    std::mutex flush_mutex_;     // one writer at a time, so batches stay in order
+    std::string pending_;
+};
+
+inline Level level_from_env() {
+    const char* value = std::getenv("DEADLOCK_LOG");
+    if (value == nullptr || *value == '\0') return INFO;
+    if (std::strcmp(value, "debug") == 0) return DEBUG;
+    if (std::strcmp(value, "warning") == 0) return WARNING;
+    if (std::strcmp(value, "error") == 0) return ERROR;
+    if (std::strcmp(value, "off") == 0) return OFF;
+    return INFO;
+}
+
+// The process-wide log. Never destroyed (threads may outlive main); flushed at exit.
+inline EventLog& log() {
+    static EventLog* instance = [] {
+        EventLog* created = new EventLog(level_from_env());
+        std::atexit([] { log().flush(); });
+        return created;
+    }();
+    return *instance;
+}
+
+}  // namespace event_log
+
+#define LOG_AT(level, expr)                                          \
+    do {                                                             \
+        if (event_log::log().enabled(level)) {                       \
+            std::ostringstream log_line_;                            \
+            log_line_ << expr;                                       \
+            event_log::log().write(level, log_line_.str());          \
+        }                                                            \
+    } while (0)
+
+#define LOG_DEBUG(expr) LOG_AT(event_log::DEBUG, expr)
+#define LOG_INFO(expr) LOG_AT(event_log::INFO, expr)
+#define LOG_WARNING(expr) LOG_AT(event_log::WARNING, expr)
+#define LOG_ERROR(expr) LOG_AT(event_log::ERROR, expr)
@@ -0,0 +1,220 @@
+// C++ side of benchmarks/cpp_parity.py: the Python benchmarks' scenarios with the same
+// parameters, printing one JSON line per run.
+//
+//   parity_bench lock ITERATIONS
+//   parity_bench philo VERSION N DURATION SCALE SEED
+//   parity_bench detect ROUNDS
+#include <algorithm>
+#include <atomic>
+#include <chrono>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <map>
+#include <memory>
+#include <mutex>
+#include <random>
+#include <string>
+#include <thread>
+#include <vector>
+
+using Clock = std::chrono::steady_clock;
+
+static double seconds_since(Clock::time_point start) {
+    return std::chrono::duration<double>(Clock::now() - start).count();
+}
+
+// Same idea as deadlock_tools/wait_for_graph.py: owner and wait edges recorded on
+// every acquire, the chain walked on every blocking acquire.
+struct TrackedMutex;
+
+struct WaitForGraph {
+    std::mutex mutex;
+    std::map<std::thread::id, TrackedMutex*> waiting_on;
+    std::atomic<int> deadlocks{0};
+    Clock::time_point last_detected;
+};
+
+struct TrackedMutex {
+    WaitForGraph& graph;
+    std::timed_mutex lock;
+    std::thread::id owner;
+    bool owned = false;
+
+    explicit TrackedMutex(WaitForGraph& g) : graph(g) {}
+
+    bool find_cycle(std::thread::id me) {
+        TrackedMutex* next = this;
+        while (next->owned) {
+            if (next->owner == me) return true;
+            auto it = graph.waiting_on.find(next->owner);
+            if (it == graph.waiting_on.end()) return false;
+            next = it->second;
+        }
+        return false;
+    }
+
+    // timeout_ms < 0 waits forever
+    bool acquire(int timeout_ms = -1) {
+        auto me = std::this_thread::get_id();
+        {
+            std::lock_guard<std::mutex> guard(graph.mutex);
+            if (lock.try_lock()) {
+                owner = me;
+                owned = true;
+                return true;
+            }
+            graph.waiting_on[me] = this;
+            if (find_cycle(me)) {
+                graph.last_detected = Clock::now();
+                graph.deadlocks++;
+            }
+        }
+        bool acquired;
+        if (timeout_ms < 0) {
+            lock.lock();
+            acquired = true;
+        } else {
+            acquired = lock.try_lock_for(std::chrono::milliseconds(timeout_ms));
+        }
+        std::lock_guard<std::mutex> guard(graph.mutex);
+        graph.waiting_on.erase(me);
+        if (acquired) {
+            owner = me;
+            owned = true;
+        }
+        return acquired;
+    }
+
+    void release() {
+        std::lock_guard<std::mutex> guard(graph.mutex);
+        owned = false;
+        lock.unlock();
+    }
+};
+
+// Uncontended acquire + release, as in benchmarks/lock_overhead.py
+static int bench_lock(long iterations) {
+    std::mutex plain;
+    auto start = Clock::now();
+    for (long i = 0; i < iterations; i++) {
+        plain.lock();
+        plain.unlock();
+    }
+    double plain_ns = seconds_since(start) * 1e9 / iterations;
+
+    WaitForGraph graph;
+    TrackedMutex tracked(graph);
+    start = Clock::now();
+    for (long i = 0; i < iterations; i++) {
+        tracked.acquire();
+        tracked.release();
+    }
+    double tracked_ns = seconds_since(start) * 1e9 / iterations;
+    std::printf("{\"mutex_ns\": %.2f, \"tracked_ns\": %.2f}\n", plain_ns, tracked_ns);
+    return 0;
+}
+
+// Versions 1-3 of philosophers_all_versions.py with model seconds scaled like WallClock
+static int bench_philo(int version, int n, double duration, double scale, unsigned seed) {
+    WaitForGraph graph;
+    std::vector<std::unique_ptr<TrackedMutex>> forks;
+    for (int i = 0; i < n; i++) forks.emplace_back(new TrackedMutex(graph));
+    std::vector<std::atomic<long>> meals(n);
+    std::atomic<bool> stop(false);
+
+    auto sleep_model = [scale](double model_seconds) {
+        std::this_thread::sleep_for(std::chrono::duration<double>(model_seconds * scale));
+    };
+
+    auto philosopher = [&](int id) {
+        std::mt19937 gen(seed + id);
+        std::uniform_real_distribution<double> dist(1.0, 3.0);
+        int first = id, second = (id + 1) % n;
+        if (version == 3) {
+            first = std::min(id, (id + 1) % n);
+            second = std::max(id, (id + 1) % n);
+        }
+        while (!stop) {
+            sleep_model(version == 1 ? 2.0 : dist(gen));   // think
+            forks[first]->acquire();
+            forks[second]->acquire();
+            meals[id]++;
+            sleep_model(version == 1 ? 2.0 : dist(gen));   // eat
+            forks[first]->release();
+            forks[second]->release();
+        }
+    };
+
+    auto start = Clock::now();
+    std::vector<std::thread> threads;
+    for (int i = 0; i < n; i++) threads.emplace_back(philosopher, i);
+    while (seconds_since(start) < duration * scale && graph.deadlocks == 0) {
+        std::this_thread::sleep_for(std::chrono::milliseconds(10));
+    }
+    stop = true;
+    double wall = seconds_since(start);
+    long total = 0;
+    for (auto& m : meals) total += m.load();
+    std::printf("{\"meals\": %ld, \"wall_seconds\": %.6f, \"meals_per_wall_second\": %.3f, \"deadlocked\": %s}\n",
+                total, wall, total / wall, graph.deadlocks ? "true" : "false");
+    std::fflush(stdout);
+    // Deadlocked philosophers never return; leave without joining
+    std::quick_exit(0);
+}
+
+// Lock inversion between two threads; latency from the closing acquire to detection
+static int bench_detect(int rounds) {
+    std::vector<double> latencies;
+    for (int r = 0; r < rounds; r++) {
+        WaitForGraph graph;
+        TrackedMutex lock1(graph), lock2(graph);
+        std::atomic<int> ready(0);
+        Clock::time_point closing;
+
+        std::thread a([&] {
+            lock1.acquire();
+            ready++;
+            while (ready < 2) std::this_thread::yield();
+            lock2.acquire();
+            lock2.release();
+            lock1.release();
+        });
+        std::thread b([&] {
+            lock2.acquire();
+            ready++;
+            while (ready < 2) std::this_thread::yield();
+            // Give A time to block on lock2 first, so B's acquire closes the cycle
+            std::this_thread::sleep_for(std::chrono::milliseconds(5));
+            closing = Clock::now();
+            if (lock1.acquire(50)) lock1.release();   // back off after the timeout
+            lock2.release();
+        });
+        a.join();
+        b.join();
+        if (graph.deadlocks) {
+            latencies.push_back(std::chrono::duration<double>(graph.last_detected - closing).count() * 1e6);
+        }
+    }
+    std::sort(latencies.begin(), latencies.end());
+    double p50 = latencies.empty() ? -1 : latencies[latencies.size() / 2];
+    double mx = latencies.empty() ? -1 : latencies.back();
+    std::printf("{\"detected\": %zu, \"rounds\": %d, \"latency_p50_us\": %.3f, \"latency_max_us\": %.3f}\n",
+                latencies.size(), rounds, p50, mx);
+    return 0;
+}
+
+int main(int argc, char** argv) {
+    if (argc >= 3 && std::strcmp(argv[1], "lock") == 0) {
+        return bench_lock(std::atol(argv[2]));
+    }
+    if (argc >= 7 && std::strcmp(argv[1], "philo") == 0) {
+        return bench_philo(std::atoi(argv[2]), std::atoi(argv[3]), std::atof(argv[4]),
+                           std::atof(argv[5]), (unsigned)std::atol(argv[6]));
+    }
+    if (argc >= 3 && std::strcmp(argv[1], "detect") == 0) {
+        return bench_detect(std::atoi(argv[2]));
+    }
+    std::fprintf(stderr, "usage: %s lock ITERATIONS | philo VERSION N DURATION SCALE SEED | detect ROUNDS\n", argv[0]);
+    return 2;
+}
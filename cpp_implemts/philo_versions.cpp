@@ -1,5 +1,5 @@
 // C++ equivalent of philosophers_all_versions.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 #include <vector>
@@ -19,28 +19,28 @@ void philosopher_deadlock(int id) {
     int right_fork = (id + 1) % NUM_PHILOSOPHERS;
 
     while (!deadlock_detected) {
-        std::cout << "[Philosopher " << id << "] Thinking..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Thinking...");
         std::this_thread::sleep_for(std::chrono::milliseconds(500)); // Reduced thinking time
 
-        std::cout << "[Philosopher " << id << "] Hungry, trying to acquire forks." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Hungry, trying to acquire forks.");
         forks[left_fork].lock();
-        std::cout << "[Philosopher " << id << "] Picked up left fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Picked up left fork.");
         std::this_thread::sleep_for(std::chrono::milliseconds(200)); // Small delay to increase deadlock probability
 
         if (!forks[right_fork].try_lock()) {
-            std::cout << "[Philosopher " << id << "] Could not acquire right fork, releasing left fork." << std::endl;
+            LOG_INFO("[Philosopher " << id << "] Could not acquire right fork, releasing left fork.");
             forks[left_fork].unlock();
             continue;
         }
-        std::cout << "[Philosopher " << id << "] Picked up right fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Picked up right fork.");
 
-        std::cout << "[Philosopher " << id << "] Eating..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Eating...");
         std::this_thread::sleep_for(std::chrono::milliseconds(500));
 
         forks[left_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released left fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released left fork.");
         forks[right_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released right fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released right fork.");
     }
 }
 
@@ -49,25 +49,25 @@ void philosopher_prevention(int id) {
     int right_fork = (id + 1) % NUM_PHILOSOPHERS;
 
     while (true) {
-        std::cout << "[Philosopher " << id << "] Thinking..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Thinking...");
         std::this_thread::sleep_for(std::chrono::milliseconds(500));
 
-        std::cout << "[Philosopher " << id << "] Hungry, acquiring forks in order." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Hungry, acquiring forks in order.");
         int first_fork = std::min(left_fork, right_fork);
         int second_fork = std::max(left_fork, right_fork);
         forks[first_fork].lock();
-        std::cout << "[Philosopher " << id << "] Picked up first fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Picked up first fork.");
         std::this_thread::sleep_for(std::chrono::milliseconds(200)); // Small delay to prevent deadlock
         forks[second_fork].lock();
-        std::cout << "[Philosopher " << id << "] Picked up second fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Picked up second fork.");
 
-        std::cout << "[Philosopher " << id << "] Eating..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Eating...");
         std::this_thread::sleep_for(std::chrono::milliseconds(500));
 
         forks[first_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released first fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released first fork.");
         forks[second_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released second fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released second fork.");
     }
 }
 
@@ -79,7 +79,7 @@ void detect_deadlock() {
                 forks[i].unlock();
             } else {
                 deadlock_detected = true;
-                std::cout << "[Detector] Deadlock detected! Switching to deadlock prevention." << std::endl;
+                LOG_WARNING("[Detector] Deadlock detected! Switching to deadlock prevention.");
                 return;
             }
         }
@@ -91,7 +91,7 @@ int main() {
     std::vector<std::thread> philosophers;
     std::thread detector(detect_deadlock);
 
-    std::cout << "Running Deadlock-Prone Version..." << std::endl;
+    LOG_INFO("Running Deadlock-Prone Version...");
     for (int i = 0; i < NUM_PHILOSOPHERS; i++) {
         philosophers.emplace_back(philosopher_deadlock, i);
     }
@@ -101,7 +101,7 @@ int main() {
 
     detector.join();
 
-    std::cout << "Running Deadlock Prevention Version..." << std::endl;
+    LOG_INFO("Running Deadlock Prevention Version...");
     philosophers.clear();
     for (int i = 0; i < NUM_PHILOSOPHERS; i++) {
         philosophers.emplace_back(philosopher_prevention, i);
@@ -1,5 +1,5 @@
 // C++ equivalent of philosophers_all_versions.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 #include <vector>
@@ -13,29 +13,29 @@ void philosopher_deadlock(int id) {
     int right_fork = (id + 1) % NUM_PHILOSOPHERS;
 
     while (true) {
-        std::cout << "[Philosopher " << id << "] Thinking..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Thinking...");
         std::this_thread::sleep_for(std::chrono::milliseconds(500)); // Reduced thinking time
 
-        std::cout << "[Philosopher " << id << "] Hungry, trying to acquire forks." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Hungry, trying to acquire forks.");
         forks[left_fork].lock();
-        std::cout << "[Philosopher " << id << "] Picked up left fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Picked up left fork.");
         std::this_thread::sleep_for(std::chrono::milliseconds(200)); // Small delay to increase deadlock probability
         forks[right_fork].lock();
-        std::cout << "[Philosopher " << id << "] Picked up right fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Picked up right fork.");
 
-        std::cout << "[Philosopher " << id << "] Eating..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Eating...");
         std::this_thread::sleep_for(std::chrono::milliseconds(500));
 
         forks[left_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released left fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released left fork.");
         forks[right_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released right fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released right fork.");
     }
 }
 
 int main() {
     std::vector<std::thread> philosophers;
-    std::cout << "Running Deadlock-Prone Version..." << std::endl;
+    LOG_INFO("Running Deadlock-Prone Version...");
     for (int i = 0; i < NUM_PHILOSOPHERS; i++) {
         philosophers.emplace_back(philosopher_deadlock, i);
     }
@@ -1,5 +1,5 @@
 // C++ equivalent of philosopher_random.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 #include <vector>
@@ -18,34 +18,34 @@ void philosopher(int id) {
 
     while (true) {
         // Thinking
-        std::cout << "[Philosopher " << id << "] Thinking..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Thinking...");
         std::this_thread::sleep_for(std::chrono::seconds(dist(gen)));
 
         // Hungry
-        std::cout << "[Philosopher " << id << "] Hungry, trying to acquire forks." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Hungry, trying to acquire forks.");
         
         // Picking up forks in a random order to prevent circular wait
         if (id % 2 == 0) {
             forks[left_fork].lock();
-            std::cout << "[Philosopher " << id << "] Picked up left fork." << std::endl;
+            LOG_INFO("[Philosopher " << id << "] Picked up left fork.");
             forks[right_fork].lock();
-            std::cout << "[Philosopher " << id << "] Picked up right fork." << std::endl;
+            LOG_INFO("[Philosopher " << id << "] Picked up right fork.");
         } else {
             forks[right_fork].lock();
-            std::cout << "[Philosopher " << id << "] Picked up right fork." << std::endl;
+            LOG_INFO("[Philosopher " << id << "] Picked up right fork.");
             forks[left_fork].lock();
-            std::cout << "[Philosopher " << id << "] Picked up left fork." << std::endl;
+            LOG_INFO("[Philosopher " << id << "] Picked up left fork.");
         }
 
         // Eating
-        std::cout << "[Philosopher " << id << "] Eating..." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Eating...");
         std::this_thread::sleep_for(std::chrono::seconds(dist(gen)));
 
         // Put down forks
         forks[left_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released left fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released left fork.");
         forks[right_fork].unlock();
-        std::cout << "[Philosopher " << id << "] Released right fork." << std::endl;
+        LOG_INFO("[Philosopher " << id << "] Released right fork.");
     }
 }
 
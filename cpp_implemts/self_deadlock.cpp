@@ -1,5 +1,5 @@
 // C++ equivalent of self_deadlock.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 
@@ -7,16 +7,16 @@ std::mutex lock1;
 
 void critical_section() {
     lock1.lock();
-    std::cout << "[Thread] Lock acquired first time" << std::endl;
+    LOG_INFO("[Thread] Lock acquired first time");
     
     // Simulate work in the critical section
     std::this_thread::sleep_for(std::chrono::seconds(1));
 
-    std::cout << "[Thread] Trying to acquire the lock again" << std::endl;
+    LOG_INFO("[Thread] Trying to acquire the lock again");
     
     // This will cause a deadlock as the same thread tries to acquire the lock again
     lock1.lock();
-    std::cout << "[Thread] Lock acquired second time (this line will never be reached)" << std::endl;
+    LOG_INFO("[Thread] Lock acquired second time (this line will never be reached)");
 
     lock1.unlock();
     lock1.unlock();
@@ -26,6 +26,6 @@ int main() {
     std::thread t(critical_section);
     t.join();
     
-    std::cout << "[Main] Program finished" << std::endl;
+    LOG_INFO("[Main] Program finished");
     return 0;
 }
@@ -1,5 +1,5 @@
 // C++ equivalent of resource_starvation.py
-#include <iostream>
+#include "event_log.hpp"
 #include <thread>
 #include <mutex>
 #include <chrono>
@@ -10,27 +10,27 @@ std::mutex lock1;
 void thread_with_exception() {
     try {
         lock1.lock();
-        std::cout << "[Exception Thread] Lock acquired" << std::endl;
+        LOG_INFO("[Exception Thread] Lock acquired");
         throw std::runtime_error("An exception occurred and lock was not released");
     } catch (const std::exception &e) {
-        std::cout << "[Exception Thread] Exception caught: " << e.what() << std::endl;
+        LOG_WARNING("[Exception Thread] Exception caught: " << e.what());
     }
     // Ensure the lock is always released
     if (lock1.try_lock()) {
         lock1.unlock();
-        std::cout << "[Exception Thread] Lock released after exception handling" << std::endl;
+        LOG_INFO("[Exception Thread] Lock released after exception handling");
     }
 }
 
 void waiting_thread(int thread_id) {
-    std::cout << "[Thread " << thread_id << "] Trying to acquire lock" << std::endl;
+    LOG_INFO("[Thread " << thread_id << "] Trying to acquire lock");
     if (lock1.try_lock()) {
-        std::cout << "[Thread " << thread_id << "] Acquired lock" << std::endl;
+        LOG_INFO("[Thread " << thread_id << "] Acquired lock");
         std::this_thread::sleep_for(std::chrono::seconds(1)); // Simulate work
         lock1.unlock();
-        std::cout << "[Thread " << thread_id << "] Released lock" << std::endl;
+        LOG_INFO("[Thread " << thread_id << "] Released lock");
     } else {
-        std::cout << "[Thread " << thread_id << "] Could not acquire lock (potential starvation)" << std::endl;
+        LOG_WARNING("[Thread " << thread_id << "] Could not acquire lock (potential starvation)");
     }
 }
 
@@ -48,6 +48,6 @@ int main() {
         t.join();
     }
     
-    std::cout << "[Main] Program finished" << std::endl;
+    LOG_INFO("[Main] Program finished");
     return 0;
 }
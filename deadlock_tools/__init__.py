@@ -0,0 +1,6 @@
+"""
+Shared helpers for the deadlock demos (lock instrumentation, detection, simulation).
+
+The demo scripts live in their own folders and are run from there, so they add the
+repository root to sys.path before importing from this package.
+"""
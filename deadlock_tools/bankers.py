@@ -0,0 +1,229 @@
+"""
+Deadlock avoidance with Dijkstra's banker's algorithm.
+
+Each thread registers its maximum claim (how many units of each resource it may
+hold at once) and then asks a central allocator for units as it goes. A request is
+granted only if the state after it is safe, i.e. there is an order in which every
+registered thread can still get its whole claim and finish. Otherwise the request
+waits until somebody releases. No cycle can ever form, so nothing has to be detected
+or rolled back, and unlike a static lock order the threads may ask in any order.
+
+State is kept as NumPy arrays (clients x resources) so the safety check is vectorized:
+each round marks every client whose remaining need fits in the free units, all at
+once. It is also incremental: the state before a grant was safe, so the new one is
+safe as soon as the requesting client can finish (its units then come back and the
+old safe order applies again), often after a single comparison of its own row.
+
+    banker = BankersAllocator([1, 1], names=["lock1", "lock2"])
+    me = banker.register({"lock1": 1, "lock2": 1})
+    banker.request(me, "lock1")
+    banker.request(me, "lock2")    # waits while granting it would be unsafe
+    ...
+    banker.release(me, "lock2")
+    banker.release(me, "lock1")
+"""
+import threading
+import time
+
+import numpy as np
+
+
+class ClaimExceededError(RuntimeError):
+    """
+    A client asked for more than it declared in register().
+    """
+
+
+class BankersAllocator:
+    def __init__(self, total, names=None, capacity=16):
+        """
+        total: units of each resource. names: optional names to use instead of indices.
+        capacity: initial number of client rows (grows as needed).
+        """
+        self.total = np.array(total, dtype=np.int64)
+        resources = len(self.total)
+        self.names = list(names) if names is not None else [f"r{i}" for i in range(resources)]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.available = self.total.copy()
+        self.maximum = np.zeros((capacity, resources), dtype=np.int64)
+        self.allocation = np.zeros((capacity, resources), dtype=np.int64)
+        self.need = np.zeros((capacity, resources), dtype=np.int64)
+        self.active = np.zeros(capacity, dtype=bool)
+        self._free_rows = list(range(capacity - 1, -1, -1))
+        self._cond = threading.Condition()
+        self.granted = 0
+        self.deferred = 0     # requests that had to wait at least once
+        self.refused = 0      # grants turned down because the state would be unsafe
+        self.checks = 0
+        self.check_ns = 0
+
+    def _vector(self, amounts):
+        """
+        {resource name or index: units} -> array over all resources.
+        """
+        vector = np.zeros(len(self.total), dtype=np.int64)
+        for resource, units in amounts.items():
+            vector[self._index.get(resource, resource)] += units
+        return vector
+
+    ###########################################################################
+    # Clients
+    ###########################################################################
+    def register(self, claim):
+        """
+        Declares a maximum claim {resource: units}. Returns the client id to pass to
+        request() and release().
+        """
+        claim = self._vector(claim)
+        if (claim > self.total).any():
+            raise ClaimExceededError(f"claim {claim.tolist()} exceeds the total {self.total.tolist()}")
+        with self._cond:
+            if not self._free_rows:
+                self._grow()
+            client = self._free_rows.pop()
+            self.maximum[client] = claim
+            self.allocation[client] = 0
+            self.need[client] = claim
+            self.active[client] = True
+        return client
+
+    def unregister(self, client):
+        """
+        Gives back everything `client` still holds and frees its row.
+        """
+        with self._cond:
+            self.available += self.allocation[client]
+            self.allocation[client] = 0
+            self.maximum[client] = 0
+            self.need[client] = 0
+            self.active[client] = False
+            self._free_rows.append(client)
+            self._cond.notify_all()
+
+    def _grow(self):
+        old = len(self.active)
+        new = old * 2
+        for name in ("maximum", "allocation", "need"):
+            grown = np.zeros((new, len(self.total)), dtype=np.int64)
+            grown[:old] = getattr(self, name)
+            setattr(self, name, grown)
+        active = np.zeros(new, dtype=bool)
+        active[:old] = self.active
+        self.active = active
+        self._free_rows.extend(range(new - 1, old - 1, -1))
+
+    ###########################################################################
+    # Requests
+    ###########################################################################
+    def request(self, client, resource, units=1, timeout=None):
+        """
+        Blocks until `units` of `resource` can be granted without leaving the safe
+        state. Returns False if `timeout` seconds pass first.
+        """
+        return self.request_many(client, {resource: units}, timeout)
+
+    def request_many(self, client, amounts, timeout=None):
+        """
+        Same as request() for several resources, granted all together.
+        """
+        vector = self._vector(amounts)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if (self.allocation[client] + vector > self.maximum[client]).any():
+                raise ClaimExceededError(
+                    f"client {client} asked for {vector.tolist()} holding {self.allocation[client].tolist()}, "
+                    f"claim is {self.maximum[client].tolist()}")
+            waited = False
+            while not self._try_grant(client, vector):
+                if not waited:
+                    waited = True
+                    self.deferred += 1
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+            self.granted += 1
+            return True
+
+    def release(self, client, resource, units=1):
+        self.release_many(client, {resource: units})
+
+    def release_many(self, client, amounts):
+        vector = self._vector(amounts)
+        with self._cond:
+            self.allocation[client] -= vector
+            self.need[client] += vector
+            self.available += vector
+            self._cond.notify_all()
+
+    def _try_grant(self, client, vector):
+        """
+        Tentatively allocates, keeps it if the result is safe. Called with self._cond held.
+        """
+        if (vector > self.available).any():
+            return False
+        self.available -= vector
+        self.allocation[client] += vector
+        self.need[client] -= vector
+        start = time.perf_counter_ns()
+        safe = self._safe_after_grant(client)
+        self.check_ns += time.perf_counter_ns() - start
+        self.checks += 1
+        if not safe:
+            self.refused += 1
+            self.available += vector
+            self.allocation[client] -= vector
+            self.need[client] += vector
+        return safe
+
+    ###########################################################################
+    # Safety
+    ###########################################################################
+    def _safe_after_grant(self, client):
+        """
+        The state was safe before the grant to `client`, so it is safe now if the
+        reduction reaches `client`.
+        """
+        work = self.available.copy()
+        if (self.need[client] <= work).all():
+            return True
+        return self._reduce(work, until=client)
+
+    def _reduce(self, work, until=None):
+        """
+        Vectorized safety check: returns True once `until` (or, if None, every
+        client) can finish.
+        """
+        need = self.need
+        allocation = self.allocation
+        finished = ~self.active
+        while True:
+            can_finish = ~finished & (need <= work).all(axis=1)
+            if not can_finish.any():
+                return False if until is not None else bool(finished.all())
+            work += allocation[can_finish].sum(axis=0)
+            finished |= can_finish
+            if until is not None and finished[until]:
+                return True
+            if until is None and finished.all():
+                return True
+
+    def is_safe(self):
+        """
+        Full safety check of the current state (no early exit).
+        """
+        with self._cond:
+            return self._reduce(self.available.copy())
+
+    def snapshot(self):
+        """
+        Copy of the state: available units per resource and, per client, what it
+        holds and may still ask for.
+        """
+        with self._cond:
+            rows = np.flatnonzero(self.active)
+            return {
+                "available": dict(zip(self.names, self.available.tolist())),
+                "clients": {int(c): {"allocation": self.allocation[c].tolist(), "need": self.need[c].tolist()}
+                            for c in rows},
+            }
@@ -0,0 +1,209 @@
+"""
+Cooperative cancellation for threads stuck in a deadlock.
+
+Raising an exception in another thread (PyThreadState_SetAsyncExc, see
+circular_wait_cars/kill_threads.py) only takes effect when that thread runs Python
+bytecode again, which a thread blocked in lock.acquire() never does. Here instead:
+
+  - every thread can have a CancellationToken (looked up by thread ident)
+  - cancellable_acquire() waits in short slices and raises CancelledError in the
+    waiting thread once its token is cancelled, so it wakes within one slice
+  - RecoveryManager hooks into a WaitForGraph: when a cycle forms it picks the thread
+    with the least work to lose, cancels it and times how long it takes until the
+    victim releases the lock the others are waiting on
+"""
+import threading
+import time
+
+CANCEL_POLL = 0.01   # seconds: upper bound on how long a cancelled waiter sleeps on
+
+
+class CancelledError(Exception):
+    """
+    Raised in a thread whose token was cancelled while it waited for a lock.
+    """
+
+
+class CancellationToken:
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = None
+
+    def cancel(self, reason=None):
+        self.reason = reason
+        self._event.set()
+
+    def reset(self):
+        self.reason = None
+        self._event.clear()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise CancelledError(self.reason)
+
+    def wait(self, timeout=None):
+        return self._event.wait(timeout)
+
+
+###############################################################################
+# Per-thread registry: tokens and progress counters
+###############################################################################
+_tokens = {}     # thread ident -> CancellationToken
+_progress = {}   # thread ident -> units of work done (meals, loop iterations, ...)
+_registry_lock = threading.Lock()
+
+
+def token_for(ident):
+    """
+    Token of thread `ident`, created on first use.
+    """
+    token = _tokens.get(ident)
+    if token is None:
+        with _registry_lock:
+            token = _tokens.setdefault(ident, CancellationToken())
+    return token
+
+
+def current_token():
+    return token_for(threading.get_ident())
+
+
+def cancel_thread(thread, reason=None):
+    """
+    Cancels a threading.Thread (or a thread ident).
+    """
+    ident = thread if isinstance(thread, int) else thread.ident
+    token_for(ident).cancel(reason)
+
+
+def forget_thread(ident=None):
+    """
+    Drops the token and progress counter of a finished thread (default: the caller).
+    """
+    ident = threading.get_ident() if ident is None else ident
+    with _registry_lock:
+        _tokens.pop(ident, None)
+        _progress.pop(ident, None)
+
+
+def report_progress(amount=1):
+    """
+    Counts work done by the calling thread; victims are picked among the least advanced.
+    """
+    ident = threading.get_ident()
+    _progress[ident] = _progress.get(ident, 0) + amount
+
+
+def progress_of(ident):
+    return _progress.get(ident, 0)
+
+
+def cancellable_acquire(lock, timeout=-1, poll=CANCEL_POLL, ident=None):
+    """
+    lock.acquire(True, timeout) that raises CancelledError once the calling thread's
+    token is cancelled. The wait is cut in `poll` second slices, so cancellation is
+    noticed within one slice; an uncancelled wait costs one wakeup per slice.
+    """
+    ident = threading.get_ident() if ident is None else ident
+    deadline = None if timeout is None or timeout < 0 else time.monotonic() + timeout
+    while True:
+        token = _tokens.get(ident)
+        if token is not None:
+            token.raise_if_cancelled()
+        wait = poll
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return lock.acquire(False)
+            wait = min(poll, remaining)
+        if lock.acquire(True, wait):
+            return True
+
+
+###############################################################################
+# Recovery: victim selection and detection-to-resolution timing
+###############################################################################
+def work_lost(ident, held_locks, now):
+    """
+    Default victim cost: progress made first, then how long its locks have been held.
+    Lower means cheaper to roll back.
+    """
+    held_for = sum(now - lock.acquired_at for lock in held_locks if lock.acquired_at is not None)
+    return (progress_of(ident), held_for)
+
+
+class RecoveryManager:
+    """
+    Breaks deadlocks found by a WaitForGraph by cancelling one thread of the cycle.
+
+    The victim's blocked acquire raises CancelledError; it is expected to release what
+    it holds (a `with` block or a try/finally does that) and retry or give up.
+    Each recovery is recorded in self.recoveries with its detection-to-resolution time.
+    """
+
+    def __init__(self, graph, cost=work_lost, auto=True, poll=CANCEL_POLL):
+        self.graph = graph
+        self.cost = cost
+        self.auto = auto
+        self.recoveries = []
+        self.resolved_event = threading.Event()
+        self._pending = {}   # victim ident -> (record, lock the rest of the cycle waits on)
+        self._lock = threading.Lock()
+
+        self._previous_on_deadlock = graph.on_deadlock
+        graph.on_deadlock = self._on_deadlock
+        graph.on_release = self._on_release
+        graph.cancel_poll = poll
+
+    def _on_deadlock(self, cycle):
+        if self._previous_on_deadlock is not None:
+            self._previous_on_deadlock(cycle)
+        if self.auto:
+            self.recover(cycle)
+
+    def choose_victim(self, cycle):
+        now = time.monotonic()
+        with self.graph._mutex:
+            candidates = [(self.cost(t, list(self.graph.held.get(t, ())), now), t) for t, _ in cycle]
+        return min(candidates, key=lambda c: c[0])[1]
+
+    def recover(self, cycle, detected_at=None):
+        """
+        Cancels the cheapest thread of `cycle`. Returns the recovery record.
+        """
+        detected_at = time.monotonic() if detected_at is None else detected_at
+        victim = self.choose_victim(cycle)
+        # The victim's predecessor in the cycle waits on a lock the victim owns
+        blocking_lock = next(lock for _, lock in cycle if lock.owner == victim)
+        record = {
+            "victim": victim,
+            "cycle_length": len(cycle),
+            "lock": blocking_lock.name,
+            "detected_at": detected_at,
+            "resolved_at": None,
+            "resolution_s": None,
+        }
+        with self._lock:
+            self.recoveries.append(record)
+            self._pending[victim] = (record, blocking_lock)
+        cancel_thread(victim, reason=f"deadlock victim, releasing {blocking_lock.name}")
+        return record
+
+    def _on_release(self, lock, owner):
+        if not self._pending:
+            return
+        with self._lock:
+            pending = self._pending.get(owner)
+            if pending is None or pending[1] is not lock:
+                return
+            del self._pending[owner]
+        record = pending[0]
+        record["resolved_at"] = time.monotonic()
+        record["resolution_s"] = record["resolved_at"] - record["detected_at"]
+        # The victim may want to retry later
+        token_for(owner).reset()
+        self.resolved_event.set()
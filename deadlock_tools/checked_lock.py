@@ -0,0 +1,104 @@
+"""
+Self-deadlock check for non-reentrant locks.
+
+A thread that blocks on a threading.Lock it already holds waits forever (self_deadlock.py).
+CheckedLock remembers its owner and raises SelfDeadlockError instead, with the stack of
+the first acquire and of the one that would have hung.
+
+The check itself is one owner comparison. The first acquire's stack is not built up
+front: only the caller's frame and line are kept, and the stack is assembled from them
+if the error actually happens (outer frames show their current line).
+
+Like profiled(), checked(name, inner) returns the plain lock unless the
+DEADLOCK_DEBUG environment variable is set, so it can stay in production code:
+    DEADLOCK_DEBUG=1 python self_deadlock.py
+"""
+import os
+import sys
+import threading
+import traceback
+
+_get_ident = threading.get_ident
+
+
+class SelfDeadlockError(RuntimeError):
+    def __init__(self, name, first_stack, second_stack):
+        self.name = name
+        self.first_stack = first_stack    # traceback.StackSummary of the holding acquire
+        self.second_stack = second_stack  # and of the acquire that would block forever
+        super().__init__(
+            f"{threading.current_thread().name} tried to acquire {name}, which it already holds\n"
+            f"First acquired at (most recent call last):\n{''.join(first_stack.format())}"
+            f"Acquired again at (most recent call last):\n{''.join(second_stack.format())}"
+        )
+
+
+def _stack_from(frame, lineno):
+    """
+    StackSummary ending in `frame`, using `lineno` for that frame (it may have moved on).
+    """
+    stack = traceback.StackSummary.extract(traceback.walk_stack(frame), capture_locals=False)
+    stack.reverse()
+    if stack:
+        last = stack[-1]
+        stack[-1] = traceback.FrameSummary(last.filename, lineno, last.name)
+    return stack
+
+
+class CheckedLock:
+    """
+    Non-reentrant lock that raises SelfDeadlockError when its owner blocks on it again.
+    Non-blocking and timed acquires by the owner just fail, as with threading.Lock.
+    """
+
+    def __init__(self, name=None, inner=None):
+        self.name = name or f"lock-{id(self):x}"
+        self._lock = inner if inner is not None else threading.Lock()
+        self._owner = None
+        self._frame = None
+        self._lineno = 0
+
+    def acquire(self, blocking=True, timeout=-1):
+        me = _get_ident()
+        if self._owner == me and blocking and (timeout is None or timeout < 0):
+            self._raise_self_deadlock()
+        if not self._lock.acquire(blocking, timeout):
+            return False
+        self._owner = me
+        frame = self._frame = sys._getframe(1)
+        self._lineno = frame.f_lineno
+        return True
+
+    def _raise_self_deadlock(self):
+        first = _stack_from(self._frame, self._lineno)
+        second = traceback.StackSummary.extract(traceback.walk_stack(sys._getframe(2)))
+        second.reverse()
+        raise SelfDeadlockError(self.name, first, second)
+
+    def release(self):
+        self._owner = None
+        self._frame = None  # don't keep the acquiring frame's locals alive
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __repr__(self):
+        return f"<CheckedLock {self.name} owner={self._owner}>"
+
+
+ENV_VAR = "DEADLOCK_DEBUG"
+
+
+def checked(name, inner=None):
+    """
+    CheckedLock when DEADLOCK_DEBUG is set, otherwise `inner` or a plain threading.Lock.
+    """
+    if not os.environ.get(ENV_VAR):
+        return inner if inner is not None else threading.Lock()
+    return CheckedLock(name, inner)
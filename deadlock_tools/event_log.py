@@ -0,0 +1,165 @@
+"""
+Levelled event log with per-thread buffers and a background writer.
+
+print() takes the stdout lock and, on a terminal, flushes every line, so a print in a
+lock demo's hot path is a hidden extra lock shared by every thread. Here a log call
+appends one tuple to the calling thread's own deque (no lock, nothing formatted);
+a writer thread wakes every `interval` seconds, drains all deques, sorts the batch by
+timestamp and writes it with a single write() and flush().
+
+Events are a message plus keyword fields:
+    log = event_log()
+    log.info("Acquired", lock="lock1")
+       1.002 INFO  [Thread 1] Acquired lock=lock1
+
+The level comes from DEADLOCK_LOG (debug, info, warning, error or off, default info).
+Calls below the level are bound to a no-op, and with "off" no writer thread is
+started at all:
+    DEADLOCK_LOG=off python circular_wait_with_rollback.py --headless
+"""
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+OFF = 100
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR, "off": OFF}
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARN", ERROR: "ERROR"}
+
+_now_ns = time.perf_counter_ns
+
+
+def _noop(message, **fields):
+    pass
+
+
+class _Buffer:
+    __slots__ = ("events", "thread")
+
+    def __init__(self):
+        self.events = deque()   # append() and popleft() are atomic, no lock needed
+        self.thread = threading.current_thread().name
+
+
+class EventLog:
+    def __init__(self, stream=None, level=INFO, interval=0.05):
+        """
+        stream: file object to write to (default: sys.stdout at write time).
+        interval: seconds between batches.
+        """
+        self.stream = stream
+        self.interval = interval
+        self.started_ns = _now_ns()
+        self._local = threading.local()
+        self._buffers = []
+        self._buffers_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = None
+        self.written = 0
+        self.set_level(level)
+
+    def set_level(self, level):
+        """
+        Rebinds debug() / info() / warning() / error(): disabled ones become a no-op.
+        """
+        self.level = level
+        for lvl, name in ((DEBUG, "debug"), (INFO, "info"), (WARNING, "warning"), (ERROR, "error")):
+            setattr(self, name, self._emitter(lvl) if lvl >= level else _noop)
+        if level < OFF and self._writer is None:
+            self._writer = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._writer.start()
+
+    def _emitter(self, level):
+        local = self._local
+        new_buffer = self._buffer
+
+        def emit(message, **fields):
+            try:
+                events = local.events
+            except AttributeError:
+                events = new_buffer()
+            events.append((_now_ns(), level, message, fields))
+        return emit
+
+    def _buffer(self):
+        buffer = _Buffer()
+        with self._buffers_lock:
+            self._buffers.append(buffer)
+        self._local.events = buffer.events
+        return buffer.events
+
+    ###########################################################################
+    # Writer
+    ###########################################################################
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Writes everything logged so far. Called by the writer thread; safe to call
+        from anywhere (one flush at a time).
+        """
+        with self._flush_lock:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+            batch = []
+            for buffer in buffers:
+                events = buffer.events
+                thread = buffer.thread
+                for _ in range(len(events)):
+                    ts, level, message, fields = events.popleft()
+                    batch.append((ts, thread, level, message, fields))
+            if not batch:
+                return
+            batch.sort(key=lambda e: e[0])
+            start = self.started_ns
+            lines = []
+            for ts, thread, level, message, fields in batch:
+                extra = "".join(f" {k}={v}" for k, v in fields.items())
+                lines.append(f"{(ts - start) / 1e9:10.3f} {LEVEL_NAMES[level]:<5} [{thread}] {message}{extra}\n")
+            stream = self.stream or sys.stdout
+            stream.write("".join(lines))
+            stream.flush()
+            self.written += len(lines)
+
+    def close(self):
+        """
+        Stops the writer after a last flush.
+        """
+        self._closed = True
+        self._wake.set()
+        if self._writer is not None and self._writer is not threading.current_thread():
+            self._writer.join()
+        self.flush()
+
+
+###############################################################################
+# Process-wide log and the DEADLOCK_LOG switch
+###############################################################################
+ENV_VAR = "DEADLOCK_LOG"
+_default = None
+
+
+def event_log():
+    """
+    The process-wide EventLog, levelled by $DEADLOCK_LOG and flushed at exit.
+    """
+    global _default
+    if _default is None:
+        name = os.environ.get(ENV_VAR, "info").lower()
+        if name not in LEVELS:
+            raise ValueError(f"{ENV_VAR} must be one of {', '.join(LEVELS)}, not {name!r}")
+        _default = EventLog(level=LEVELS[name])
+        atexit.register(_default.close)
+    return _default
@@ -0,0 +1,87 @@
+"""
+FIFO lock: waiters get the lock in arrival order, so nobody is overtaken forever.
+
+threading.Lock lets whoever runs first grab a released lock (barging): a thread that
+releases and immediately re-acquires can keep a waiter out indefinitely, which is the
+starvation resource_starvation.py demonstrates. FairLock hands the lock directly to the
+oldest waiter on release (ticket order), so a waiter's wait is bounded by the hold
+times of the threads queued ahead of it.
+
+Drop-in for threading.Lock, also as the `inner` lock of TrackedLock / ProfiledLock:
+    lock1 = profiled("lock1", inner=FairLock())
+A timed-out acquire leaves the queue, so sliced waits (RecoveryManager) requeue at
+the back every slice; FIFO order only holds for plain blocking acquires.
+"""
+import threading
+from collections import deque
+
+_allocate_lock = threading.Lock
+
+
+class FairLock:
+    """
+    Each waiter parks on its own pre-acquired lock; release() pops the oldest one and
+    releases it, handing ownership over without ever marking the lock free.
+    """
+
+    def __init__(self):
+        self._mutex = _allocate_lock()
+        self._locked = False
+        self._waiters = deque()
+
+    def acquire(self, blocking=True, timeout=-1):
+        # Explicit acquire/release instead of `with`: this is every acquire's path,
+        # and nothing between the two can raise
+        mutex = self._mutex
+        mutex.acquire()
+        # Only take a free lock if nobody queued before us
+        if not self._locked and not self._waiters:
+            self._locked = True
+            mutex.release()
+            return True
+        if not blocking:
+            mutex.release()
+            return False
+        waiter = _allocate_lock()
+        waiter.acquire()
+        self._waiters.append(waiter)
+        mutex.release()
+
+        if waiter.acquire(True, timeout):
+            return True  # handed over by release()
+        with self._mutex:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                # release() picked us between the timeout and here: we own the lock
+                return True
+        return False
+
+    def release(self):
+        mutex = self._mutex
+        mutex.acquire()
+        if self._waiters:
+            self._waiters.popleft().release()  # stays locked, new owner wakes up
+        elif self._locked:
+            self._locked = False
+        else:
+            mutex.release()
+            raise RuntimeError("release unlocked lock")
+        mutex.release()
+
+    def locked(self):
+        return self._locked
+
+    def waiting(self):
+        """
+        Number of threads queued for the lock.
+        """
+        return len(self._waiters)
+
+    __enter__ = acquire
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __repr__(self):
+        return f"<FairLock locked={self._locked} waiting={len(self._waiters)}>"
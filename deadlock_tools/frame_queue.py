@@ -0,0 +1,39 @@
+import threading
+
+
+class FrameCoalescer:
+    """
+    Collects GUI updates from worker threads and applies them once per frame.
+
+    Workers call put(key, value): it only overwrites one dict entry, so the cost does not
+    depend on how fast the state changes, and the Tk event queue never fills up with
+    per-event callbacks. The main loop drains the dirty set every 1/fps seconds and calls
+    apply(key, value) with the latest value of each key that changed.
+    """
+
+    def __init__(self, window, apply, fps=30):
+        self.window = window
+        self.apply = apply
+        self.interval_ms = max(1, int(1000 / fps))
+        self._dirty = {}
+        self._lock = threading.Lock()
+
+    def put(self, key, value):
+        with self._lock:
+            self._dirty[key] = value
+
+    def start(self):
+        self.window.after(self.interval_ms, self._drain)
+
+    def flush(self):
+        """
+        Applies everything pending right now. Main thread only.
+        """
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        for key, value in dirty.items():
+            self.apply(key, value)
+
+    def _drain(self):
+        self.flush()
+        self.window.after(self.interval_ms, self._drain)
@@ -0,0 +1,301 @@
+"""
+Lock order analysis (the idea behind the Linux kernel's lockdep).
+
+Every time a thread acquires lock B while holding lock A, the edge A -> B is added to a
+global lock order graph. A cycle in that graph means two code paths take the same
+locks in opposite orders, which can deadlock under some interleaving, even if the
+recorded run happened to finish. circular_wait_with_rollback.py's lock1 -> lock2 /
+lock2 -> lock1 inversion shows up from any run, not only when the sleeps line up.
+
+Events are streamed (from TraceReader files or feed()), one pass, O(locks held) work
+per event; memory is the per-thread held lists plus one entry per distinct edge.
+Each edge keeps where it was first seen (thread and file:line of both acquires, when
+the trace has call sites, see DEADLOCK_TRACE_SITES) and which other locks were held
+every time; a cycle whose edges all happened under one common lock is reported
+as guarded, since that lock serializes the opposite orders.
+
+    DEADLOCK_TRACE=run.trace DEADLOCK_TRACE_SITES=1 python circular_wait_with_rollback.py --headless
+    python -m deadlock_tools.lock_order run.trace
+"""
+import argparse
+import json
+import sys
+from collections import defaultdict
+
+from deadlock_tools.trace_recorder import TraceReader, WAIT, ACQUIRED, RELEASE
+
+
+class Edge:
+    __slots__ = ("first", "second", "count", "thread", "first_site", "second_site", "guards")
+
+    def __init__(self, first, second, thread, first_site, second_site, guards):
+        self.first = first
+        self.second = second
+        self.count = 1
+        self.thread = thread
+        self.first_site = first_site     # where `first` was acquired
+        self.second_site = second_site   # where `second` was acquired while holding it
+        self.guards = guards             # locks held on every occurrence, besides `first`
+
+    def to_dict(self):
+        return {
+            "from": self.first,
+            "to": self.second,
+            "count": self.count,
+            "thread": self.thread,
+            "from_site": self.first_site,
+            "to_site": self.second_site,
+            "guards": sorted(self.guards),
+        }
+
+
+class LockOrderGraph:
+    def __init__(self):
+        self.edges = {}                  # (first, second) -> Edge
+        self.successors = defaultdict(set)
+        self.recursive = {}              # lock -> Edge for re-acquiring a held lock
+        self._held = defaultdict(list)   # thread -> [(lock, site), ...] in acquire order
+        self.events = 0
+        self.runs = 0
+
+    def feed(self, thread, lock, event, site=None):
+        """
+        One trace event. `thread` and `lock` are any hashable names; ACQUIRED and RELEASE
+        build the graph, WAIT only matters for a lock the thread already holds.
+        """
+        self.events += 1
+        held = self._held[thread]
+        if event == WAIT:
+            # Blocking on a lock we hold ourselves: self-deadlock (it never gets ACQUIRED)
+            for first, first_site in held:
+                if first == lock:
+                    self.recursive.setdefault(lock, Edge(lock, lock, thread, first_site, site,
+                                                         frozenset(h for h, _ in held)))
+        elif event == ACQUIRED:
+            if held:
+                names = None
+                for first, first_site in held:
+                    key = (first, lock)
+                    edge = self.edges.get(key)
+                    if edge is None:
+                        if names is None:
+                            names = frozenset(h for h, _ in held)
+                        if first == lock:
+                            self.recursive.setdefault(lock, Edge(first, lock, thread, first_site, site, names))
+                            continue
+                        self.edges[key] = Edge(first, lock, thread, first_site, site, names - {first})
+                        self.successors[first].add(lock)
+                    else:
+                        edge.count += 1
+                        if edge.guards:
+                            if names is None:
+                                names = frozenset(h for h, _ in held)
+                            edge.guards = edge.guards & names
+            held.append((lock, site))
+        elif event == RELEASE:
+            # Usually the innermost lock, but any order is allowed
+            for i in range(len(held) - 1, -1, -1):
+                if held[i][0] == lock:
+                    del held[i]
+                    break
+
+    def feed_trace(self, reader):
+        """
+        Streams a TraceReader. Locks are identified by name, so several traces (runs)
+        can go into one graph; threads of later runs get a "(run N)" suffix.
+        """
+        lock_name = reader.lock_name
+        site_name = reader.site_name
+        lock_names = {}
+        site_names = {}
+        self.runs += 1
+        suffix = "" if self.runs == 1 else f" (run {self.runs})"
+        threads = [f"{name}{suffix}" for name in reader.thread_names]
+        feed = self.feed
+        for _, tid, lock_id, event, site in reader:
+            if event != ACQUIRED and event != RELEASE and event != WAIT:
+                self.events += 1
+                continue
+            name = lock_names.get(lock_id)
+            if name is None:
+                name = lock_names[lock_id] = lock_name(lock_id)
+            where = site_names.get(site)
+            if where is None and site:
+                where = site_names[site] = site_name(site)
+            feed(threads[tid - 1], name, event, where)
+
+    def cycles(self, limit=None):
+        """
+        Every elementary cycle of the lock order graph (Johnson's algorithm), as lists of
+        Edges. Stops after `limit` cycles.
+        """
+        found = []
+        for nodes in simple_cycles(self.successors):
+            edges = [self.edges[(nodes[i], nodes[(i + 1) % len(nodes)])] for i in range(len(nodes))]
+            found.append(edges)
+            if limit is not None and len(found) >= limit:
+                break
+        return found
+
+    def report(self, limit=None):
+        cycles = []
+        for edges in self.cycles(limit):
+            common = frozenset.intersection(*(e.guards for e in edges))
+            threads = {e.thread for e in edges}
+            cycles.append({
+                "locks": [e.first for e in edges],
+                "guarded_by": sorted(common),
+                "single_thread": len(threads) == 1,
+                "edges": [e.to_dict() for e in edges],
+            })
+        return {
+            "events": self.events,
+            "locks": len(set(self.successors) | {b for _, b in self.edges}),
+            "edges": len(self.edges),
+            "cycles": cycles,
+            "recursive": [e.to_dict() for e in self.recursive.values()],
+        }
+
+
+###############################################################################
+# Graph helpers (iterative: lock graphs can have long chains, e.g. 1000 forks)
+###############################################################################
+def strongly_connected_components(successors, nodes):
+    """
+    Tarjan's algorithm restricted to `nodes`. Yields sets of nodes.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(successors.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            advanced = False
+            for child in children:
+                if child not in nodes:
+                    continue
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors.get(child, ()))))
+                    advanced = True
+                    break
+                if child in on_stack:
+                    low[node] = min(low[node], index[child])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = set()
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.add(member)
+                    if member == node:
+                        break
+                yield component
+
+
+def simple_cycles(successors):
+    """
+    Johnson's algorithm, iterative. Yields each elementary cycle once as a node list.
+    """
+    remaining = set(successors) | {n for targets in successors.values() for n in targets}
+    components = [c for c in strongly_connected_components(successors, remaining) if len(c) > 1]
+    while components:
+        component = components.pop()
+        start = min(component, key=str)
+        path = [start]
+        blocked = {start}
+        closed = set()
+        unblock_on = defaultdict(set)
+        stack = [(start, [n for n in successors.get(start, ()) if n in component])]
+        while stack:
+            node, neighbours = stack[-1]
+            if neighbours:
+                nxt = neighbours.pop()
+                if nxt == start:
+                    yield path[:]
+                    closed.update(path)
+                elif nxt not in blocked:
+                    path.append(nxt)
+                    stack.append((nxt, [n for n in successors.get(nxt, ()) if n in component]))
+                    closed.discard(nxt)
+                    blocked.add(nxt)
+                    continue
+            if not neighbours:
+                if node in closed:
+                    pending = {node}
+                    while pending:
+                        n = pending.pop()
+                        if n in blocked:
+                            blocked.discard(n)
+                            pending.update(unblock_on[n])
+                            unblock_on[n].clear()
+                else:
+                    for n in successors.get(node, ()):
+                        if n in component:
+                            unblock_on[n].add(node)
+                stack.pop()
+                path.pop()
+        component.discard(start)
+        components.extend(c for c in strongly_connected_components(successors, component) if len(c) > 1)
+
+
+def format_report(report):
+    lines = [f"{report['events']} events, {report['locks']} locks, {report['edges']} lock order edges"]
+    for edge in report["recursive"]:
+        lines.append(f"Recursive acquire of {edge['from']} at {edge['to_site'] or '?'} "
+                     f"(already held since {edge['from_site'] or '?'})")
+    if not report["cycles"]:
+        lines.append("No lock order cycles.")
+    for cycle in report["cycles"]:
+        order = " -> ".join(cycle["locks"] + cycle["locks"][:1])
+        note = ""
+        if cycle["guarded_by"]:
+            note = f"  [guarded by {', '.join(map(str, cycle['guarded_by']))}]"
+        elif cycle["single_thread"]:
+            note = "  [one thread so far]"
+        lines.append(f"Potential deadlock: {order}{note}")
+        for e in cycle["edges"]:
+            lines.append(f"    {e['from']} -> {e['to']}: acquired {e['to']} at {e['to_site'] or '?'} "
+                         f"holding {e['from']} from {e['from_site'] or '?'} ({e['count']}x)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find lock order cycles in recorded lock traces")
+    parser.add_argument("traces", nargs="+", help="files written by TraceRecorder.dump")
+    parser.add_argument("--max-cycles", type=int, default=1000)
+    parser.add_argument("--json", default=None, help="also write the report as JSON")
+    args = parser.parse_args(argv)
+
+    graph = LockOrderGraph()
+    for path in args.traces:
+        with TraceReader(path) as reader:
+            graph.feed_trace(reader)
+    report = graph.report(args.max_cycles)
+    print(format_report(report))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    unguarded = [c for c in report["cycles"] if not c["guarded_by"]]
+    return 1 if unguarded or report["recursive"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""
+Per-lock contention profiler.
+
+ProfiledLock wraps a threading.Lock and keeps, per lock:
+  - acquisition counts (uncontended / contended / timed out), plus failed try-locks
+  - an HDR-style histogram of wait times (contended acquires only)
+  - an HDR-style histogram of hold times
+and dumps everything as JSON on exit or on demand.
+
+Scripts create their locks through profiled(name): it returns a plain threading.Lock
+unless the DEADLOCK_PROFILE environment variable is set, e.g.
+    DEADLOCK_PROFILE=profile.json python resource_starvation.py
+so the profiler costs nothing when it is off.
+"""
+import atexit
+import json
+import os
+import signal
+import sys
+import threading
+import time
+
+_now_ns = time.perf_counter_ns
+
+# Log-linear buckets: exact below 32ns, then 16 sub-buckets per power of two (~6% error)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+_MIN_TOP_BITS = SUB_BUCKET_BITS + 1
+NUM_BUCKETS = (64 - SUB_BUCKET_BITS) * SUB_BUCKETS
+
+
+class Histogram:
+    """
+    Fixed-size log-linear histogram of nanosecond durations (same idea as HdrHistogram).
+    record() is a bit_length, a shift and one list increment.
+    """
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * NUM_BUCKETS
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, value):
+        shift = value.bit_length() - _MIN_TOP_BITS
+        if shift < 0:
+            shift = 0
+        self.counts[shift * SUB_BUCKETS + (value >> shift)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @staticmethod
+    def bucket_floor(index):
+        """
+        Smallest value that lands in bucket `index`.
+        """
+        if index < 2 * SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return (index - shift * SUB_BUCKETS) << shift
+
+    def percentile(self, q):
+        if not self.count:
+            return 0
+        target = q / 100 * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            if n:
+                seen += n
+                if seen >= target:
+                    return self.bucket_floor(index)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean_ns": self.total / self.count if self.count else 0,
+            "p50_ns": self.percentile(50),
+            "p90_ns": self.percentile(90),
+            "p99_ns": self.percentile(99),
+            "max_ns": self.max,
+            # bucket floor (ns) -> count, non-empty buckets only
+            "buckets": {str(self.bucket_floor(i)): n for i, n in enumerate(self.counts) if n},
+        }
+
+
+class ProfiledLock:
+    """
+    Drop-in threading.Lock wrapper recording wait and hold durations.
+    The uncontended path is one non-blocking acquire plus one clock read.
+    """
+
+    def __init__(self, name, inner=None):
+        self.name = name
+        self._lock = inner if inner is not None else threading.Lock()
+        self._acquired_at = 0
+        self.uncontended = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.busy = 0          # acquire(False) on a held lock: a probe, not a failure
+        self.wait_hist = Histogram()
+        self.hold_hist = Histogram()
+        _registry.append(self)
+
+    def acquire(self, blocking=True, timeout=-1):
+        lock = self._lock
+        if lock.acquire(False):
+            self.uncontended += 1
+            self._acquired_at = _now_ns()
+            return True
+        if not blocking:
+            self.busy += 1
+            return False
+
+        start = _now_ns()
+        acquired = lock.acquire(True, timeout)
+        now = _now_ns()
+        if not acquired:
+            self.timeouts += 1
+            return False
+        # Only the owner writes these, so the counters need no extra lock
+        self.contended += 1
+        self.wait_hist.record(now - start)
+        self._acquired_at = now
+        return True
+
+    def release(self):
+        # Histogram.record() inlined: this runs on every release
+        held = _now_ns() - self._acquired_at
+        hist = self.hold_hist
+        shift = held.bit_length() - _MIN_TOP_BITS
+        if shift < 0:
+            shift = 0
+        hist.counts[shift * SUB_BUCKETS + (held >> shift)] += 1
+        hist.count += 1
+        hist.total += held
+        if held > hist.max:
+            hist.max = held
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *args):
+        self.release()
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "acquisitions": self.uncontended + self.contended,
+            "uncontended": self.uncontended,
+            "contended": self.contended,
+            "failed": self.timeouts,
+            "busy": self.busy,
+            "wait": self.wait_hist.to_dict(),
+            "hold": self.hold_hist.to_dict(),
+        }
+
+
+###############################################################################
+# Registry, JSON dump and the DEADLOCK_PROFILE switch
+###############################################################################
+_registry = []
+_dump_registered = False
+_signal_registered = False
+ENV_VAR = "DEADLOCK_PROFILE"
+
+
+def all_stats():
+    """
+    Stats of every ProfiledLock created so far, hottest (most waited on) first.
+    """
+    stats = [lock.stats() for lock in list(_registry)]
+    stats.sort(key=lambda s: s["wait"]["count"] * s["wait"]["mean_ns"], reverse=True)
+    return stats
+
+
+def dump(path=None):
+    """
+    Writes all lock stats as JSON to `path` (stdout if None).
+    """
+    report = {"pid": os.getpid(), "time": time.time(), "locks": all_stats()}
+    if path is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+        return
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def dump_on_exit(path=None):
+    global _dump_registered
+    if not _dump_registered:
+        _dump_registered = True
+        atexit.register(dump, path)
+
+
+def dump_on_signal(path=None, signum=getattr(signal, "SIGUSR1", None)):
+    """
+    `kill -USR1 <pid>` writes a snapshot while the run keeps going. Signal handlers can
+    only be installed from the main thread, and one the script set itself is kept;
+    returns whether the handler was installed.
+    """
+    global _signal_registered
+    if _signal_registered:
+        return True
+    if signum is None or threading.current_thread() is not threading.main_thread():
+        return False
+    if signal.getsignal(signum) not in (signal.SIG_DFL, None):
+        return False
+    signal.signal(signum, lambda *_: dump(path))
+    _signal_registered = True
+    return True
+
+
+def profiled(name, inner=None):
+    """
+    ProfiledLock when DEADLOCK_PROFILE is set (its value is the JSON output path, or "1"
+    for stdout), otherwise `inner` or a plain threading.Lock. The stats are written at
+    exit and on SIGUSR1 (once a lock has been created from the main thread).
+    """
+    target = os.environ.get(ENV_VAR)
+    if not target:
+        return inner if inner is not None else threading.Lock()
+    path = None if target == "1" else target
+    dump_on_exit(path)
+    dump_on_signal(path)
+    return ProfiledLock(name, inner)
@@ -0,0 +1,411 @@
+"""
+Live metrics over HTTP, in the Prometheus text format.
+
+Nothing here runs on the hot path. Locks, the wait-for graph, the recovery manager and
+the demos already keep plain counters (an integer increment under a lock they hold
+anyway); collectors read those counters when /metrics is scraped, so a run costs the
+same whether anybody is watching or not.
+
+Scripts register what they have through exported(), which starts the endpoint only
+when DEADLOCK_METRICS is set to a port (or host:port):
+    DEADLOCK_METRICS=9464 python circular_wait_with_rollback.py --headless
+    curl localhost:9464/metrics
+
+    deadlock_lock_acquisitions_total{lock="lock1"} 12
+    deadlock_lock_waiters{lock="lock2"} 1
+    deadlock_lock_wait_seconds_bucket{lock="lock2",le="0.001"} 3
+    deadlock_deadlocks_detected_total 4
+    deadlock_rollbacks_total 4
+
+A collector is a function returning metric families, each
+(name, type, help, [(suffix, {label: value}, value), ...]). Families of the same name
+from several collectors are merged into one; objects that can exist more than once per
+process (the philosophers demo) wrap theirs in labelled() so their series stay
+distinct, and drop them with unexported() when they finish.
+"""
+import os
+import threading
+from collections import Counter
+
+from deadlock_tools import lock_profiler
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds (seconds) of the exported wait/hold histograms
+BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 0.01, 0.1, 1.0, 10.0)
+
+
+###############################################################################
+# Text format
+###############################################################################
+def _labels(labels):
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+    return "{" + body + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _value(value):
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def render(families):
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for suffix, labels, value in samples:
+            lines.append(f"{name}{suffix}{_labels(labels)} {_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def histogram_samples(hist, labels, buckets=BUCKETS):
+    """
+    Cumulative Prometheus buckets of a lock_profiler.Histogram (nanoseconds in,
+    seconds out). An HDR bucket is counted under the first bound its largest value
+    fits in, so bounds are exact up to the HDR bucket width (~6%).
+    """
+    bounds_ns = [b * 1e9 for b in buckets]
+    per_bound = [0] * (len(buckets) + 1)
+    floor = hist.bucket_floor
+    for index, n in enumerate(hist.counts):
+        if n:
+            largest = floor(index + 1) - 1
+            slot = 0
+            while slot < len(bounds_ns) and bounds_ns[slot] < largest:
+                slot += 1
+            per_bound[slot] += n
+    samples = []
+    seen = 0
+    for bound, n in zip(buckets, per_bound):
+        seen += n
+        samples.append(("_bucket", dict(labels, le=_value(float(bound))), seen))
+    seen += per_bound[-1]
+    samples.append(("_bucket", dict(labels, le="+Inf"), seen))
+    samples.append(("_sum", labels, hist.total / 1e9))
+    samples.append(("_count", labels, seen))
+    return samples
+
+
+###############################################################################
+# Collectors
+###############################################################################
+def wait_graph_metrics(graph):
+    """
+    Per-lock acquisitions, current waiters and wait times of every TrackedLock of
+    `graph`, plus the deadlocks it has detected.
+    """
+    def collect():
+        with graph._mutex:
+            waiters = Counter(lock.name for lock in graph.waiting_on.values())
+            holders = sum(1 for locks in graph.held.values() if locks)
+        locks = sorted(graph.locks, key=lambda lock: lock.name)   # WeakSet order varies
+        acquisitions, contended, waiting, wait_times = [], [], [], []
+        for lock in locks:
+            labels = {"lock": lock.name}
+            acquisitions.append(("", labels, lock.acquisitions))
+            contended.append(("", labels, lock.contended))
+            waiting.append(("", labels, waiters.get(lock.name, 0)))
+            wait_times.extend(histogram_samples(lock.wait_hist, labels))
+        return [
+            ("deadlock_lock_acquisitions_total", "counter", "Successful acquires per lock.", acquisitions),
+            ("deadlock_lock_contended_total", "counter", "Acquires that had to wait.", contended),
+            ("deadlock_lock_waiters", "gauge", "Threads currently blocked on the lock.", waiting),
+            ("deadlock_lock_wait_seconds", "histogram", "Time blocked in contended acquires.", wait_times),
+            ("deadlock_threads_waiting", "gauge", "Threads blocked on any tracked lock.",
+             [("", {}, sum(waiters.values()))]),
+            ("deadlock_threads_holding", "gauge", "Threads holding at least one tracked lock.",
+             [("", {}, holders)]),
+            ("deadlock_deadlocks_detected_total", "counter", "Cycles found by the wait-for graph.",
+             [("", {}, len(graph.deadlocks))]),
+        ]
+    return collect
+
+
+def resource_graph_metrics(graph):
+    """
+    Units available and waiting threads per resource of a ResourceGraph, plus its
+    deadlocks and the time spent checking for them.
+    """
+    def collect():
+        with graph._mutex:
+            waiters = Counter(resource.name for resource, _ in graph.waiting_on.values())
+            pools = [(r.name, r.available, r.total) for r in graph.resources if not r.is_condition]
+            checks, check_ns = graph.checks, graph.check_ns
+        return [
+            ("deadlock_resource_available", "gauge", "Units free in the pool.",
+             [("", {"resource": name}, available) for name, available, _ in pools]),
+            ("deadlock_resource_units", "gauge", "Units in the pool.",
+             [("", {"resource": name}, total) for name, _, total in pools]),
+            ("deadlock_resource_waiters", "gauge", "Threads blocked on the resource.",
+             [("", {"resource": name}, n) for name, n in waiters.items()]),
+            ("deadlock_resource_checks_total", "counter", "Reductions run on blocking requests.",
+             [("", {}, checks)]),
+            ("deadlock_resource_check_seconds_total", "counter", "Time spent in reductions.",
+             [("", {}, check_ns / 1e9)]),
+            ("deadlock_resource_deadlocks_total", "counter", "Deadlocks found by reduction.",
+             [("", {}, len(graph.deadlocks))]),
+        ]
+    return collect
+
+
+def bankers_metrics(allocator):
+    """
+    Grants, deferred and refused requests and free units of a bankers.BankersAllocator.
+    """
+    def collect():
+        with allocator._cond:
+            available = allocator.available.tolist()
+            granted, deferred, refused = allocator.granted, allocator.deferred, allocator.refused
+            checks, check_ns = allocator.checks, allocator.check_ns
+        return [
+            ("deadlock_bankers_granted_total", "counter", "Requests granted.", [("", {}, granted)]),
+            ("deadlock_bankers_deferred_total", "counter", "Requests that waited for a safe state.",
+             [("", {}, deferred)]),
+            ("deadlock_bankers_unsafe_total", "counter", "Grants refused because the state would be unsafe.",
+             [("", {}, refused)]),
+            ("deadlock_bankers_checks_total", "counter", "Safety checks run.", [("", {}, checks)]),
+            ("deadlock_bankers_check_seconds_total", "counter", "Time spent in safety checks.",
+             [("", {}, check_ns / 1e9)]),
+            ("deadlock_bankers_available", "gauge", "Units free per resource.",
+             [("", {"resource": str(name)}, n) for name, n in zip(allocator.names, available)]),
+        ]
+    return collect
+
+
+def recovery_metrics(manager):
+    """
+    Rollbacks done by a cancellation.RecoveryManager and how long they took.
+    """
+    def collect():
+        records = list(manager.recoveries)
+        resolved = [r["resolution_s"] for r in records if r["resolution_s"] is not None]
+        return [
+            ("deadlock_rollbacks_total", "counter", "Deadlock victims cancelled.", [("", {}, len(records))]),
+            ("deadlock_rollbacks_resolved_total", "counter", "Rollbacks whose victim released the lock.",
+             [("", {}, len(resolved))]),
+            ("deadlock_rollback_resolution_seconds_total", "counter",
+             "Total detection-to-release time of resolved rollbacks.", [("", {}, float(sum(resolved)))]),
+        ]
+    return collect
+
+
+def _merged(histograms):
+    merged = lock_profiler.Histogram()
+    for hist in histograms:
+        merged.counts = [a + b for a, b in zip(merged.counts, hist.counts)]
+        merged.count += hist.count
+        merged.total += hist.total
+        merged.max = max(merged.max, hist.max)
+    return merged
+
+
+def profiler_metrics():
+    """
+    Every ProfiledLock (DEADLOCK_PROFILE): outcomes, wait and hold histograms.
+    ProfiledLocks live as long as the process, so locks sharing a name (fork0 of
+    successive demo runs) are added up into one series.
+    """
+    def collect():
+        by_name = {}
+        for lock in list(lock_profiler._registry):
+            by_name.setdefault(lock.name, []).append(lock)
+        outcomes, waits, holds = [], [], []
+        for name, locks in by_name.items():
+            labels = {"lock": name}
+            for outcome, attr in (("uncontended", "uncontended"), ("contended", "contended"),
+                                  ("failed", "timeouts"), ("busy", "busy")):
+                outcomes.append(("", dict(labels, outcome=outcome), sum(getattr(lock, attr) for lock in locks)))
+            waits.extend(histogram_samples(_merged(lock.wait_hist for lock in locks), labels))
+            holds.extend(histogram_samples(_merged(lock.hold_hist for lock in locks), labels))
+        if not outcomes:
+            return []
+        return [
+            ("deadlock_profiled_acquires_total", "counter", "ProfiledLock acquires by outcome.", outcomes),
+            ("deadlock_profiled_wait_seconds", "histogram", "ProfiledLock contended wait times.", waits),
+            ("deadlock_profiled_hold_seconds", "histogram", "ProfiledLock hold times.", holds),
+        ]
+    return collect
+
+
+def philosopher_metrics(demo):
+    """
+    Meals per philosopher and how many are in each state (DiningPhilosophersDemo).
+    """
+    def collect():
+        meals = [("", {"philosopher": str(i)}, n) for i, n in enumerate(list(demo.meals))]
+        states = Counter(demo.states)
+        return [
+            ("philosopher_meals_total", "counter", "Meals eaten per philosopher.", meals),
+            ("philosopher_state", "gauge", "Philosophers currently in each state.",
+             [("", {"state": s}, states.get(s, 0)) for s in ("THINKING", "HUNGRY", "EATING")]),
+        ]
+    return collect
+
+
+def traffic_metrics(grid):
+    """
+    Progress counters of a circular_wait_cars TrafficGrid.
+    """
+    def collect():
+        gridlocks = list(grid.gridlocks)
+        uncleared = sum(1 for g in gridlocks if g["cleared_at"] is None)
+        return [
+            ("traffic_virtual_seconds", "gauge", "Simulated time reached.", [("", {}, float(grid.clock.now()))]),
+            ("traffic_cars_spawned_total", "counter", "Cars that entered the grid.", [("", {}, grid.cars_spawned)]),
+            ("traffic_cars_exited_total", "counter", "Cars that left the grid.", [("", {}, grid.cars_exited)]),
+            ("traffic_cars_towed_total", "counter", "Cars towed to clear a gridlock.", [("", {}, grid.cars_towed)]),
+            ("traffic_cars_in_grid", "gauge", "Cars currently in the grid.", [("", {}, grid.in_grid)]),
+            ("traffic_gridlocks_total", "counter", "Gridlocks detected.", [("", {}, len(gridlocks))]),
+            ("traffic_gridlocks_open", "gauge", "Gridlocks not cleared yet.", [("", {}, uncleared)]),
+        ]
+    return collect
+
+
+def labelled(collector, **labels):
+    """
+    `collector` with `labels` added to every sample, e.g. labelled(c, run="3").
+    """
+    def collect():
+        return [(name, kind, help_text, [(suffix, dict(sample_labels, **labels), value)
+                                         for suffix, sample_labels, value in samples])
+                for name, kind, help_text, samples in collector()]
+    return collect
+
+
+###############################################################################
+# Registry and HTTP endpoint
+###############################################################################
+class MetricsRegistry:
+    def __init__(self):
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def register(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+        return collector
+
+    def unregister(self, collector):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def collect(self):
+        """
+        Families of every collector, one per name (the exposition format allows a
+        single HELP/TYPE block per family).
+        """
+        with self._lock:
+            collectors = list(self._collectors)
+        families = {}
+        for collector in collectors:
+            for name, kind, help_text, samples in collector():
+                if name in families:
+                    families[name][3].extend(samples)
+                else:
+                    families[name] = (name, kind, help_text, list(samples))
+        return list(families.values())
+
+    def render(self):
+        return render(self.collect())
+
+
+class MetricsServer:
+    """
+    ThreadingHTTPServer on a daemon thread serving registry.render() at /metrics.
+    port=0 picks a free port (see self.port).
+    """
+
+    def __init__(self, registry, port=9464, host="127.0.0.1"):
+        # Imported here: http.server costs more than the rest of a headless start-up
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                try:
+                    body = registry.render().encode()
+                except Exception as e:   # a collector raced a structure it reads; try again later
+                    self.send_error(500, str(e))
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass   # one line per scrape would drown the demo's own output
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.host, self.port = self.httpd.server_address[:2]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-server", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/metrics"
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self._thread.join()
+
+
+###############################################################################
+# Process-wide endpoint and the DEADLOCK_METRICS switch
+###############################################################################
+ENV_VAR = "DEADLOCK_METRICS"
+_registry = None
+_server = None
+
+
+def parse_address(value):
+    """
+    "9464" -> ("127.0.0.1", 9464), "0.0.0.0:9464" -> ("0.0.0.0", 9464).
+    """
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def exported(*collectors):
+    """
+    Adds `collectors` to the process-wide registry and starts the endpoint on the
+    first call, when DEADLOCK_METRICS is set. Otherwise does nothing and returns None,
+    so scripts can call it unconditionally.
+    """
+    global _registry, _server
+    target = os.environ.get(ENV_VAR)
+    if not target:
+        return None
+    if _server is None:
+        host, port = parse_address(target)
+        _registry = MetricsRegistry()
+        _registry.register(profiler_metrics())
+        _server = MetricsServer(_registry, port, host)
+        print(f"[metrics] serving {_server.url}")
+    for collector in collectors:
+        _registry.register(collector)
+    return _server
+
+
+def unexported(*collectors):
+    """
+    Removes collectors added by exported(), e.g. when the run they describe ends.
+    """
+    if _registry is not None:
+        for collector in collectors:
+            _registry.unregister(collector)
@@ -0,0 +1,247 @@
+"""
+Offscreen rendering of the demos with Pillow, for headless boxes and recordings.
+
+The Tk windows are the only visuals, they need a display, and every canvas.coords()
+is a round-trip into Tcl. OffscreenRenderer draws the same pictures into Pillow
+images instead and writes them as an animated GIF or as numbered PNG frames.
+
+The simulation only calls submit(state) with a small snapshot (tuples of positions
+or states). Drawing and encoding both happen on a background thread, into one
+reused RGB buffer: the static part (roads, table) is drawn once and pasted back at
+the start of every frame. If the writer falls behind, submit() drops the frame and
+counts it in self.dropped instead of blocking the caller.
+
+    renderer = OffscreenRenderer(TableScene(5), "run.gif", fps=10)
+    renderer.submit((states, forks_locked))
+    ...
+    renderer.close()    # writes the GIF
+
+A path ending in .gif gives an animated GIF (frames are palette-converted on the
+writer thread and kept in memory until close(), so at most max_gif_frames of them;
+later ones are counted in self.skipped); anything else is a directory of
+frame_00000.png, frame_00001.png, ..., which is the one to use for long runs.
+
+If drawing or writing fails, the renderer thread stops, later frames are dropped and
+close() raises the error.
+"""
+import math
+import os
+import queue
+import threading
+
+from PIL import Image, ImageDraw, ImageFont
+
+_STOP = object()
+
+
+###############################################################################
+# Scenes: a static background plus a draw(image, draw, state) for each frame
+###############################################################################
+def _dashed_line(draw, start, end, dash=(5, 2), fill="white"):
+    """
+    Tk's dash=(5, 2) on an axis-aligned line.
+    """
+    (x0, y0), (x1, y1) = start, end
+    length = max(abs(x1 - x0), abs(y1 - y0))
+    dx, dy = (x1 - x0) / length, (y1 - y0) / length
+    on, off = dash
+    pos = 0
+    while pos < length:
+        stop = min(pos + on, length)
+        draw.line([(x0 + dx * pos, y0 + dy * pos), (x0 + dx * stop, y0 + dy * stop)], fill=fill)
+        pos = stop + off
+
+
+class IntersectionScene:
+    """
+    The 500x500 crossing of draw_intersection.py. A frame state is a sequence of
+    (x, y, heading) car centres; sprites is {heading: PIL image} (sprite_cache).
+    """
+
+    size = (500, 500)
+
+    def __init__(self, sprites):
+        self.sprites = sprites
+
+    def background(self, image, draw):
+        draw.rectangle([200, 0, 300, 500], fill="gray")   # vertical road
+        draw.rectangle([0, 200, 500, 300], fill="gray")   # horizontal road
+        for y in range(0, 500, 40):
+            _dashed_line(draw, (245, y), (245, y + 20))
+            _dashed_line(draw, (255, y), (255, y + 20))
+        for x in range(0, 500, 40):
+            _dashed_line(draw, (x, 245), (x + 20, 245))
+            _dashed_line(draw, (x, 255), (x + 20, 255))
+
+    def draw(self, image, draw, cars):
+        for x, y, heading in cars:
+            sprite = self.sprites[heading]
+            w, h = sprite.size
+            # Tk anchors images at their centre
+            box = (int(round(x - w / 2)), int(round(y - h / 2)))
+            image.paste(sprite, box, sprite if sprite.mode == "RGBA" else None)
+
+
+class TableScene:
+    """
+    The 600x600 table of philosophers_all_versions.py. A frame state is
+    (states, forks_locked): one state string per philosopher, one bool per fork.
+    """
+
+    size = (600, 600)
+    COLORS = {"THINKING": "white", "HUNGRY": "yellow", "EATING": "lightgreen"}
+
+    def __init__(self, num_philosophers):
+        self.num_philosophers = num_philosophers
+        try:
+            self.font = ImageFont.load_default(size=14)
+        except TypeError:   # Pillow < 10.1 has one fixed-size default font
+            self.font = ImageFont.load_default()
+        n = num_philosophers
+        centre, radius = 300, 200
+        self.philosophers = [(centre + radius * math.sin(2 * math.pi / n * i),
+                              centre - radius * math.cos(2 * math.pi / n * i)) for i in range(n)]
+        self.forks = [(centre + radius * 0.7 * math.sin(2 * math.pi / n * (i + 0.5)),
+                       centre - radius * 0.7 * math.cos(2 * math.pi / n * (i + 0.5))) for i in range(n)]
+
+    def background(self, image, draw):
+        draw.ellipse([50, 50, 550, 550], fill="#ddd")
+
+    def draw(self, image, draw, state):
+        states, forks_locked = state
+        r = 40
+        for i, (px, py) in enumerate(self.philosophers):
+            draw.ellipse([px - r, py - r, px + r, py + r], fill=self.COLORS.get(states[i], "white"),
+                         outline="black", width=2)
+            draw.multiline_text((px, py), f"P{i}\n{states[i]}", fill="black", font=self.font,
+                                anchor="mm", align="center")
+        r = 10
+        for i, (fx, fy) in enumerate(self.forks):
+            draw.ellipse([fx - r, fy - r, fx + r, fy + r], fill="red" if forks_locked[i] else "gray",
+                         outline="black")
+
+
+###############################################################################
+# Writers (run on the renderer thread)
+###############################################################################
+class GifWriter:
+    def __init__(self, path, fps, max_frames=None):
+        self.path = path
+        self.duration_ms = int(1000 / fps)
+        self.max_frames = max_frames
+        self.frames = []
+
+    @property
+    def full(self):
+        return self.max_frames is not None and len(self.frames) >= self.max_frames
+
+    def write(self, image):
+        # A new palette image per frame, so the RGB buffer can be drawn over again
+        self.frames.append(image.convert("P", palette=Image.Palette.ADAPTIVE, colors=64))
+
+    def close(self):
+        if self.frames:
+            first, *rest = self.frames
+            first.save(self.path, save_all=True, append_images=rest, duration=self.duration_ms,
+                       loop=0, optimize=False)
+        return len(self.frames)
+
+
+class PngSequenceWriter:
+    def __init__(self, folder):
+        self.folder = folder
+        self.count = 0
+        os.makedirs(folder, exist_ok=True)
+
+    full = False   # nothing is kept in memory
+
+    def write(self, image):
+        # Written straight from the shared buffer; fast zlib level, frames are many
+        image.save(os.path.join(self.folder, f"frame_{self.count:05d}.png"), compress_level=1)
+        self.count += 1
+
+    def close(self):
+        return self.count
+
+
+###############################################################################
+# Renderer
+###############################################################################
+class OffscreenRenderer:
+    def __init__(self, scene, path, fps=10, max_pending=256, max_gif_frames=2000):
+        """
+        scene: IntersectionScene, TableScene or anything with size, background() and
+        draw(). path: .gif file or frame directory. fps: playback rate of the output.
+        max_pending: frames queued for the writer before submit() starts dropping.
+        max_gif_frames: frames a GIF keeps (in memory until close()) before skipping.
+        """
+        self.scene = scene
+        self.path = path
+        if path.lower().endswith(".gif"):
+            self.writer = GifWriter(path, fps, max_gif_frames)
+        else:
+            self.writer = PngSequenceWriter(path)
+        self.background = Image.new("RGB", scene.size, "white")
+        scene.background(self.background, ImageDraw.Draw(self.background))
+        self._buffer = self.background.copy()
+        self._draw = ImageDraw.Draw(self._buffer)
+        self._pending = queue.Queue(maxsize=max_pending)
+        self.submitted = 0
+        self.dropped = 0
+        self.frames = 0
+        self.skipped = 0      # past max_gif_frames
+        self.error = None     # what stopped the renderer thread, raised by close()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="offscreen-renderer", daemon=True)
+        self._thread.start()
+
+    def submit(self, state):
+        """
+        Queues one frame. Never blocks; returns False if the frame was dropped.
+        """
+        if self._closed or self.error is not None:
+            return False
+        try:
+            self._pending.put_nowait(state)
+        except queue.Full:
+            self.dropped += 1
+            return False
+        self.submitted += 1
+        return True
+
+    def _run(self):
+        buffer = self._buffer
+        try:
+            while True:
+                state = self._pending.get()
+                if state is _STOP:
+                    return
+                if self.writer.full:
+                    self.skipped += 1
+                    continue
+                buffer.paste(self.background)
+                self.scene.draw(buffer, self._draw, state)
+                self.writer.write(buffer)
+                self.frames += 1
+        except Exception as e:
+            self.error = e
+
+    def close(self):
+        """
+        Renders what is queued, finishes the file(s) and returns the frame count.
+        Raises whatever stopped the renderer thread, if anything did.
+        """
+        if self._closed:
+            return self.frames
+        self._closed = True
+        # The thread may have died with the queue full: only wait on it while it runs
+        while self._thread.is_alive():
+            try:
+                self._pending.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.writer.close()
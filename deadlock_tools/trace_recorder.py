@@ -0,0 +1,368 @@
+"""
+Binary trace of lock events, cheap enough to leave on.
+
+Every thread writes into its own fixed-size ring buffer (an array('q'), no lock, no
+allocation per event). One event is four int64s:
+    timestamp (perf_counter_ns), thread id, lock id, code
+with code = event | site << 8 (site is 0 unless call sites are recorded, see below).
+Thread ids number the recording threads 1, 2, ... (OS idents get reused); the thread
+column is filled when the ring is created, so recording writes three slots.
+When a ring is full the oldest events are overwritten and counted as dropped.
+
+dump(path) merges the rings by timestamp into a file that TraceReader memory-maps:
+
+    offset 0   header  "<8sIIQQ": magic, version, record size (32), event count, meta offset
+    offset 32  events  event count x 4 native int64
+    meta offset        UTF-8 JSON: lock names, thread names, call sites, dropped counts
+
+Scripts get recorded locks through recorded(name, inner) which, like profiled(), returns
+the plain lock unless DEADLOCK_TRACE is set to an output path:
+    DEADLOCK_TRACE=run.trace python philosophers_all_versions.py
+DEADLOCK_TRACE_SITES=1 also records the file:line of every acquire (slower, needed
+by the lock order analyzer to point at code).
+
+Pure Python cannot get below one thread-local lookup and three array stores per event,
+which is what RecordedLock's uncontended path does (compare in benchmarks/lock_overhead.py).
+
+    python -m deadlock_tools.trace_recorder run.trace --tail 20
+"""
+import argparse
+import atexit
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from array import array
+
+WAIT = 1        # blocking acquire started (lock was busy)
+ACQUIRED = 2
+RELEASE = 3
+FAILED = 4      # non-blocking or timed out acquire
+EVENT_NAMES = {WAIT: "wait", ACQUIRED: "acquired", RELEASE: "release", FAILED: "failed"}
+
+MAGIC = b"DLTRACE\x00"
+VERSION = 1
+HEADER = struct.Struct("<8sIIQQ")
+FIELDS = 4
+RECORD_SIZE = FIELDS * 8
+
+_now_ns = time.perf_counter_ns
+# Call sites skip frames in this package (TrackedLock, ProfiledLock, ... wrappers)
+_PACKAGE_DIR = os.path.dirname(os.path.realpath(__file__))
+_internal_files = {}   # code filename -> True if it is one of our modules
+
+
+def _is_internal(filename):
+    internal = _internal_files.get(filename)
+    if internal is None:
+        internal = _internal_files[filename] = os.path.dirname(os.path.realpath(filename)) == _PACKAGE_DIR
+    return internal
+
+
+class _Ring:
+    __slots__ = ("data", "pos", "mask", "tid", "ident", "name")
+
+    def __init__(self, capacity, tid):
+        self.data = array("q", [0, tid, 0, 0]) * capacity
+        self.pos = 0
+        self.mask = capacity - 1
+        self.tid = tid
+        thread = threading.current_thread()
+        self.ident = thread.ident
+        self.name = thread.name
+
+    def events(self):
+        """
+        (ts, thread, lock, code) tuples still in the ring, oldest first.
+        """
+        capacity = self.mask + 1
+        start = max(0, self.pos - capacity)
+        data = self.data
+        for i in range(start, self.pos):
+            j = (i & self.mask) * FIELDS
+            yield data[j], data[j + 1], data[j + 2], data[j + 3]
+
+
+class TraceRecorder:
+    def __init__(self, capacity=1 << 14, sites=False):
+        """
+        capacity: events kept per thread (rounded up to a power of two).
+        sites: also record the caller's file:line on every event.
+        """
+        self.capacity = 1 << max(0, (capacity - 1).bit_length())
+        self.sites = sites
+        self._local = threading.local()
+        self._rings = []
+        self._lock = threading.Lock()
+        self.lock_names = []      # lock id - 1 -> name
+        self.site_names = []      # site id - 1 -> "file:line"
+        self._site_ids = {}
+        self.started_ns = _now_ns()
+        self.started_wall = time.time()
+
+    def lock_id(self, name):
+        with self._lock:
+            self.lock_names.append(name)
+            return len(self.lock_names)
+
+    def site_id(self, frame):
+        key = (frame.f_code.co_filename, frame.f_lineno)
+        site = self._site_ids.get(key)
+        if site is None:
+            with self._lock:
+                site = self._site_ids.get(key)
+                if site is None:
+                    self.site_names.append(f"{key[0]}:{key[1]}")
+                    site = self._site_ids[key] = len(self.site_names)
+        return site
+
+    def _ring(self):
+        with self._lock:
+            ring = _Ring(self.capacity, len(self._rings) + 1)
+            self._rings.append(ring)
+        self._local.ring = ring
+        return ring
+
+    def record(self, lock_id, event):
+        """
+        Appends one event for the calling thread.
+        """
+        try:
+            ring = self._local.ring
+        except AttributeError:
+            ring = self._ring()
+        if self.sites:
+            frame = sys._getframe(1)
+            while frame.f_back is not None and _is_internal(frame.f_code.co_filename):
+                frame = frame.f_back
+            event |= self.site_id(frame) << 8
+        pos = ring.pos
+        ring.pos = pos + 1
+        j = (pos & ring.mask) << 2   # FIELDS == 4, thread column is prefilled
+        data = ring.data
+        data[j] = _now_ns()
+        data[j + 2] = lock_id
+        data[j + 3] = event
+
+    def dropped(self):
+        return sum(max(0, ring.pos - self.capacity) for ring in self._rings)
+
+    def dump(self, path):
+        """
+        Writes every ring, merged by timestamp, in the format TraceReader maps.
+        Other threads may keep recording; events added meanwhile may or may not be in.
+        """
+        with self._lock:
+            rings = list(self._rings)
+        merged = array("q")
+        count = 0
+        for event in heapq.merge(*(ring.events() for ring in rings)):
+            merged.extend(event)
+            count += 1
+        meta = {
+            "byteorder": sys.byteorder,
+            "started_ns": self.started_ns,
+            "started_wall": self.started_wall,
+            "locks": self.lock_names,
+            "sites": self.site_names,
+            # thread id - 1 -> OS ident, name and overwritten event count
+            "threads": [{"ident": ring.ident, "name": ring.name,
+                         "dropped": max(0, ring.pos - self.capacity)} for ring in rings],
+        }
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, RECORD_SIZE, count, HEADER.size + count * RECORD_SIZE))
+            merged.tofile(f)
+            f.write(json.dumps(meta).encode("utf-8"))
+
+
+class TraceReader:
+    """
+    Memory-mapped view of a dump() file. Events are decoded on access only:
+        with TraceReader("run.trace") as trace:
+            for ts, thread, lock, event, site in trace: ...
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count, meta_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a version {VERSION} lock trace")
+        self.meta = json.loads(self._map[meta_offset:].decode("utf-8"))
+        if self.meta["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {self.meta['byteorder']}-endian machine")
+        self.count = count
+        self.values = memoryview(self._map)[HEADER.size:meta_offset].cast("q")
+        self.lock_names = self.meta["locks"]
+        self.site_names = self.meta["sites"]
+        self.thread_names = [t["name"] for t in self.meta["threads"]]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        j = index * FIELDS
+        v = self.values
+        code = v[j + 3]
+        return v[j], v[j + 1], v[j + 2], code & 0xFF, code >> 8
+
+    def __iter__(self):
+        v = self.values
+        for j in range(0, self.count * FIELDS, FIELDS):
+            code = v[j + 3]
+            yield v[j], v[j + 1], v[j + 2], code & 0xFF, code >> 8
+
+    def lock_name(self, lock_id):
+        return self.lock_names[lock_id - 1] if lock_id else None
+
+    def site_name(self, site_id):
+        return self.site_names[site_id - 1] if site_id else None
+
+    def thread_name(self, tid):
+        return self.thread_names[tid - 1]
+
+    def close(self):
+        self.values.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RecordedLock:
+    """
+    Lock wrapper writing WAIT / ACQUIRED / FAILED / RELEASE events to a TraceRecorder.
+    """
+
+    def __init__(self, recorder, name, inner=None):
+        self.recorder = recorder
+        self.name = name
+        self.id = recorder.lock_id(name)
+        self._lock = inner if inner is not None else threading.Lock()
+
+    def acquire(self, blocking=True, timeout=-1):
+        recorder = self.recorder
+        if self._lock.acquire(False):
+            if recorder.sites:
+                recorder.record(self.id, ACQUIRED)
+                return True
+            # TraceRecorder.record() inlined: this is the path taken on every uncontended acquire
+            try:
+                ring = recorder._local.ring
+            except AttributeError:
+                ring = recorder._ring()
+            pos = ring.pos
+            ring.pos = pos + 1
+            j = (pos & ring.mask) << 2
+            data = ring.data
+            data[j] = _now_ns()
+            data[j + 2] = self.id
+            data[j + 3] = ACQUIRED
+            return True
+        if not blocking:
+            recorder.record(self.id, FAILED)
+            return False
+        recorder.record(self.id, WAIT)
+        acquired = False
+        try:
+            acquired = self._lock.acquire(True, timeout)
+        finally:
+            # Also covers a wait that ended in CancelledError
+            recorder.record(self.id, ACQUIRED if acquired else FAILED)
+        return acquired
+
+    def release(self):
+        recorder = self.recorder
+        if recorder.sites:
+            recorder.record(self.id, RELEASE)
+        else:
+            # Inlined like the uncontended acquire
+            try:
+                ring = recorder._local.ring
+            except AttributeError:
+                ring = recorder._ring()
+            pos = ring.pos
+            ring.pos = pos + 1
+            j = (pos & ring.mask) << 2
+            data = ring.data
+            data[j] = _now_ns()
+            data[j + 2] = self.id
+            data[j + 3] = RELEASE
+        self._lock.release()
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *args):
+        self.release()
+
+
+###############################################################################
+# Process-wide recorder and the DEADLOCK_TRACE switch
+###############################################################################
+ENV_VAR = "DEADLOCK_TRACE"
+SITES_ENV_VAR = "DEADLOCK_TRACE_SITES"
+_default = None
+
+
+def default_recorder():
+    """
+    The recorder used by recorded(); dumped to $DEADLOCK_TRACE at exit.
+    """
+    global _default
+    if _default is None:
+        _default = TraceRecorder(sites=bool(os.environ.get(SITES_ENV_VAR)))
+        path = os.environ.get(ENV_VAR)
+        if path:
+            atexit.register(_default.dump, path)
+    return _default
+
+
+def recorded(name, inner=None):
+    """
+    RecordedLock when DEADLOCK_TRACE is set, otherwise `inner` or a plain threading.Lock.
+    """
+    if not os.environ.get(ENV_VAR):
+        return inner if inner is not None else threading.Lock()
+    return RecordedLock(default_recorder(), name, inner)
+
+
+def print_trace(path, tail=20):
+    """
+    Event counts and the last `tail` events, i.e. what every thread did right before
+    the run got stuck.
+    """
+    with TraceReader(path) as trace:
+        counts = {}
+        for _, _, _, event, _ in trace:
+            counts[EVENT_NAMES.get(event, event)] = counts.get(EVENT_NAMES.get(event, event), 0) + 1
+        dropped = sum(t["dropped"] for t in trace.meta["threads"])
+        print(f"{len(trace)} events, {len(trace.thread_names)} threads, {dropped} overwritten: {counts}")
+        start = trace.meta["started_ns"]
+        for i in range(max(0, len(trace) - tail), len(trace)):
+            ts, tid, lock, event, site = trace[i]
+            where = f"  at {trace.site_name(site)}" if site else ""
+            print(f"{(ts - start) / 1e6:12.3f} ms  {trace.thread_name(tid):<28} "
+                  f"{EVENT_NAMES.get(event, event):<9} {trace.lock_name(lock)}{where}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print a lock trace written by TraceRecorder.dump")
+    parser.add_argument("path")
+    parser.add_argument("--tail", type=int, default=20, help="number of final events to print")
+    args = parser.parse_args()
+    print_trace(args.path, args.tail)
@@ -0,0 +1,88 @@
+import heapq
+import itertools
+import time
+
+
+class VirtualClock:
+    """
+    Discrete-event clock: time only moves when the next scheduled event is popped,
+    so a simulated "sleep(2)" costs one heap push instead of two real seconds.
+
+    Events scheduled for the same instant run in the order they were scheduled,
+    which keeps every run with the same seed reproducible.
+    """
+
+    def __init__(self, start=0.0):
+        self._now = start
+        self._queue = []
+        self._seq = itertools.count()
+        self._stopped = False
+        self.events_processed = 0
+
+    def now(self):
+        return self._now
+
+    def call_at(self, when, callback, *args):
+        if when < self._now:
+            when = self._now
+        heapq.heappush(self._queue, (when, next(self._seq), callback, args))
+
+    def call_later(self, delay, callback, *args):
+        self.call_at(self._now + delay, callback, *args)
+
+    def pending(self):
+        return len(self._queue)
+
+    def has_due(self):
+        """
+        True if another event is scheduled for the current instant.
+        """
+        return bool(self._queue) and self._queue[0][0] <= self._now
+
+    def stop(self):
+        """
+        Makes run() return after the event that is currently being processed.
+        """
+        self._stopped = True
+
+    def run(self, until=None):
+        """
+        Processes events in time order until the queue is empty, stop() is called,
+        or the next event lies beyond `until`. Returns the virtual time reached.
+        """
+        self._stopped = False
+        queue = self._queue
+        pop = heapq.heappop
+        while queue and not self._stopped:
+            if until is not None and queue[0][0] > until:
+                self._now = until
+                break
+            when, _, callback, args = pop(queue)
+            self._now = when
+            self.events_processed += 1
+            callback(*args)
+        return self._now
+
+
+class WallClock:
+    """
+    Real time with the same now()/sleep() interface, for the threaded demos.
+    `scale` shrinks every sleep: with scale=0.001 the demos' seconds become milliseconds,
+    while now() keeps reporting model seconds so results compare with VirtualClock runs.
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self._start = time.perf_counter()
+
+    def now(self):
+        return (time.perf_counter() - self._start) / self.scale
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.scale)
+
+    def to_real(self, seconds):
+        """
+        Model seconds -> real seconds, for timeouts passed to queues/conditions.
+        """
+        return seconds * self.scale
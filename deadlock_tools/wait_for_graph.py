@@ -0,0 +1,164 @@
+import threading
+import time
+import weakref
+
+from deadlock_tools.cancellation import cancellable_acquire
+from deadlock_tools.lock_profiler import Histogram
+
+
+class WaitForGraph:
+    """
+    Incrementally maintained wait-for graph.
+
+    Every lock has at most one owner and every thread waits on at most one lock, so the
+    graph is a chain: thread -> lock it waits on -> owner of that lock -> ...
+    A cycle can only be closed by the wait edge that is added last, so checking the chain
+    on each blocking acquire finds every deadlock the moment it forms, in O(cycle length).
+
+    With cancel_poll set (RecoveryManager does it), blocked acquires wait in slices of
+    that many seconds and raise CancelledError when their thread's token is cancelled.
+    """
+
+    def __init__(self, on_deadlock=None):
+        self._mutex = threading.Lock()
+        self.waiting_on = {}   # thread ident -> lock it is blocked on
+        self.held = {}         # thread ident -> list of locks it owns
+        self.on_deadlock = on_deadlock
+        self.deadlocks = []    # every cycle found so far (list of (thread ident, lock) pairs)
+        self.deadlock_event = threading.Event()
+        self.on_release = None  # called as on_release(lock, previous owner)
+        self.cancel_poll = None
+        self.locks = weakref.WeakSet()  # live TrackedLocks reporting here, for metrics
+
+    def _find_cycle(self, me, lock):
+        """
+        Follows the chain starting at `lock`. Must be called with self._mutex held.
+        Returns the cycle as [(thread, lock it waits on), ...] or None.
+        """
+        cycle = [(me, lock)]
+        seen = {me}
+        owner = lock.owner
+        while owner is not None:
+            if owner == me:
+                return cycle
+            if owner in seen:
+                return None  # the chain runs into a cycle `me` is not part of
+            seen.add(owner)
+            next_lock = self.waiting_on.get(owner)
+            if next_lock is None:
+                return None  # owner is running, so it will release eventually
+            cycle.append((owner, next_lock))
+            owner = next_lock.owner
+        return None
+
+    def snapshot(self):
+        """
+        Copy of the current edges, for printing or drawing.
+        """
+        with self._mutex:
+            waiting = {t: lock.name for t, lock in self.waiting_on.items()}
+            owners = {t: [lock.name for lock in locks] for t, locks in self.held.items() if locks}
+        return waiting, owners
+
+
+class TrackedLock:
+    """
+    Drop-in replacement for threading.Lock that reports to a WaitForGraph.
+    Owner and waiters are recorded on every acquire/release, along with acquisition
+    counts and the wait times of contended acquires (read by deadlock_tools.metrics).
+    """
+
+    def __init__(self, graph, name=None, inner=None):
+        self.graph = graph
+        self.name = name or f"lock-{id(self):x}"
+        self._lock = inner if inner is not None else threading.Lock()
+        self.owner = None
+        self.acquired_at = None  # time.monotonic() of the last acquire, for victim selection
+        self.acquisitions = 0
+        self.contended = 0
+        self.wait_hist = Histogram()   # ns, contended acquires only
+        graph.locks.add(self)
+
+    def acquire(self, blocking=True, timeout=-1):
+        graph = self.graph
+        me = threading.get_ident()
+        cycle = None
+
+        with graph._mutex:
+            # Fast path: nobody holds it, no wait edge needed
+            if self._lock.acquire(False):
+                self._set_owner(me)
+                return True
+            if not blocking:
+                return False
+            graph.waiting_on[me] = self
+            cycle = graph._find_cycle(me, self)
+            if cycle is not None:
+                graph.deadlocks.append(cycle)
+
+        acquired = False
+        start = time.perf_counter_ns()
+        try:
+            if cycle is not None:
+                # Report outside the mutex so the callback may inspect or release locks
+                graph.deadlock_event.set()
+                if graph.on_deadlock is not None:
+                    graph.on_deadlock(cycle)
+            if graph.cancel_poll is None:
+                acquired = self._lock.acquire(True, timeout)
+            else:
+                acquired = cancellable_acquire(self._lock, timeout, graph.cancel_poll, me)
+        finally:
+            with graph._mutex:
+                del graph.waiting_on[me]
+                if acquired:
+                    self.contended += 1
+                    self.wait_hist.record(time.perf_counter_ns() - start)
+                    self._set_owner(me)
+        return acquired
+
+    def _set_owner(self, me):
+        self.owner = me
+        self.acquired_at = time.monotonic()
+        self.acquisitions += 1
+        self.graph.held.setdefault(me, []).append(self)
+
+    def release(self):
+        graph = self.graph
+        with graph._mutex:
+            owner = self.owner
+            if owner is not None:
+                held = graph.held.get(owner)
+                if held is not None and self in held:
+                    held.remove(self)
+            self.owner = None
+            self.acquired_at = None
+            self._lock.release()
+        if graph.on_release is not None:
+            graph.on_release(self, owner)
+
+    def locked(self):
+        return self._lock.locked()
+
+    __enter__ = acquire
+
+    def __exit__(self, *args):
+        self.release()
+
+    def __repr__(self):
+        return f"<TrackedLock {self.name} owner={self.owner}>"
+
+
+def describe_cycle(cycle):
+    """
+    Human readable version of a cycle, e.g. "T1 waits for lock2 (held by T2) -> ...".
+    """
+    names = {t.ident: t.name for t in threading.enumerate()}
+    parts = []
+    for i, (thread, lock) in enumerate(cycle):
+        # The holder at detection time is the next waiter in the cycle; lock.owner may
+        # have changed since (e.g. the victim already rolled back)
+        holder = cycle[(i + 1) % len(cycle)][0]
+        parts.append(f"{names.get(thread, thread)} waits for {lock.name} "
+                     f"(held by {names.get(holder, holder)})")
+    return " -> ".join(parts)
@@ -1,8 +1,16 @@
-import tkinter as tk
 import threading
-import time
 import random
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.wait_for_graph import WaitForGraph, TrackedLock, describe_cycle
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.frame_queue import FrameCoalescer
+from deadlock_tools.virtual_clock import VirtualClock, WallClock
+from philosopher_sim import simulate
 
 NUM_PHILOSOPHERS = 5
 
@@ -11,19 +19,59 @@ STATE_THINKING = "THINKING"
 STATE_HUNGRY = "HUNGRY"
 STATE_EATING = "EATING"
 
+# GUI repaints per second (state changes in between are coalesced)
+FPS = 30
+
+def _same_duration(duration):
+    return duration
+
+
 class DiningPhilosophersDemo:
-    def __init__(self):
-        # Create the Tkinter window and canvas
+    def __init__(self, headless=False, clock=None, num_philosophers=NUM_PHILOSOPHERS, fps=FPS,
+                 think_time=None, eat_time=None, on_state=None,
+                 max_meals=None, until=None, seed=None):
+        """
+        Same options as philosophers_all_versions.DiningPhilosophersDemo: headless runs use
+        the discrete-event engine (version 2 there is this strategy) unless a real clock
+        such as WallClock(scale=0.001) is passed, in which case the threads run until stop().
+        """
+        self.num_philosophers = num_philosophers
+        if clock is None:
+            clock = VirtualClock() if headless else WallClock()
+        self.clock = clock
+        self.think_time = think_time or _same_duration
+        self.eat_time = eat_time or _same_duration
+        self.on_state = on_state
+
+        if headless and isinstance(clock, VirtualClock):
+            self.result = simulate(2, num_philosophers, clock=clock, seed=seed,
+                                   max_meals=max_meals, until=until, think_time=think_time,
+                                   eat_time=eat_time, on_state=on_state)
+            return
+
+        # Data structures
+        # Forks report to a wait-for graph, so a circular wait is caught when it forms
+        self.wait_graph = WaitForGraph(on_deadlock=self.on_deadlock)
+        self.forks = [TrackedLock(self.wait_graph, f"fork{i}", inner=recorded(f"fork{i}", inner=profiled(f"fork{i}")))
+                      for i in range(num_philosophers)]
+        self.states = [STATE_THINKING for _ in range(num_philosophers)]
+        self.stop_event = threading.Event()
+
+        if headless:
+            # Threads only, nobody to repaint for
+            self.window = None
+            self.frames = None
+            self._start_threads()
+            return
+
+        # Create the Tkinter window and canvas (tkinter is only imported for GUI runs)
+        import tkinter as tk
         self.window = tk.Tk()
         self.window.title("Dining Philosophers Demo")
 
         self.canvas = tk.Canvas(self.window, width=600, height=600, bg="white")
         self.canvas.pack()
 
-        # Data structures
-        self.forks = [threading.Lock() for _ in range(NUM_PHILOSOPHERS)]
-        self.states = [STATE_THINKING for _ in range(NUM_PHILOSOPHERS)]
-        
         # Each philosopher has:
         #  - A circle on canvas for visual
         #  - A text label inside that circle
@@ -36,14 +84,29 @@ class DiningPhilosophersDemo:
         # Initialize the geometry on canvas
         self._create_table_graphics()
 
-        # Create and start a thread for each philosopher
-        for i in range(NUM_PHILOSOPHERS):
+        # Worker threads only mark philosophers/forks dirty, the main loop repaints per frame
+        self.frames = FrameCoalescer(self.window, self._apply_update, fps)
+        self.frames.start()
+
+        self._start_threads()
+
+        # Start the Tkinter main loop
+        self.window.mainloop()
+
+    def _start_threads(self):
+        """
+        Create and start a thread for each philosopher.
+        """
+        for i in range(self.num_philosophers):
             t = threading.Thread(target=self.philosopher_thread, args=(i,))
             t.daemon = True  # Daemon so program can exit if main window closes
             t.start()
 
-        # Start the Tkinter main loop
-        self.window.mainloop()
+    def stop(self):
+        """
+        Asks the philosopher threads to leave their loop (deadlocked ones stay blocked).
+        """
+        self.stop_event.set()
 
     def _create_table_graphics(self):
         """
@@ -58,8 +121,8 @@ class DiningPhilosophersDemo:
         circle_r = 40      # radius of each philosopher’s circle
 
         # Place 5 philosophers evenly around the table
-        for i in range(NUM_PHILOSOPHERS):
-            angle = (2 * math.pi / NUM_PHILOSOPHERS) * i
+        for i in range(self.num_philosophers):
+            angle = (2 * math.pi / self.num_philosophers) * i
             # Philosopher's center
             px = center_x + radius_phil * math.sin(angle)
             py = center_y - radius_phil * math.cos(angle)
@@ -77,9 +140,9 @@ class DiningPhilosophersDemo:
 
         #draw small circles for forks
         fork_r = 10
-        for i in range(NUM_PHILOSOPHERS):
+        for i in range(self.num_philosophers):
             # Fork is between philosopher i and (i+1)
-            angle_f = (2 * math.pi / NUM_PHILOSOPHERS) * (i + 0.5)
+            angle_f = (2 * math.pi / self.num_philosophers) * (i + 0.5)
             fx = center_x + (radius_phil * 0.7) * math.sin(angle_f)
             fy = center_y - (radius_phil * 0.7) * math.cos(angle_f)
             fork_id = self.canvas.create_oval(
@@ -100,12 +163,12 @@ class DiningPhilosophersDemo:
         (approach that can lead to deadlock, deadlock scenario forcefully created in the philosopher_all_versions.py)
         """
         left_fork = phil_id
-        right_fork = (phil_id + 1) % NUM_PHILOSOPHERS
+        right_fork = (phil_id + 1) % self.num_philosophers
 
-        while True:
+        while not self.stop_event.is_set():
             # 1. THINK
             self.update_state(phil_id, STATE_THINKING)
-            time.sleep(random.uniform(1, 3))  # random thinking time
+            self.clock.sleep(self.think_time(random.uniform(1, 3)))  # random thinking time
 
             # 2. Become HUNGRY
             self.update_state(phil_id, STATE_HUNGRY)
@@ -119,7 +182,7 @@ class DiningPhilosophersDemo:
 
             # 4. EAT
             self.update_state(phil_id, STATE_EATING)
-            time.sleep(random.uniform(1, 3))  # random eating time
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))  # random eating time
 
             # 5. Put down forks
             self.forks[left_fork].release()
@@ -130,39 +193,49 @@ class DiningPhilosophersDemo:
 
             # Then loop back to thinking
 
+    def on_deadlock(self, cycle):
+        """
+        Called by the philosopher that closes the circular wait.
+        """
+        print("[Detector] Deadlock detected:", describe_cycle(cycle))
+
     def update_state(self, phil_id, new_state):
         """
         Thread-safe update of philosopher's state (and color).
+        Only marks it dirty; the main loop repaints it on the next frame.
         """
         self.states[phil_id] = new_state
-
-        # Because Tkinter isn't thread-safe, schedule on main thread:
-        def _update():
-            circle_id = self.phil_circles[phil_id]
-            label_id = self.phil_labels[phil_id]
-
-            if new_state == STATE_THINKING:
-                color = "white"
-            elif new_state == STATE_HUNGRY:
-                color = "yellow"
-            else:  # EATING
-                color = "lightgreen"
-
-            self.canvas.itemconfig(circle_id, fill=color)
-            self.canvas.itemconfig(label_id, text=f"P{phil_id}\n{new_state}")
-
-        self.window.after(0, _update)
+        if self.on_state is not None:
+            self.on_state(phil_id, new_state, self.clock.now())
+        if self.frames is not None:
+            self.frames.put(("phil", phil_id), new_state)
 
     def update_fork_locked(self, fork_id, locked):
         """
         Thread-safe update of a fork's color if locked/unlocked.
         """
-        def _update():
-            fork_circle = self.fork_circles[fork_id]
-            color = "red" if locked else "gray"
-            self.canvas.itemconfig(fork_circle, fill=color)
+        if self.frames is not None:
+            self.frames.put(("fork", fork_id), locked)
 
-        self.window.after(0, _update)
+    def _apply_update(self, key, value):
+        """
+        Runs on the Tk main thread with the latest value of a philosopher or fork.
+        """
+        kind, index = key
+        if kind == "fork":
+            color = "red" if value else "gray"
+            self.canvas.itemconfig(self.fork_circles[index], fill=color)
+            return
+
+        if value == STATE_THINKING:
+            color = "white"
+        elif value == STATE_HUNGRY:
+            color = "yellow"
+        else:  # EATING
+            color = "lightgreen"
+
+        self.canvas.itemconfig(self.phil_circles[index], fill=color)
+        self.canvas.itemconfig(self.phil_labels[index], text=f"P{index}\n{value}")
 
 if __name__ == "__main__":
     DiningPhilosophersDemo()
@@ -0,0 +1,308 @@
+"""
+Headless discrete-event version of the strategies in philosophers_all_versions.py.
+
+Each philosopher is a generator that yields the same steps the threaded version performs
+(think, become hungry, pick up forks, eat, put them down). The engine runs them against a
+VirtualClock, so no window, no threads and no real sleeping are involved, and a run with
+a given seed always produces the same schedule.
+"""
+import os
+import random
+import sys
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.virtual_clock import VirtualClock
+
+# Philosopher states (same values as the GUI scripts)
+STATE_THINKING = "THINKING"
+STATE_HUNGRY = "HUNGRY"
+STATE_EATING = "EATING"
+
+# Commands a philosopher generator can yield
+SLEEP = 0
+ACQUIRE = 1
+RELEASE = 2
+STATE = 3
+
+
+###############################################################################
+# 1. Strategies (mirror the philosopher_thread_* methods step by step)
+###############################################################################
+def philosopher_deadlock(sim, phil_id):
+    """
+    Deadlock-prone: fixed think/eat times, left fork then right fork.
+    """
+    left_fork = phil_id
+    right_fork = (phil_id + 1) % sim.num_philosophers
+
+    while True:
+        yield STATE, STATE_THINKING
+        yield SLEEP, sim.think_time(2)
+
+        yield STATE, STATE_HUNGRY
+        yield ACQUIRE, left_fork
+        yield ACQUIRE, right_fork
+
+        yield STATE, STATE_EATING
+        yield SLEEP, sim.eat_time(2)
+
+        yield RELEASE, left_fork
+        yield RELEASE, right_fork
+
+
+def philosopher_randomized(sim, phil_id):
+    """
+    Random think/eat times, left fork then right fork.
+    """
+    left_fork = phil_id
+    right_fork = (phil_id + 1) % sim.num_philosophers
+
+    while True:
+        yield STATE, STATE_THINKING
+        yield SLEEP, sim.think_time(sim.rng.uniform(1, 3))
+
+        yield STATE, STATE_HUNGRY
+        yield ACQUIRE, left_fork
+        yield ACQUIRE, right_fork
+
+        yield STATE, STATE_EATING
+        yield SLEEP, sim.eat_time(sim.rng.uniform(1, 3))
+
+        yield RELEASE, left_fork
+        yield RELEASE, right_fork
+
+
+def philosopher_prevention(sim, phil_id):
+    """
+    Random think/eat times, forks taken in global (min, max) order.
+    """
+    left_fork = phil_id
+    right_fork = (phil_id + 1) % sim.num_philosophers
+    first_fork = min(left_fork, right_fork)
+    second_fork = max(left_fork, right_fork)
+
+    while True:
+        yield STATE, STATE_THINKING
+        yield SLEEP, sim.think_time(sim.rng.uniform(1, 3))
+
+        yield STATE, STATE_HUNGRY
+        yield ACQUIRE, first_fork
+        yield ACQUIRE, second_fork
+
+        yield STATE, STATE_EATING
+        yield SLEEP, sim.eat_time(sim.rng.uniform(1, 3))
+
+        yield RELEASE, first_fork
+        yield RELEASE, second_fork
+
+
+STRATEGIES = {
+    1: philosopher_deadlock,
+    2: philosopher_randomized,
+    3: philosopher_prevention,
+}
+
+
+###############################################################################
+# 2. Engine
+###############################################################################
+class SimFork:
+    """
+    Fork with an owner and a FIFO queue of blocked philosophers.
+    """
+
+    __slots__ = ("owner", "waiters")
+
+    def __init__(self):
+        self.owner = None
+        self.waiters = deque()
+
+
+class SimulationResult:
+    def __init__(self, sim):
+        self.version = sim.version
+        self.num_philosophers = sim.num_philosophers
+        self.end_time = sim.clock.now()
+        self.meals = list(sim.meals)
+        self.total_meals = sim.total_meals
+        self.deadlock_time = sim.deadlock_time
+        self.deadlock_cycle = sim.deadlock_cycle
+        self.events_processed = sim.clock.events_processed
+
+    @property
+    def deadlocked(self):
+        return self.deadlock_time is not None
+
+    def summary(self):
+        text = (f"Version {self.version}: {self.num_philosophers} philosophers, "
+                f"{self.total_meals} meals by virtual t={self.end_time:.3f}")
+        if self.deadlocked:
+            text += f", deadlock reached at virtual t={self.deadlock_time:.3f}"
+        return text
+
+
+class PhilosopherSimulation:
+    """
+    Runs one strategy for `num_philosophers` philosophers on a VirtualClock.
+
+    Stops when `max_meals` meals have been eaten in total, when virtual time passes `until`,
+    or when a circular wait forms (recorded in deadlock_time / deadlock_cycle). At least
+    one of max_meals and until is required.
+    `think_time` / `eat_time` can replace the strategy's own durations: they receive the
+    duration the strategy asked for and return the one to use.
+    `on_state(phil_id, state, now)` is called on every state change.
+    `acquire_delay(phil_id, fork_id)` is asked before every fork acquire and returns None
+    to try right away, or a delay before trying (0 = after everything else due now);
+    the stress tester uses it to force rare interleavings.
+    """
+
+    def __init__(self, version, num_philosophers=5, clock=None, seed=None,
+                 max_meals=None, until=None, think_time=None, eat_time=None,
+                 on_state=None, stop_on_deadlock=True, acquire_delay=None):
+        if version not in STRATEGIES:
+            raise ValueError(f"No simulated strategy for version {version}")
+        if max_meals is None and until is None:
+            # Only a deadlock would stop it, and versions 2 and 3 never deadlock
+            raise ValueError("Set max_meals or until, or the simulation never ends")
+        self.version = version
+        self.num_philosophers = num_philosophers
+        self.clock = clock if clock is not None else VirtualClock()
+        self.rng = random.Random(seed)
+        self.max_meals = max_meals
+        self.until = until
+        self.on_state = on_state
+        self.stop_on_deadlock = stop_on_deadlock
+        self.acquire_delay = acquire_delay
+        if think_time is not None:
+            self.think_time = think_time
+        if eat_time is not None:
+            self.eat_time = eat_time
+
+        self.forks = [SimFork() for _ in range(num_philosophers)]
+        self.states = [STATE_THINKING] * num_philosophers
+        self.meals = [0] * num_philosophers
+        self.total_meals = 0
+        self.waiting_on = [None] * num_philosophers  # fork each philosopher is blocked on
+        self.deadlock_time = None
+        self.deadlock_cycle = None
+
+        strategy = STRATEGIES[version]
+        self.philosophers = [strategy(self, i) for i in range(num_philosophers)]
+
+    @staticmethod
+    def think_time(duration):
+        return duration
+
+    @staticmethod
+    def eat_time(duration):
+        return duration
+
+    def run(self):
+        for i in range(self.num_philosophers):
+            self.clock.call_later(0, self._step, i)
+        self.clock.run(self.until)
+        return SimulationResult(self)
+
+    def _step(self, phil_id):
+        """
+        Advances one philosopher until it sleeps or blocks on a fork.
+        """
+        philosopher = self.philosophers[phil_id]
+        forks = self.forks
+        clock = self.clock
+        acquire_delay = self.acquire_delay
+
+        while True:
+            command, arg = next(philosopher)
+
+            if command == SLEEP:
+                clock.call_later(arg, self._step, phil_id)
+                return
+
+            if command == ACQUIRE:
+                if acquire_delay is not None:
+                    delay = acquire_delay(phil_id, arg)
+                    if delay is not None:
+                        clock.call_later(delay, self._delayed_acquire, phil_id, arg)
+                        return
+                if self._acquire(phil_id, arg):
+                    continue
+                return
+
+            if command == RELEASE:
+                fork = forks[arg]
+                if fork.waiters:
+                    # Hand the fork straight to the first waiter and wake it up
+                    nxt = fork.waiters.popleft()
+                    fork.owner = nxt
+                    self.waiting_on[nxt] = None
+                    clock.call_later(0, self._step, nxt)
+                else:
+                    fork.owner = None
+                continue
+
+            # command == STATE
+            self.states[phil_id] = arg
+            if self.on_state is not None:
+                self.on_state(phil_id, arg, clock.now())
+            if arg == STATE_EATING:
+                self.meals[phil_id] += 1
+                self.total_meals += 1
+                if self.max_meals is not None and self.total_meals >= self.max_meals:
+                    clock.stop()
+
+    def _acquire(self, phil_id, fork_id):
+        """
+        Takes the fork or queues on it. True if the philosopher can keep stepping now.
+        """
+        fork = self.forks[fork_id]
+        clock = self.clock
+        if fork.owner is None:
+            fork.owner = phil_id
+            # Let everyone else due at this instant run before the next step,
+            # the way real threads interleave between the two acquires
+            if clock.has_due():
+                clock.call_later(0, self._step, phil_id)
+                return False
+            return True
+        fork.waiters.append(phil_id)
+        self.waiting_on[phil_id] = fork_id
+        self._check_cycle(phil_id, fork_id)
+        return False
+
+    def _delayed_acquire(self, phil_id, fork_id):
+        if self._acquire(phil_id, fork_id):
+            self._step(phil_id)
+
+    def _check_cycle(self, phil_id, fork_id):
+        """
+        Same chain walk as WaitForGraph: philosopher -> fork -> owner -> fork it waits on ...
+        """
+        cycle = [(phil_id, fork_id)]
+        owner = self.forks[fork_id].owner
+        while owner is not None:
+            if owner == phil_id:
+                if self.deadlock_time is None:
+                    self.deadlock_time = self.clock.now()
+                    self.deadlock_cycle = cycle
+                if self.stop_on_deadlock:
+                    self.clock.stop()
+                return
+            next_fork = self.waiting_on[owner]
+            if next_fork is None:
+                return
+            cycle.append((owner, next_fork))
+            owner = self.forks[next_fork].owner
+
+
+def simulate(version, num_philosophers=5, **kwargs):
+    """
+    Convenience wrapper: build, run and return the SimulationResult.
+    """
+    return PhilosopherSimulation(version, num_philosophers, **kwargs).run()
+
+
+if __name__ == "__main__":
+    for version in STRATEGIES:
+        print(simulate(version, num_philosophers=1000, max_meals=10000, seed=0).summary())
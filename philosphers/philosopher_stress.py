@@ -0,0 +1,199 @@
+"""
+Schedule-exploration stress test for the philosopher strategies.
+
+One threaded run of philosopher_thread_randomized proves nothing: whether it deadlocks
+depends on how the sleeps happen to line up. This runs thousands of seeded executions
+of a strategy on the discrete-event engine (philosopher_sim.py) in a process pool.
+Every schedule is fully determined by its seed: the seed drives the strategy's own
+think/eat times and a perturbation at every fork acquire, which either goes ahead,
+yields to everything else due at that instant, or waits a random delay first.
+Those are the interleavings a real scheduler produces rarely and a stress test wants
+to produce often.
+
+The search stops at the first deadlock and prints the seed; --replay SEED re-runs
+exactly that schedule and shows the cycle.
+
+    python philosphers/philosopher_stress.py --version 2 --schedules 20000 --workers 4
+    python philosphers/philosopher_stress.py --version 2 --replay 1234
+    python philosphers/philosopher_stress.py --version 3 --scaling 1 2 4
+
+Seeds are handed out in batches so the per-schedule cost is not IPC; with no shared
+state between workers, schedules/s per core should stay flat as workers are added
+(--scaling measures it).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from philosopher_sim import PhilosopherSimulation, STRATEGIES
+
+# Perturbation at each acquire point
+YIELD_PROB = 0.2      # yield to everything else due at this instant
+DELAY_PROB = 0.3      # wait up to MAX_DELAY (model seconds) before trying
+MAX_DELAY = 1.0
+
+
+class Perturbation:
+    """
+    acquire_delay hook for PhilosopherSimulation, driven by its own seeded RNG so the
+    strategy's think/eat times are the same with or without it.
+    """
+
+    def __init__(self, seed, yield_prob=YIELD_PROB, delay_prob=DELAY_PROB, max_delay=MAX_DELAY):
+        self.rng = random.Random(seed ^ 0x5EED)
+        self.yield_prob = yield_prob
+        self.delay_prob = delay_prob
+        self.max_delay = max_delay
+
+    def __call__(self, phil_id, fork_id):
+        r = self.rng.random()
+        if r < self.yield_prob:
+            return 0
+        if r < self.yield_prob + self.delay_prob:
+            return self.rng.uniform(0, self.max_delay)
+        return None
+
+
+def run_schedule(version, seed, num_philosophers, until, yield_prob, delay_prob, max_delay):
+    """
+    One seeded execution. Returns the SimulationResult.
+    """
+    sim = PhilosopherSimulation(version, num_philosophers, seed=seed, until=until,
+                                acquire_delay=Perturbation(seed, yield_prob, delay_prob, max_delay))
+    return sim.run()
+
+
+def explore(version, first_seed, count, num_philosophers, until, yield_prob, delay_prob, max_delay):
+    """
+    Worker: runs seeds first_seed .. first_seed + count - 1 and stops at the first
+    deadlock. Returns (schedules run, cpu seconds, deadlock dict or None).
+    """
+    start = time.process_time()
+    for seed in range(first_seed, first_seed + count):
+        result = run_schedule(version, seed, num_philosophers, until, yield_prob, delay_prob, max_delay)
+        if result.deadlocked:
+            found = {"seed": seed, "time": result.deadlock_time, "meals": result.total_meals,
+                     "cycle": result.deadlock_cycle}
+            return seed - first_seed + 1, time.process_time() - start, found
+    return count, time.process_time() - start, None
+
+
+def stress(version, schedules, workers, batch=200, first_seed=0, num_philosophers=5,
+           until=100.0, yield_prob=YIELD_PROB, delay_prob=DELAY_PROB, max_delay=MAX_DELAY):
+    """
+    Explores `schedules` seeds on `workers` processes. Stops handing out seeds once a
+    deadlock is found; the reported one is the lowest deadlocking seed among the
+    batches that ran.
+    """
+    options = (num_philosophers, until, yield_prob, delay_prob, max_delay)
+    next_seed = first_seed
+    end_seed = first_seed + schedules
+    done = 0
+    cpu = 0.0
+    found = None
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        def submit():
+            nonlocal next_seed
+            count = min(batch, end_seed - next_seed)
+            pending.add(pool.submit(explore, version, next_seed, count, *options))
+            next_seed += count
+
+        # Two batches per worker in flight: nobody idles, and a hit stops the search quickly
+        while next_seed < end_seed and len(pending) < 2 * workers:
+            submit()
+        while pending:
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                ran, seconds, hit = future.result()
+                done += ran
+                cpu += seconds
+                if hit is not None and (found is None or hit["seed"] < found["seed"]):
+                    found = hit
+            if found is None:
+                while next_seed < end_seed and len(pending) < 2 * workers:
+                    submit()
+    elapsed = time.perf_counter() - started
+    # More workers than cores only time-slice, count the cores actually used
+    cores = min(workers, os.cpu_count() or 1)
+    return {
+        "version": version,
+        "workers": workers,
+        "schedules": done,
+        "elapsed_s": elapsed,
+        "schedules_per_s": done / elapsed if elapsed else 0.0,
+        "cores": cores,
+        "schedules_per_s_per_core": done / elapsed / cores if elapsed else 0.0,
+        "cpu_s": cpu,
+        "deadlock": found,
+    }
+
+
+def format_deadlock(found):
+    cycle = " -> ".join(f"P{p} waits fork{f}" for p, f in found["cycle"])
+    return (f"Deadlock with seed {found['seed']} at virtual t={found['time']:.3f} "
+            f"after {found['meals']} meals: {cycle}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seeded schedule exploration of the philosopher strategies")
+    parser.add_argument("--version", type=int, default=2, choices=sorted(STRATEGIES))
+    parser.add_argument("--schedules", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=200, help="seeds per task sent to a worker")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--philosophers", type=int, default=5)
+    parser.add_argument("--until", type=float, default=100.0, help="virtual seconds per schedule")
+    parser.add_argument("--yield-prob", type=float, default=YIELD_PROB)
+    parser.add_argument("--delay-prob", type=float, default=DELAY_PROB)
+    parser.add_argument("--max-delay", type=float, default=MAX_DELAY)
+    parser.add_argument("--replay", type=int, default=None, help="re-run one seed and print its outcome")
+    parser.add_argument("--scaling", type=int, nargs="+", default=None,
+                        help="run the same search with each of these worker counts")
+    parser.add_argument("--output", default=None, help="JSON file for the results")
+    args = parser.parse_args(argv)
+    options = dict(num_philosophers=args.philosophers, until=args.until, yield_prob=args.yield_prob,
+                   delay_prob=args.delay_prob, max_delay=args.max_delay)
+
+    if args.replay is not None:
+        result = run_schedule(args.version, args.replay, args.philosophers, args.until,
+                              args.yield_prob, args.delay_prob, args.max_delay)
+        print(result.summary())
+        if result.deadlocked:
+            print(format_deadlock({"seed": args.replay, "time": result.deadlock_time,
+                                   "meals": result.total_meals, "cycle": result.deadlock_cycle}))
+        return 1 if result.deadlocked else 0
+
+    runs = []
+    for workers in args.scaling or [args.workers]:
+        r = stress(args.version, args.schedules, workers, args.batch, args.first_seed, **options)
+        runs.append(r)
+        print(f"version {r['version']}: {r['schedules']} schedules on {workers} workers "
+              f"({r['cores']} cores) in {r['elapsed_s']:.2f} s -> {r['schedules_per_s']:.0f}/s, "
+              f"{r['schedules_per_s_per_core']:.0f}/s per core")
+        if r["deadlock"]:
+            print(format_deadlock(r["deadlock"]))
+            print(f"Reproduce: python {sys.argv[0]} --version {args.version} --replay {r['deadlock']['seed']}"
+                  f" --philosophers {args.philosophers} --until {args.until} --yield-prob {args.yield_prob}"
+                  f" --delay-prob {args.delay_prob} --max-delay {args.max_delay}")
+    if len(runs) > 1:
+        base = runs[0]["schedules_per_s_per_core"]
+        for r in runs:
+            print(f"{r['workers']:>3} workers: per-core efficiency "
+                  f"{100.0 * r['schedules_per_s_per_core'] / base if base else 0.0:.0f}%")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"benchmark": "philosopher_stress", "options": options, "runs": runs}, f, indent=2)
+    return 1 if any(r["deadlock"] for r in runs) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
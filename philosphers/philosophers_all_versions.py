@@ -1,29 +1,134 @@
-import tkinter as tk
+import itertools
 import threading
-import time
+import queue
 import random
 import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from deadlock_tools.wait_for_graph import WaitForGraph, TrackedLock, describe_cycle
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.fair_lock import FairLock
+from deadlock_tools.frame_queue import FrameCoalescer
+from deadlock_tools.virtual_clock import VirtualClock, WallClock
+from deadlock_tools.metrics import exported, unexported, labelled, wait_graph_metrics, philosopher_metrics
+from philosopher_sim import simulate, STRATEGIES as SIMULATED_VERSIONS
 
 NUM_PHILOSOPHERS = 5
 
+# Labels each demo's metrics, so runs sharing a process export distinct series
+_run_ids = itertools.count(1)
+
 # Philosopher states
 STATE_THINKING = "THINKING"
 STATE_HUNGRY = "HUNGRY"
 STATE_EATING = "EATING"
 
+# GUI repaints per second (state changes in between are coalesced)
+FPS = 30
+
+def _same_duration(duration):
+    return duration
+
+
 class DiningPhilosophersDemo:
-    def __init__(self, version):
-        # Create the Tkinter window and canvas
+    def __init__(self, version, headless=False, clock=None, num_philosophers=NUM_PHILOSOPHERS,
+                 max_meals=None, until=None, seed=None, fps=FPS,
+                 think_time=None, eat_time=None, on_state=None, fair_forks=False,
+                 record=None, record_interval=0.25):
+        """
+        headless=True skips the window. With a VirtualClock (the default for headless runs
+        of versions 1-3, the ones philosopher_sim.py implements) the same strategy runs on
+        the discrete-event engine and the outcome is stored in self.result; max_meals,
+        until and seed only apply there, and at least one of max_meals and until must be
+        set. With a real clock such as WallClock(scale=0.001), the default for versions
+        4-7, the philosopher threads are started and run until stop().
+
+        think_time / eat_time receive the duration the strategy asks for and return the one
+        to use. on_state(phil_id, state, now) is called on every state change.
+        `fps` is the GUI repaint rate. fair_forks=True hands each fork to its waiters in
+        FIFO order (FairLock) instead of letting a neighbour grab it again first.
+        record="run.gif" (or a frame directory) draws the table offscreen with Pillow, at
+        most one frame per `record_interval` model seconds (threads only, see
+        deadlock_tools/offscreen.py); it is written by stop() or when the window closes.
+        """
+        self.version = version
+        self.num_philosophers = num_philosophers
+        if clock is None:
+            clock = VirtualClock() if headless and version in SIMULATED_VERSIONS else WallClock()
+        elif isinstance(clock, VirtualClock) and version not in SIMULATED_VERSIONS:
+            raise ValueError(f"Version {version} only runs as threads, use a WallClock "
+                             f"(simulated versions: {sorted(SIMULATED_VERSIONS)})")
+        self.clock = clock
+        self.think_time = think_time or _same_duration
+        self.eat_time = eat_time or _same_duration
+        self.on_state = on_state
+
+        if headless and isinstance(clock, VirtualClock):
+            self.result = simulate(version, num_philosophers, clock=clock, seed=seed,
+                                   max_meals=max_meals, until=until, think_time=think_time,
+                                   eat_time=eat_time, on_state=on_state)
+            return
+
+        # Data structures
+        # Forks report to a wait-for graph, so a circular wait is caught when it forms
+        self.wait_graph = WaitForGraph(on_deadlock=self.on_deadlock)
+        self.forks = [TrackedLock(self.wait_graph, f"fork{i}",
+                                  inner=recorded(f"fork{i}", inner=profiled(
+                                      f"fork{i}", inner=FairLock() if fair_forks else None)))
+                      for i in range(num_philosophers)]
+        self.states = [STATE_THINKING for _ in range(num_philosophers)]
+        self.meals = [0] * num_philosophers
+        self.fork_locked = [False] * num_philosophers
+        self.stop_event = threading.Event()
+        # Served over HTTP while the run goes on, when DEADLOCK_METRICS is set
+        self.run_id = next(_run_ids)
+        self._metrics = [labelled(wait_graph_metrics(self.wait_graph), run=str(self.run_id)),
+                         labelled(philosopher_metrics(self), run=str(self.run_id))]
+
+        # Version 4: the waiter lets at most N-1 philosophers reach for forks at once
+        self.waiter = threading.Semaphore(max(1, num_philosophers - 1))
+        # Version 5: one inbox per philosopher for Chandy-Misra fork/request messages
+        self.inboxes = [queue.Queue() for _ in range(num_philosophers)]
+        # Version 6: one condition per philosopher, all sharing the table lock
+        self.table_lock = threading.Lock()
+        self.can_eat = [threading.Condition(self.table_lock) for _ in range(num_philosophers)]
+        # Version 7: banker's algorithm, forks are only handed out while the table stays safe
+        # (NumPy is only imported for this version)
+        self.banker = None
+        if version == 7:
+            from deadlock_tools.bankers import BankersAllocator
+            from deadlock_tools.metrics import bankers_metrics
+            self.banker = BankersAllocator([1] * num_philosophers, capacity=num_philosophers,
+                                           names=[f"fork{i}" for i in range(num_philosophers)])
+            self._metrics.append(labelled(bankers_metrics(self.banker), run=str(self.run_id)))
+        exported(*self._metrics)
+
+        # Offscreen recording: frames are drawn and encoded on the renderer's thread
+        self.recorder = None
+        if record:
+            from deadlock_tools.offscreen import OffscreenRenderer, TableScene
+            self.recorder = OffscreenRenderer(TableScene(num_philosophers), record)
+            self.record_interval = record_interval
+            self._next_frame = 0.0
+
+        if headless:
+            # Threads only, nobody to repaint for
+            self.window = None
+            self.frames = None
+            self._start_threads()
+            return
+
+        # Create the Tkinter window and canvas (tkinter is only imported for GUI runs)
+        import tkinter as tk
         self.window = tk.Tk()
         self.window.title(f"Dining Philosophers Demo - Version {version}")
 
         self.canvas = tk.Canvas(self.window, width=600, height=600, bg="white")
         self.canvas.pack()
 
-        # Data structures
-        self.forks = [threading.Lock() for _ in range(NUM_PHILOSOPHERS)]
-        self.states = [STATE_THINKING for _ in range(NUM_PHILOSOPHERS)]
-        
         # Each philosopher has:
         #  - A circle on canvas for visual
         #  - A text label inside that circle
@@ -36,16 +141,11 @@ class DiningPhilosophersDemo:
         # Initialize the geometry on canvas
         self._create_table_graphics()
 
-        # Create and start a thread for each philosopher
-        for i in range(NUM_PHILOSOPHERS):
-            if version == 1:
-                t = threading.Thread(target=self.philosopher_thread_deadlock, args=(i,))
-            elif version == 2:
-                t = threading.Thread(target=self.philosopher_thread_randomized, args=(i,))
-            else:
-                t = threading.Thread(target=self.philosopher_thread_prevention, args=(i,))
-            t.daemon = True  # Daemon so program can exit if main window closes
-            t.start()
+        # Worker threads only mark philosophers/forks dirty, the main loop repaints per frame
+        self.frames = FrameCoalescer(self.window, self._apply_update, fps)
+        self.frames.start()
+
+        self._start_threads()
 
         # If version 1, stop after 5 seconds
         if version == 1:
@@ -53,6 +153,42 @@ class DiningPhilosophersDemo:
 
         # Start the Tkinter main loop
         self.window.mainloop()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _start_threads(self):
+        """
+        Create and start a thread for each philosopher.
+        """
+        if self.version == 1:
+            target = self.philosopher_thread_deadlock
+        elif self.version == 2:
+            target = self.philosopher_thread_randomized
+        elif self.version == 4:
+            target = self.philosopher_thread_waiter
+        elif self.version == 5:
+            target = self.philosopher_thread_chandy_misra
+        elif self.version == 6:
+            target = self.philosopher_thread_tanenbaum
+        elif self.version == 7:
+            target = self.philosopher_thread_bankers
+        else:
+            target = self.philosopher_thread_prevention
+
+        for i in range(self.num_philosophers):
+            t = threading.Thread(target=target, args=(i,))
+            t.daemon = True  # Daemon so program can exit if main window closes
+            t.start()
+
+    def stop(self):
+        """
+        Asks the philosopher threads to leave their loop (deadlocked ones stay blocked)
+        and finishes the recording, if any.
+        """
+        self.stop_event.set()
+        unexported(*self._metrics)
+        if self.recorder is not None:
+            self.recorder.close()
 
     def _create_table_graphics(self):
         """
@@ -67,8 +203,8 @@ class DiningPhilosophersDemo:
         circle_r = 40      # radius of each philosopher’s circle
 
         # Place 5 philosophers evenly around the table
-        for i in range(NUM_PHILOSOPHERS):
-            angle = (2 * math.pi / NUM_PHILOSOPHERS) * i
+        for i in range(self.num_philosophers):
+            angle = (2 * math.pi / self.num_philosophers) * i
             # Philosopher's center
             px = center_x + radius_phil * math.sin(angle)
             py = center_y - radius_phil * math.cos(angle)
@@ -86,9 +222,9 @@ class DiningPhilosophersDemo:
 
         # Optionally, draw 5 forks as small circles halfway between philosophers
         fork_r = 10
-        for i in range(NUM_PHILOSOPHERS):
+        for i in range(self.num_philosophers):
             # Fork is between philosopher i and (i+1)
-            angle_f = (2 * math.pi / NUM_PHILOSOPHERS) * (i + 0.5)
+            angle_f = (2 * math.pi / self.num_philosophers) * (i + 0.5)
             fx = center_x + (radius_phil * 0.7) * math.sin(angle_f)
             fy = center_y - (radius_phil * 0.7) * math.cos(angle_f)
             fork_id = self.canvas.create_oval(
@@ -102,12 +238,12 @@ class DiningPhilosophersDemo:
         Demonstrates a deadlock-prone implementation.
         """
         left_fork = phil_id
-        right_fork = (phil_id + 1) % NUM_PHILOSOPHERS
+        right_fork = (phil_id + 1) % self.num_philosophers
 
-        while True:
+        while not self.stop_event.is_set():
             # 1. THINK
             self.update_state(phil_id, STATE_THINKING)
-            time.sleep(2)  # Fixed thinking time
+            self.clock.sleep(self.think_time(2))  # Fixed thinking time
 
             # 2. Become HUNGRY
             self.update_state(phil_id, STATE_HUNGRY)
@@ -121,7 +257,7 @@ class DiningPhilosophersDemo:
 
             # 4. EAT
             self.update_state(phil_id, STATE_EATING)
-            time.sleep(2)  # Fixed eating time
+            self.clock.sleep(self.eat_time(2))  # Fixed eating time
 
             # 5. Put down forks
             self.forks[left_fork].release()
@@ -135,12 +271,12 @@ class DiningPhilosophersDemo:
         Uses randomness to reduce the likelihood of deadlock.
         """
         left_fork = phil_id
-        right_fork = (phil_id + 1) % NUM_PHILOSOPHERS
+        right_fork = (phil_id + 1) % self.num_philosophers
 
-        while True:
+        while not self.stop_event.is_set():
             # 1. THINK
             self.update_state(phil_id, STATE_THINKING)
-            time.sleep(random.uniform(1, 3))
+            self.clock.sleep(self.think_time(random.uniform(1, 3)))
 
             # 2. Become HUNGRY
             self.update_state(phil_id, STATE_HUNGRY)
@@ -154,7 +290,7 @@ class DiningPhilosophersDemo:
 
             # 4. EAT
             self.update_state(phil_id, STATE_EATING)
-            time.sleep(random.uniform(1, 3))
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))
 
             # 5. Put down forks
             self.forks[left_fork].release()
@@ -168,12 +304,12 @@ class DiningPhilosophersDemo:
         Implements a deadlock prevention mechanism by enforcing an order.
         """
         left_fork = phil_id
-        right_fork = (phil_id + 1) % NUM_PHILOSOPHERS
+        right_fork = (phil_id + 1) % self.num_philosophers
 
-        while True:
+        while not self.stop_event.is_set():
             # 1. THINK
             self.update_state(phil_id, STATE_THINKING)
-            time.sleep(random.uniform(1, 3))
+            self.clock.sleep(self.think_time(random.uniform(1, 3)))
 
             # 2. Become HUNGRY
             self.update_state(phil_id, STATE_HUNGRY)
@@ -190,7 +326,7 @@ class DiningPhilosophersDemo:
 
             # 4. EAT
             self.update_state(phil_id, STATE_EATING)
-            time.sleep(random.uniform(1, 3))
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))
 
             # 5. Put down forks
             self.forks[first_fork].release()
@@ -199,41 +335,294 @@ class DiningPhilosophersDemo:
             self.forks[second_fork].release()
             self.update_fork_locked(second_fork, locked=False)
 
-    def update_state(self, phil_id, new_state):
+    def philosopher_thread_waiter(self, phil_id):
         """
-        Thread-safe update of philosopher's state (and color).
+        Waiter/arbitrator: a semaphore with N-1 seats guards picking up forks.
+        A circular wait needs all N philosophers holding one fork each, which the waiter
+        never allows. The seat is given back as soon as both forks are held, so neighbours
+        on the other side of the table are not held up while this philosopher eats.
         """
-        self.states[phil_id] = new_state
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % self.num_philosophers
+
+        while not self.stop_event.is_set():
+            # 1. THINK
+            self.update_state(phil_id, STATE_THINKING)
+            self.clock.sleep(self.think_time(random.uniform(1, 3)))
+
+            # 2. Become HUNGRY and ask the waiter for a seat
+            self.update_state(phil_id, STATE_HUNGRY)
+            self.waiter.acquire()
+
+            # 3. Pick up left fork, then right fork
+            self.forks[left_fork].acquire()
+            self.update_fork_locked(left_fork, locked=True)
+
+            self.forks[right_fork].acquire()
+            self.update_fork_locked(right_fork, locked=True)
+            self.waiter.release()
+
+            # 4. EAT
+            self.update_state(phil_id, STATE_EATING)
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))
+
+            # 5. Put down forks
+            self.forks[left_fork].release()
+            self.update_fork_locked(left_fork, locked=False)
+
+            self.forks[right_fork].release()
+            self.update_fork_locked(right_fork, locked=False)
+
+    def philosopher_thread_chandy_misra(self, phil_id):
+        """
+        Chandy-Misra: forks are tokens passed between neighbours with messages.
+        Each fork starts dirty at the lower-numbered neighbour. A dirty fork is handed
+        over (cleaned) when asked for, a clean one is kept until its holder has eaten.
+        This keeps the "who goes first" graph acyclic, so there is no deadlock, and a
+        philosopher who just ate always yields to a hungry neighbour.
+        """
+        n = self.num_philosophers
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % n
+        inbox = self.inboxes[phil_id]
+
+        def neighbour(fork):
+            # Fork f lies between philosophers f-1 and f
+            return (fork - 1) % n if fork == phil_id else fork
+
+        # Local fork bookkeeping, only ever touched by this thread
+        holding = {}
+        dirty = {}
+        requested = {}  # the neighbour asked for a fork we could not give yet
+        for fork in (left_fork, right_fork):
+            holding[fork] = phil_id == min(fork, (fork - 1) % n)
+            dirty[fork] = True
+            requested[fork] = False
+
+        def give(fork):
+            holding[fork] = False
+            requested[fork] = False
+            self.inboxes[neighbour(fork)].put(("fork", fork))
+
+        def handle(message, hungry):
+            kind, fork = message
+            if kind == "fork":
+                holding[fork] = True
+                dirty[fork] = False
+            elif holding[fork] and dirty[fork]:
+                give(fork)
+                if hungry:
+                    # We still need it: ask for it back straight away
+                    self.inboxes[neighbour(fork)].put(("request", fork))
+            else:
+                requested[fork] = True
+
+        while not self.stop_event.is_set():
+            # 1. THINK (answering requests meanwhile)
+            self.update_state(phil_id, STATE_THINKING)
+            deadline = self.clock.now() + self.think_time(random.uniform(1, 3))
+            while not self.stop_event.is_set():
+                remaining = deadline - self.clock.now()
+                if remaining <= 0:
+                    break
+                try:
+                    handle(inbox.get(timeout=self.clock.to_real(remaining)), hungry=False)
+                except queue.Empty:
+                    break
+
+            # 2. Become HUNGRY and request missing forks
+            self.update_state(phil_id, STATE_HUNGRY)
+            for fork in (left_fork, right_fork):
+                if not holding[fork]:
+                    self.inboxes[neighbour(fork)].put(("request", fork))
+
+            # 3. Wait for both forks
+            while not (holding[left_fork] and holding[right_fork]):
+                if self.stop_event.is_set():
+                    return
+                try:
+                    handle(inbox.get(timeout=0.1), hungry=True)
+                except queue.Empty:
+                    pass
+            self.update_fork_locked(left_fork, locked=True)
+            self.update_fork_locked(right_fork, locked=True)
 
-        # Because Tkinter isn't thread-safe, schedule on main thread:
-        def _update():
-            circle_id = self.phil_circles[phil_id]
-            label_id = self.phil_labels[phil_id]
+            # 4. EAT (requests wait in the inbox)
+            self.update_state(phil_id, STATE_EATING)
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))
 
-            if new_state == STATE_THINKING:
-                color = "white"
-            elif new_state == STATE_HUNGRY:
-                color = "yellow"
-            else:  # EATING
-                color = "lightgreen"
+            # 5. Forks become dirty; hand over the ones a neighbour asked for
+            for fork in (left_fork, right_fork):
+                dirty[fork] = True
+                self.update_fork_locked(fork, locked=False)
+                if requested[fork]:
+                    give(fork)
+
+    def philosopher_thread_tanenbaum(self, phil_id):
+        """
+        Tanenbaum's solution: no fork locks at all. self.states is guarded by one table
+        lock and a philosopher only starts EATING when neither neighbour is eating.
+        A finishing philosopher checks both neighbours and wakes the ones that can eat now.
+        """
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % self.num_philosophers
 
-            self.canvas.itemconfig(circle_id, fill=color)
-            self.canvas.itemconfig(label_id, text=f"P{phil_id}\n{new_state}")
+        while not self.stop_event.is_set():
+            # 1. THINK
+            self.update_state(phil_id, STATE_THINKING)
+            self.clock.sleep(self.think_time(random.uniform(1, 3)))
+
+            # 2. Become HUNGRY and wait until both neighbours are not eating
+            with self.table_lock:
+                self.update_state(phil_id, STATE_HUNGRY)
+                self._test_can_eat(phil_id)
+                while self.states[phil_id] != STATE_EATING:
+                    if self.stop_event.is_set():
+                        return
+                    self.can_eat[phil_id].wait(timeout=0.1)
+            self.update_fork_locked(left_fork, locked=True)
+            self.update_fork_locked(right_fork, locked=True)
 
-        self.window.after(0, _update)
+            # 3. EAT
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))
+
+            # 4. Done: let the neighbours try
+            self.update_fork_locked(left_fork, locked=False)
+            self.update_fork_locked(right_fork, locked=False)
+            with self.table_lock:
+                self.update_state(phil_id, STATE_THINKING)
+                self._test_can_eat((phil_id - 1) % self.num_philosophers)
+                self._test_can_eat((phil_id + 1) % self.num_philosophers)
+
+    def philosopher_thread_bankers(self, phil_id):
+        """
+        Deadlock avoidance: every philosopher declares it may hold both of its forks and
+        asks the banker for them one at a time, left first like version 1. The banker
+        refuses a fork whenever granting it could leave nobody able to finish, so the
+        last left fork of a full circle is held back instead of the table deadlocking.
+        """
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % self.num_philosophers
+        client = self.banker.register({left_fork: 1, right_fork: 1})
+
+        while not self.stop_event.is_set():
+            # 1. THINK
+            self.update_state(phil_id, STATE_THINKING)
+            self.clock.sleep(self.think_time(random.uniform(1, 3)))
+
+            # 2. Become HUNGRY
+            self.update_state(phil_id, STATE_HUNGRY)
+
+            # 3. Ask the banker for each fork; once granted, the fork lock is free
+            for fork in (left_fork, right_fork):
+                while not self.banker.request(client, fork, timeout=0.1):
+                    if self.stop_event.is_set():
+                        return
+                self.forks[fork].acquire()
+                self.update_fork_locked(fork, locked=True)
+
+            # 4. EAT
+            self.update_state(phil_id, STATE_EATING)
+            self.clock.sleep(self.eat_time(random.uniform(1, 3)))
+
+            # 5. Put down forks, then hand them back to the banker
+            for fork in (left_fork, right_fork):
+                self.forks[fork].release()
+                self.update_fork_locked(fork, locked=False)
+                self.banker.release(client, fork)
+
+    def _test_can_eat(self, phil_id):
+        """
+        Tanenbaum's test(): must be called with self.table_lock held.
+        """
+        n = self.num_philosophers
+        if (self.states[phil_id] == STATE_HUNGRY
+                and self.states[(phil_id - 1) % n] != STATE_EATING
+                and self.states[(phil_id + 1) % n] != STATE_EATING):
+            self.update_state(phil_id, STATE_EATING)
+            self.can_eat[phil_id].notify()
+
+    def on_deadlock(self, cycle):
+        """
+        Called by the philosopher that closes the circular wait.
+        """
+        print("[Detector] Deadlock detected:", describe_cycle(cycle))
+
+    def update_state(self, phil_id, new_state):
+        """
+        Thread-safe update of philosopher's state (and color).
+        Only marks it dirty; the main loop repaints it on the next frame.
+        """
+        self.states[phil_id] = new_state
+        if new_state == STATE_EATING:
+            self.meals[phil_id] += 1
+        if self.on_state is not None:
+            self.on_state(phil_id, new_state, self.clock.now())
+        if self.frames is not None:
+            self.frames.put(("phil", phil_id), new_state)
+        if self.recorder is not None:
+            self._record()
 
     def update_fork_locked(self, fork_id, locked):
         """
         Thread-safe update of a fork's color if locked/unlocked.
         """
-        def _update():
-            fork_circle = self.fork_circles[fork_id]
-            color = "red" if locked else "gray"
-            self.canvas.itemconfig(fork_circle, fill=color)
+        self.fork_locked[fork_id] = locked
+        if self.frames is not None:
+            self.frames.put(("fork", fork_id), locked)
+        if self.recorder is not None:
+            self._record()
 
-        self.window.after(0, _update)
+    def _record(self):
+        """
+        Hands a snapshot to the offscreen renderer, at most once per record_interval.
+        """
+        now = self.clock.now()
+        if now >= self._next_frame:
+            self._next_frame = now + self.record_interval
+            self.recorder.submit((tuple(self.states), tuple(self.fork_locked)))
+
+    def _apply_update(self, key, value):
+        """
+        Runs on the Tk main thread with the latest value of a philosopher or fork.
+        """
+        kind, index = key
+        if kind == "fork":
+            color = "red" if value else "gray"
+            self.canvas.itemconfig(self.fork_circles[index], fill=color)
+            return
+
+        if value == STATE_THINKING:
+            color = "white"
+        elif value == STATE_HUNGRY:
+            color = "yellow"
+        else:  # EATING
+            color = "lightgreen"
+
+        self.canvas.itemconfig(self.phil_circles[index], fill=color)
+        self.canvas.itemconfig(self.phil_labels[index], text=f"P{index}\n{value}")
 
 if __name__ == "__main__":
+    if "--headless" in sys.argv:
+        # No display needed: every version runs on a virtual clock in a fraction of a second
+        for version in (1, 2, 3):
+            demo = DiningPhilosophersDemo(version, headless=True, num_philosophers=1000,
+                                          max_meals=10000, seed=0)
+            print(demo.result.summary())
+        sys.exit(0)
+
+    if "--record" in sys.argv:
+        # Threads on a fast clock, drawn offscreen: no display needed
+        path = sys.argv[sys.argv.index("--record") + 1]
+        version = int(sys.argv[sys.argv.index("--version") + 1]) if "--version" in sys.argv else 3
+        clock = WallClock(scale=0.01)
+        demo = DiningPhilosophersDemo(version, headless=True, clock=clock, record=path)
+        clock.sleep(60)   # model seconds
+        demo.stop()
+        print(f"{demo.recorder.frames} frames written to {path} "
+              f"({demo.recorder.dropped} dropped, {demo.recorder.skipped} past the GIF limit)")
+        sys.exit(0)
+
     print("Running Version 1: Deadlock-Prone Implementation")
     DiningPhilosophersDemo(1)
 
@@ -242,3 +631,15 @@ if __name__ == "__main__":
 
     print("Running Version 3: Deadlock Prevention Implementation")
     DiningPhilosophersDemo(3)
+
+    print("Running Version 4: Waiter (Semaphore) Implementation")
+    DiningPhilosophersDemo(4)
+
+    print("Running Version 5: Chandy-Misra Implementation")
+    DiningPhilosophersDemo(5)
+
+    print("Running Version 6: Tanenbaum (State-Based) Implementation")
+    DiningPhilosophersDemo(6)
+
+    print("Running Version 7: Banker's Algorithm (Avoidance) Implementation")
+    DiningPhilosophersDemo(7)
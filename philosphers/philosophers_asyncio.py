@@ -0,0 +1,250 @@
+"""
+asyncio version of the first three strategies in philosophers_all_versions.py.
+
+DiningPhilosophersDemo needs one OS thread per philosopher, which stops being practical
+after a few thousand. Here every philosopher is a task in a single event loop, forks
+are asyncio.Lock and thinking/eating is asyncio.sleep, so a philosopher costs a
+coroutine frame instead of a thread stack and 100k diners fit in one process.
+
+`scale` shrinks every sleep like WallClock: with scale=0.001 the demos' seconds become
+milliseconds while states and results stay in model seconds.
+
+A circular wait is caught the same way as in philosopher_sim.py: every blocking
+acquire walks philosopher -> fork -> owner -> fork it waits on ... (no locking needed,
+all tasks run on one thread).
+
+    python philosophers_asyncio.py --version 2 --n 100000 --duration 20 --scale 0.01
+"""
+import argparse
+import asyncio
+import random
+import time
+
+# Philosopher states (same values as the threaded version)
+STATE_THINKING = "THINKING"
+STATE_HUNGRY = "HUNGRY"
+STATE_EATING = "EATING"
+
+NUM_PHILOSOPHERS = 5
+
+
+def _same_duration(duration):
+    return duration
+
+
+class AsyncDiningPhilosophers:
+    def __init__(self, version, num_philosophers=NUM_PHILOSOPHERS, scale=1.0, seed=None,
+                 think_time=None, eat_time=None, on_state=None, stop_on_deadlock=True):
+        """
+        think_time / eat_time / on_state work as in DiningPhilosophersDemo.
+        Nothing runs until run() is awaited.
+        """
+        if version not in self.STRATEGIES:
+            raise ValueError(f"No asyncio strategy for version {version}")
+        self.version = version
+        self.num_philosophers = num_philosophers
+        self.scale = scale
+        self.rng = random.Random(seed)
+        self.think_time = think_time or _same_duration
+        self.eat_time = eat_time or _same_duration
+        self.on_state = on_state
+        self.stop_on_deadlock = stop_on_deadlock
+
+        self.forks = [asyncio.Lock() for _ in range(num_philosophers)]
+        self.owners = [None] * num_philosophers      # fork -> philosopher holding it
+        self.waiting_on = [None] * num_philosophers  # philosopher -> fork it waits for
+        self.states = [STATE_THINKING] * num_philosophers
+        self.meals = [0] * num_philosophers
+        self.total_meals = 0
+        self.max_meals = None
+        self.deadlock_time = None
+        self.deadlock_cycle = None
+        self._start = None
+        self._done = None
+
+    def now(self):
+        """
+        Model seconds since run() started.
+        """
+        return (time.perf_counter() - self._start) / self.scale
+
+    def sleep(self, seconds):
+        return asyncio.sleep(seconds * self.scale)
+
+    async def run(self, until=None, max_meals=None):
+        """
+        Runs every philosopher until `until` model seconds have passed, `max_meals`
+        meals were eaten, or (with stop_on_deadlock) a circular wait formed.
+        Returns the model time reached.
+        """
+        self.max_meals = max_meals
+        self._done = asyncio.Event()
+        self._start = time.perf_counter()
+        strategy = self.STRATEGIES[self.version]
+        tasks = [asyncio.create_task(strategy(self, i)) for i in range(self.num_philosophers)]
+        try:
+            await asyncio.wait_for(self._done.wait(), None if until is None else until * self.scale)
+        except asyncio.TimeoutError:
+            pass
+        end = self.now()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        return end
+
+    ###########################################################################
+    # Strategies (same steps as the philosopher_thread_* methods)
+    ###########################################################################
+    async def philosopher_deadlock(self, phil_id):
+        """
+        Deadlock-prone: fixed think/eat times, left fork then right fork.
+        """
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % self.num_philosophers
+
+        while True:
+            self.update_state(phil_id, STATE_THINKING)
+            await self.sleep(self.think_time(2))
+
+            self.update_state(phil_id, STATE_HUNGRY)
+            await self.acquire(phil_id, left_fork)
+            await self.acquire(phil_id, right_fork)
+
+            self.update_state(phil_id, STATE_EATING)
+            await self.sleep(self.eat_time(2))
+
+            self.release(left_fork)
+            self.release(right_fork)
+
+    async def philosopher_randomized(self, phil_id):
+        """
+        Random think/eat times, left fork then right fork.
+        """
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % self.num_philosophers
+
+        while True:
+            self.update_state(phil_id, STATE_THINKING)
+            await self.sleep(self.think_time(self.rng.uniform(1, 3)))
+
+            self.update_state(phil_id, STATE_HUNGRY)
+            await self.acquire(phil_id, left_fork)
+            await self.acquire(phil_id, right_fork)
+
+            self.update_state(phil_id, STATE_EATING)
+            await self.sleep(self.eat_time(self.rng.uniform(1, 3)))
+
+            self.release(left_fork)
+            self.release(right_fork)
+
+    async def philosopher_prevention(self, phil_id):
+        """
+        Random think/eat times, forks taken in global (min, max) order.
+        """
+        left_fork = phil_id
+        right_fork = (phil_id + 1) % self.num_philosophers
+        first_fork = min(left_fork, right_fork)
+        second_fork = max(left_fork, right_fork)
+
+        while True:
+            self.update_state(phil_id, STATE_THINKING)
+            await self.sleep(self.think_time(self.rng.uniform(1, 3)))
+
+            self.update_state(phil_id, STATE_HUNGRY)
+            await self.acquire(phil_id, first_fork)
+            await self.acquire(phil_id, second_fork)
+
+            self.update_state(phil_id, STATE_EATING)
+            await self.sleep(self.eat_time(self.rng.uniform(1, 3)))
+
+            self.release(first_fork)
+            self.release(second_fork)
+
+    STRATEGIES = {
+        1: philosopher_deadlock,
+        2: philosopher_randomized,
+        3: philosopher_prevention,
+    }
+
+    ###########################################################################
+    # Forks and bookkeeping
+    ###########################################################################
+    async def acquire(self, phil_id, fork_id):
+        fork = self.forks[fork_id]
+        # Set even when the lock looks free: a released fork may already be promised
+        # to a woken waiter, and then this acquire blocks too
+        self.waiting_on[phil_id] = fork_id
+        if fork.locked():
+            self._check_cycle(phil_id, fork_id)
+        await fork.acquire()
+        self.waiting_on[phil_id] = None
+        self.owners[fork_id] = phil_id
+        # A free asyncio.Lock is taken without suspending; let the other ready tasks run
+        # first, the way real threads interleave between the two acquires
+        await asyncio.sleep(0)
+
+    def release(self, fork_id):
+        self.owners[fork_id] = None
+        self.forks[fork_id].release()
+
+    def update_state(self, phil_id, new_state):
+        self.states[phil_id] = new_state
+        if new_state == STATE_EATING:
+            self.meals[phil_id] += 1
+            self.total_meals += 1
+            if self.max_meals is not None and self.total_meals >= self.max_meals:
+                self._done.set()
+        if self.on_state is not None:
+            self.on_state(phil_id, new_state, self.now())
+
+    def _check_cycle(self, phil_id, fork_id):
+        cycle = [(phil_id, fork_id)]
+        owner = self.owners[fork_id]
+        seen = 0
+        while owner is not None and seen <= self.num_philosophers:
+            if owner == phil_id:
+                if self.deadlock_time is None:
+                    self.deadlock_time = self.now()
+                    self.deadlock_cycle = cycle
+                if self.stop_on_deadlock:
+                    self._done.set()
+                return
+            next_fork = self.waiting_on[owner]
+            if next_fork is None:
+                return
+            cycle.append((owner, next_fork))
+            owner = self.owners[next_fork]
+            seen += 1
+
+    @property
+    def deadlocked(self):
+        return self.deadlock_time is not None
+
+
+def run(version, num_philosophers=NUM_PHILOSOPHERS, until=None, max_meals=None, **kwargs):
+    """
+    Convenience wrapper: one event loop, returns the finished AsyncDiningPhilosophers.
+    """
+    demo = AsyncDiningPhilosophers(version, num_philosophers, **kwargs)
+    demo.end_time = asyncio.run(demo.run(until, max_meals))
+    return demo
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dining philosophers on one asyncio event loop")
+    parser.add_argument("--version", type=int, default=2, choices=sorted(AsyncDiningPhilosophers.STRATEGIES))
+    parser.add_argument("--n", type=int, default=NUM_PHILOSOPHERS)
+    parser.add_argument("--duration", type=float, default=20.0, help="model seconds")
+    parser.add_argument("--scale", type=float, default=0.01, help="wall seconds per model second")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    demo = run(args.version, args.n, until=args.duration, scale=args.scale, seed=args.seed)
+    wall = time.perf_counter() - started
+    print(f"Version {args.version}: {args.n} philosophers, {demo.total_meals} meals by model "
+          f"t={demo.end_time:.2f} ({wall:.2f} s wall, {demo.total_meals / wall:.0f} meals/s)")
+    if demo.deadlocked:
+        cycle = " -> ".join(f"P{p} waits fork{f}" for p, f in demo.deadlock_cycle[:10])
+        print(f"Deadlock at model t={demo.deadlock_time:.3f}: {cycle}"
+              + (" ..." if len(demo.deadlock_cycle) > 10 else ""))
@@ -0,0 +1,325 @@
+"""
+Philosophers as separate processes, so eating can use a core each instead of taking
+turns on the GIL.
+
+Forks are multiprocessing.Lock. Everything the monitor needs lives in shared memory
+(multiprocessing.RawArray, no lock of its own since each slot has a single writer):
+    states[i]      0 thinking, 1 hungry, 2 eating
+    meals[i]       meals eaten by philosopher i
+    waiting_on[i]  fork philosopher i is blocked on, -1 if none
+    owners[f]      philosopher holding fork f, -1 if free
+The parent reads those through memoryviews of the same pages the philosophers write,
+nothing is copied or sent. A circular wait is found by the usual chain walk
+(philosopher -> fork -> owner -> ...); since the arrays change under the reader, a
+cycle only counts once two scans in a row see it with nobody in it eating meanwhile.
+
+engine="threads" runs the same loop in threads of this process with threading locks,
+which is what benchmarks/multiprocess_scaling.py compares against.
+
+    python philosophers_multiprocess.py --version 3 --n 8 --eat-work 200000 --duration 10
+    python philosophers_multiprocess.py --version 1 --gui
+"""
+import argparse
+import multiprocessing
+import random
+import threading
+import time
+
+STATE_THINKING = 0
+STATE_HUNGRY = 1
+STATE_EATING = 2
+STATE_NAMES = ("THINKING", "HUNGRY", "EATING")
+STATE_COLORS = ("white", "yellow", "green")
+
+NUM_PHILOSOPHERS = 5
+FPS = 30
+
+
+def spin(iterations):
+    """
+    CPU-bound "eating".
+    """
+    x = 0
+    for i in range(iterations):
+        x += i
+    return x
+
+
+class SharedTable:
+    """
+    The shared arrays and zero-copy views on them. Picklable to child processes
+    (the RawArrays travel, the views are rebuilt).
+    """
+
+    def __init__(self, num_philosophers, ctx=None):
+        ctx = ctx or multiprocessing
+        self.num_philosophers = num_philosophers
+        self._states = ctx.RawArray("i", num_philosophers)
+        self._meals = ctx.RawArray("q", num_philosophers)
+        self._waiting_on = ctx.RawArray("i", [-1] * num_philosophers)
+        self._owners = ctx.RawArray("i", [-1] * num_philosophers)
+        self._views()
+
+    def _views(self):
+        # ctypes arrays export their own format string, go through bytes to get plain ones
+        self.states = memoryview(self._states).cast("B").cast("i")
+        self.meals = memoryview(self._meals).cast("B").cast("q")
+        self.waiting_on = memoryview(self._waiting_on).cast("B").cast("i")
+        self.owners = memoryview(self._owners).cast("B").cast("i")
+
+    def __getstate__(self):
+        return {"num_philosophers": self.num_philosophers, "_states": self._states,
+                "_meals": self._meals, "_waiting_on": self._waiting_on, "_owners": self._owners}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._views()
+
+    def total_meals(self):
+        return sum(self.meals)
+
+    def find_cycle(self):
+        """
+        One pass over the waiting philosophers. Returns [(philosopher, fork), ...]
+        for a circular wait seen in this scan, or None.
+        """
+        waiting_on = self.waiting_on
+        owners = self.owners
+        done = set()
+        for start in range(self.num_philosophers):
+            if waiting_on[start] < 0 or start in done:
+                continue
+            chain = []
+            on_chain = {}
+            phil = start
+            while phil >= 0 and phil not in done:
+                if phil in on_chain:
+                    return chain[on_chain[phil]:]
+                fork = waiting_on[phil]
+                if fork < 0:
+                    break
+                on_chain[phil] = len(chain)
+                chain.append((phil, fork))
+                phil = owners[fork]
+            done.update(on_chain)
+        return None
+
+
+def philosopher(version, phil_id, table, forks, stop, scale, eat_work, seed):
+    """
+    One philosopher, in its own process (or thread). Same steps as the
+    philosopher_thread_* methods; eat_work > 0 eats by spinning instead of sleeping.
+    """
+    n = table.num_philosophers
+    states = table.states
+    meals = table.meals
+    waiting_on = table.waiting_on
+    owners = table.owners
+    rng = random.Random(seed)
+
+    first_fork = phil_id
+    second_fork = (phil_id + 1) % n
+    if version == 3:
+        # Prevention: global fork order
+        first_fork, second_fork = min(first_fork, second_fork), max(first_fork, second_fork)
+
+    while not stop.is_set():
+        states[phil_id] = STATE_THINKING
+        time.sleep((2 if version == 1 else rng.uniform(1, 3)) * scale)
+
+        states[phil_id] = STATE_HUNGRY
+        waiting_on[phil_id] = first_fork
+        forks[first_fork].acquire()
+        owners[first_fork] = phil_id
+        waiting_on[phil_id] = second_fork
+        forks[second_fork].acquire()
+        owners[second_fork] = phil_id
+        waiting_on[phil_id] = -1
+
+        states[phil_id] = STATE_EATING
+        meals[phil_id] += 1
+        if eat_work:
+            spin(eat_work)
+        else:
+            time.sleep((2 if version == 1 else rng.uniform(1, 3)) * scale)
+
+        owners[first_fork] = -1
+        forks[first_fork].release()
+        owners[second_fork] = -1
+        forks[second_fork].release()
+
+
+class MultiprocessPhilosophers:
+    def __init__(self, version, num_philosophers=NUM_PHILOSOPHERS, engine="processes",
+                 scale=1.0, eat_work=0, seed=None):
+        """
+        version 1 (deadlock-prone), 2 (randomized) or 3 (prevention).
+        scale: wall seconds per model second for thinking (and eating unless eat_work).
+        """
+        if version not in (1, 2, 3):
+            raise ValueError(f"No multiprocess strategy for version {version}")
+        self.version = version
+        self.num_philosophers = num_philosophers
+        self.engine = engine
+        if engine == "processes":
+            ctx = multiprocessing.get_context()
+            self.forks = [ctx.Lock() for _ in range(num_philosophers)]
+            self.stop_event = ctx.Event()
+            self.table = SharedTable(num_philosophers, ctx)
+            make = ctx.Process
+        else:
+            self.forks = [threading.Lock() for _ in range(num_philosophers)]
+            self.stop_event = threading.Event()
+            self.table = SharedTable(num_philosophers)
+            make = threading.Thread
+        seeds = random.Random(seed)
+        self.workers = [make(target=philosopher, daemon=True,
+                             args=(version, i, self.table, self.forks, self.stop_event,
+                                   scale, eat_work, seeds.getrandbits(32)))
+                        for i in range(num_philosophers)]
+        self.deadlock_cycle = None
+        self.deadlock_time = None
+        self._last_cycle = None
+        self._started = None
+
+    def start(self):
+        self._started = time.perf_counter()
+        for w in self.workers:
+            w.start()
+
+    def check_deadlock(self):
+        """
+        Scans the shared state; a cycle that survives two scans with no meals eaten
+        by its members in between is recorded. Returns the cycle or None.
+        """
+        if self.deadlock_cycle is not None:
+            return self.deadlock_cycle
+        cycle = self.table.find_cycle()
+        if cycle is None:
+            self._last_cycle = None
+            return None
+        meals = self.table.meals
+        seen = (sorted(cycle), [meals[p] for p, _ in sorted(cycle)])
+        if seen == self._last_cycle:
+            self.deadlock_cycle = cycle
+            self.deadlock_time = time.perf_counter() - self._started
+            return cycle
+        self._last_cycle = seen
+        return None
+
+    def stop(self):
+        """
+        Asks everyone to leave their loop; deadlocked processes are terminated.
+        """
+        self.stop_event.set()
+        if self.engine != "processes":
+            return
+        for w in self.workers:
+            w.join(0.5)
+        for w in self.workers:
+            if w.is_alive():
+                w.terminate()
+                w.join()
+
+    def run(self, duration, poll=0.05):
+        """
+        Runs for `duration` wall seconds or until a deadlock is confirmed.
+        """
+        self.start()
+        end = self._started + duration
+        while time.perf_counter() < end:
+            if self.check_deadlock():
+                break
+            time.sleep(poll)
+        elapsed = time.perf_counter() - self._started
+        self.stop()
+        meals = list(self.table.meals)
+        return {
+            "engine": self.engine,
+            "version": self.version,
+            "n": self.num_philosophers,
+            "meals": sum(meals),
+            "wall_seconds": elapsed,
+            "meals_per_wall_second": sum(meals) / elapsed if elapsed else 0.0,
+            "deadlocked": self.deadlock_cycle is not None,
+            "deadlock_cycle": self.deadlock_cycle,
+        }
+
+
+###############################################################################
+# Monitor window: polls the shared arrays, the philosophers never talk to it
+###############################################################################
+def show(demo, duration=None):
+    import math
+    import tkinter as tk
+
+    n = demo.num_philosophers
+    table = demo.table
+    window = tk.Tk()
+    window.title(f"Dining Philosophers (processes) - Version {demo.version}")
+    canvas = tk.Canvas(window, width=600, height=600, bg="white")
+    canvas.pack()
+    canvas.create_oval(50, 50, 550, 550, fill="#ddd", outline="")
+    status = canvas.create_text(300, 20, text="", font=("Arial", 12))
+
+    circles, forks = [], []
+    for i in range(n):
+        angle = 2 * math.pi / n * i
+        px, py = 300 + 200 * math.sin(angle), 300 - 200 * math.cos(angle)
+        circles.append(canvas.create_oval(px - 40, py - 40, px + 40, py + 40,
+                                          fill="white", outline="black", width=2))
+        canvas.create_text(px, py, text=f"P{i}", font=("Arial", 14, "bold"))
+    for i in range(n):
+        angle = 2 * math.pi / n * (i + 0.5)
+        fx, fy = 300 + 140 * math.sin(angle), 300 - 140 * math.cos(angle)
+        forks.append(canvas.create_oval(fx - 10, fy - 10, fx + 10, fy + 10, fill="gray", outline="black"))
+
+    shown_states = [None] * n
+    shown_forks = [None] * n
+
+    def refresh():
+        states = table.states
+        owners = table.owners
+        for i in range(n):
+            if states[i] != shown_states[i]:
+                shown_states[i] = states[i]
+                canvas.itemconfig(circles[i], fill=STATE_COLORS[states[i]])
+            held = owners[i] >= 0
+            if held != shown_forks[i]:
+                shown_forks[i] = held
+                canvas.itemconfig(forks[i], fill="red" if held else "gray")
+        cycle = demo.check_deadlock()
+        text = f"{table.total_meals()} meals"
+        if cycle:
+            text += "  -  DEADLOCK: " + " -> ".join(f"P{p}" for p, _ in cycle)
+        canvas.itemconfig(status, text=text)
+        window.after(1000 // FPS, refresh)
+
+    demo.start()
+    refresh()
+    if duration is not None:
+        window.after(int(duration * 1000), window.destroy)
+    window.mainloop()
+    demo.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Dining philosophers as processes sharing memory")
+    parser.add_argument("--version", type=int, default=3, choices=(1, 2, 3))
+    parser.add_argument("--n", type=int, default=NUM_PHILOSOPHERS)
+    parser.add_argument("--engine", choices=("processes", "threads"), default="processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="wall seconds")
+    parser.add_argument("--scale", type=float, default=1.0, help="wall seconds per model second")
+    parser.add_argument("--eat-work", type=int, default=0, help="spin iterations per meal instead of sleeping")
+    parser.add_argument("--gui", action="store_true")
+    args = parser.parse_args()
+
+    demo = MultiprocessPhilosophers(args.version, args.n, args.engine, args.scale, args.eat_work)
+    if args.gui:
+        show(demo, args.duration)
+    else:
+        r = demo.run(args.duration)
+        print(f"Version {r['version']} ({r['engine']}): {r['n']} philosophers, {r['meals']} meals in "
+              f"{r['wall_seconds']:.2f} s ({r['meals_per_wall_second']:.1f} meals/s)")
+        if r["deadlocked"]:
+            print("Deadlock: " + " -> ".join(f"P{p} waits fork{f}" for p, f in r["deadlock_cycle"]))
@@ -1,33 +1,41 @@
 import threading
 import time
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.fair_lock import FairLock
+from deadlock_tools.event_log import event_log
 
-lock1 = threading.Lock()
+# FIFO lock: waiters are served in arrival order, nobody gets overtaken forever.
+# Wrapped in a ProfiledLock / RecordedLock when DEADLOCK_PROFILE / DEADLOCK_TRACE is set.
+lock1 = recorded("lock1", inner=profiled("lock1", inner=FairLock()))
+# Buffered, written by a background thread (DEADLOCK_LOG=off silences it)
+log = event_log()
 
 def thread_with_exception():
     try:
         lock1.acquire()
-        print("Lock acquired by exception thread")
+        log.info("Lock acquired by exception thread")
         raise Exception("An exception occurred and lock was not released")
         # lock1.release() is never reached due to the exception
     except Exception as e:
-        print("Exception caught:", e)
+        log.warning("Exception caught", error=e)
     finally:
         # Intentionally commenting out lock release to simulate starvation
         lock1.release()
         pass
 
-def waiting_thread(thread_id):
-    print(f"Thread {thread_id} trying to acquire lock")
+def waiting_thread():
+    log.info("Trying to acquire lock")
     acquired = lock1.acquire(timeout=5)  # Adding timeout to detect starvation
     if acquired:
-        print(f"Thread {thread_id} acquired lock")
+        log.info("Acquired lock")
         lock1.release()
     else:
-        print(f"Thread {thread_id} could not acquire lock (starvation)")
+        log.warning("Could not acquire lock (starvation)")
 
 # Create threads
-exception_thread = threading.Thread(target=thread_with_exception)
-waiting_threads = [threading.Thread(target=waiting_thread, args=(i,)) for i in range(1, 4)]
+exception_thread = threading.Thread(target=thread_with_exception, name="Exception thread")
+waiting_threads = [threading.Thread(target=waiting_thread, name=f"Thread {i}") for i in range(1, 4)]
 
 # Start the exception thread
 exception_thread.start()
@@ -44,4 +52,4 @@ exception_thread.join()
 for thread in waiting_threads:
     thread.join()
 
-print("Program finished")
+log.info("Program finished")
@@ -1,6 +1,11 @@
 import threading
+from deadlock_tools.lock_profiler import profiled
+from deadlock_tools.trace_recorder import recorded
+from deadlock_tools.checked_lock import checked, SelfDeadlockError
 
-lock1 = threading.Lock()
+# Plain threading.Lock unless DEADLOCK_PROFILE, DEADLOCK_TRACE or DEADLOCK_DEBUG is set.
+# With DEADLOCK_DEBUG=1 the second acquire raises SelfDeadlockError instead of hanging.
+lock1 = checked("lock1", inner=recorded("lock1", inner=profiled("lock1")))
 
 def critical_section():
     lock1.acquire()
@@ -14,11 +19,12 @@ def critical_section():
     try:
         lock1.acquire()
         print("Lock aquired second time")
+        lock1.release()
+    except SelfDeadlockError as e:
+        print(f"Self-deadlock detected: {e}")
     finally:
         lock1.release()
 
-    lock1.release()
-
 
 thread = threading.Thread(target=critical_section)
 thread.start()
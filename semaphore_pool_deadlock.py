@@ -0,0 +1,42 @@
+import threading
+from deadlock_tools.resource_graph import ResourceGraph, TrackedSemaphore, describe_deadlock
+from deadlock_tools.event_log import event_log
+from deadlock_tools.metrics import exported, resource_graph_metrics
+
+# Two pools of two units each. Writers take a connection and then a worker slot,
+# reporters take a worker slot and then a connection. Once both pools are drained by
+# the first step, nobody can take the second one: a deadlock without any single-owner
+# lock, which a wait-for graph cannot see. The resource graph reports it when the last
+# thread starts waiting.
+log = event_log()
+graph = ResourceGraph(on_deadlock=lambda deadlock: log.warning("Deadlock detected",
+                                                              threads=describe_deadlock(deadlock)))
+connections = TrackedSemaphore(graph, 2, "connections")
+workers = TrackedSemaphore(graph, 2, "workers")
+start_line = threading.Barrier(4)
+
+def job(first, second):
+    first.acquire()
+    log.info("Acquired", pool=first.name)
+    start_line.wait()
+    # Timeout so the demo ends: the thread backs off and gives its unit back
+    if second.acquire(timeout=2):
+        log.info("Acquired", pool=second.name)
+        second.release()
+    else:
+        log.warning("Gave up", pool=second.name)
+    first.release()
+
+threads = [threading.Thread(target=job, args=(connections, workers), name=f"Writer {i}") for i in (1, 2)]
+threads += [threading.Thread(target=job, args=(workers, connections), name=f"Reporter {i}") for i in (1, 2)]
+
+# Pool and deadlock counters over HTTP when DEADLOCK_METRICS is set
+exported(resource_graph_metrics(graph))
+
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+
+log.info("Program finished", deadlocks=len(graph.deadlocks),
+         check_us=f"{graph.check_ns / max(1, graph.checks) / 1e3:.1f}")